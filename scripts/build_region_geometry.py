@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""Convert the bundled region GeoJSON into its compact binary geometry."""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.region_geometry import write_region_geometry
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", type=Path, help="GeoJSON FeatureCollection of region boundaries")
+    parser.add_argument("output", type=Path, help="binary region geometry file to write")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with args.input.open(encoding="utf-8") as data_file:
+        features = json.load(data_file).get("features", [])
+    write_region_geometry(features, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from .price_logic import PRICE_SUM_TOLERANCE_GBP, PriceIntegralIndex
+from .price_series import as_price_series
+
+POWER_CAP_TOLERANCE_KW = 1e-9
+# Placements tried before the search gives up and returns its best schedule.
+MAX_SEARCH_NODES = 50_000
+
+
+def schedule_appliances(prices, jobs, power_cap_kw, max_nodes=MAX_SEARCH_NODES):
+    """Return the cheapest schedule that runs every job once within a shared power cap.
+
+    Each job is a dict with ``duration_hours``, ``power_kw``,
+    ``earliest_start`` and ``deadline``, plus an optional ``name``.  Jobs run
+    as one uninterrupted block of price slots inside their own window, and
+    the summed draw of overlapping jobs never exceeds ``power_cap_kw``.
+
+    The search is a branch and bound: jobs with the fewest placements are
+    placed first, each job's placements are tried cheapest first, and a
+    branch stops as soon as its cost plus every remaining job's cheapest
+    placement cannot beat the best schedule found so far.  Identical jobs
+    are placed in start order, so the same schedule is not searched once
+    per ordering of them.
+
+    Jobs whose combined energy cannot fit in the slots they may use, at the
+    largest draw any set of them can share under the cap, are rejected
+    before searching.  The search stops after ``max_nodes`` placements; the
+    result's ``optimal`` is then ``False`` and it holds the best schedule
+    found so far.  Returns ``None`` when no
+    schedule fits, or none was found within ``max_nodes``.
+    """
+    sorted_prices = as_price_series(prices)
+    price_index = PriceIntegralIndex(sorted_prices)
+    options_by_job = [_get_job_options(sorted_prices, price_index, job) for job in jobs]
+    if any(
+        not options or job['power_kw'] > power_cap_kw + POWER_CAP_TOLERANCE_KW
+        for job, options in zip(jobs, options_by_job, strict=True)
+    ):
+        return None
+
+    usable_slots = {
+        slot
+        for options in options_by_job
+        for _cost_gbp, first_slot, slot_count, _average_price in options
+        for slot in range(first_slot, first_slot + slot_count)
+    }
+    total_energy_kwh = sum(job['power_kw'] * job['duration_hours'] for job in jobs)
+    usable_energy_kwh = _get_largest_slot_load(jobs, power_cap_kw) * 0.5 * len(usable_slots)
+    if total_energy_kwh > usable_energy_kwh + POWER_CAP_TOLERANCE_KW:
+        return None
+
+    job_keys = [
+        (job['duration_hours'], job['power_kw'], job['earliest_start'], job['deadline'])
+        for job in jobs
+    ]
+    order = sorted(
+        range(len(jobs)),
+        key=lambda job_index: (len(options_by_job[job_index]), -jobs[job_index]['power_kw'], job_keys[job_index]),
+    )
+    # The job placed just before each depth when it is identical, else ``None``.
+    identical_predecessors = [
+        order[depth - 1] if depth and job_keys[order[depth - 1]] == job_keys[job_index] else None
+        for depth, job_index in enumerate(order)
+    ]
+    remaining_lower_bounds = [0.0] * (len(order) + 1)
+    for depth in range(len(order) - 1, -1, -1):
+        remaining_lower_bounds[depth] = remaining_lower_bounds[depth + 1] + options_by_job[order[depth]][0][0]
+
+    slot_loads = [0.0] * len(sorted_prices)
+    chosen = [None] * len(jobs)
+    best = {'cost_gbp': float('inf'), 'options': None, 'nodes': 0, 'truncated': False}
+
+    def place(depth, cost_gbp):
+        if depth == len(order):
+            if cost_gbp < best['cost_gbp'] - PRICE_SUM_TOLERANCE_GBP:
+                best['cost_gbp'] = cost_gbp
+                best['options'] = list(chosen)
+            return
+
+        job_index = order[depth]
+        power_kw = jobs[job_index]['power_kw']
+        predecessor = identical_predecessors[depth]
+        earliest_slot = chosen[predecessor][1] if predecessor is not None else 0
+        for option in options_by_job[job_index]:
+            option_cost_gbp, first_slot, slot_count, _average_price = option
+            if cost_gbp + option_cost_gbp + remaining_lower_bounds[depth + 1] >= best['cost_gbp'] - PRICE_SUM_TOLERANCE_GBP:
+                break
+            if first_slot < earliest_slot:
+                continue
+            if best['nodes'] >= max_nodes:
+                best['truncated'] = True
+                break
+            best['nodes'] += 1
+            slots = range(first_slot, first_slot + slot_count)
+            if any(slot_loads[slot] + power_kw > power_cap_kw + POWER_CAP_TOLERANCE_KW for slot in slots):
+                continue
+
+            for slot in slots:
+                slot_loads[slot] += power_kw
+            chosen[job_index] = option
+            place(depth + 1, cost_gbp + option_cost_gbp)
+            for slot in slots:
+                slot_loads[slot] -= power_kw
+        chosen[job_index] = None
+
+    place(0, 0.0)
+    if best['options'] is None:
+        return None
+
+    scheduled_jobs = []
+    for job, (cost_gbp, first_slot, slot_count, average_price) in zip(jobs, best['options'], strict=True):
+        scheduled_jobs.append({
+            'name': job.get('name'),
+            'start': sorted_prices[first_slot]['valid_from'],
+            'end': sorted_prices[first_slot + slot_count - 1]['valid_to'],
+            'power_kw': job['power_kw'],
+            'average_price_gbp': average_price,
+            'cost_gbp': cost_gbp,
+        })
+    return {
+        'jobs': scheduled_jobs,
+        'total_cost_gbp': sum(job['cost_gbp'] for job in scheduled_jobs),
+        'optimal': not best['truncated'],
+    }
+
+
+def _get_largest_slot_load(jobs, power_cap_kw):
+    """Return the largest draw any set of jobs can share in one slot without passing the cap."""
+    loads = {0.0}
+    for job in jobs:
+        loads |= {
+            load + job['power_kw']
+            for load in loads
+            if load + job['power_kw'] <= power_cap_kw + POWER_CAP_TOLERANCE_KW
+        }
+    return max(loads)
+
+
+def _get_job_options(sorted_prices, price_index, job):
+    """Return ``(cost_gbp, first_slot, slot_count, average_price_gbp)`` placements, cheapest first."""
+    duration = timedelta(hours=job['duration_hours'])
+    slot_count = round(job['duration_hours'] * 2)
+    options = []
+    if slot_count <= 0:
+        return options
+
+    for first_slot in range(len(sorted_prices) - slot_count + 1):
+        start = sorted_prices[first_slot]['valid_from']
+        end = start + duration
+        if start < job['earliest_start'] or end > job['deadline']:
+            continue
+        if sorted_prices[first_slot + slot_count - 1]['valid_to'] != end:
+            continue
+        average_price = price_index.weighted_average(start, end)
+        if average_price is None:
+            continue
+        cost_gbp = average_price * job['power_kw'] * job['duration_hours']
+        options.append((cost_gbp, first_slot, slot_count, average_price))
+    options.sort(key=lambda option: (option[0], option[1]))
+    return options
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python engine covers every case.
+    np = None
+
+from .price_series import as_price_series
+from .uk_time import UK_TIMEZONE
+
+DEFAULT_SOC_STEPS = 40
+SLOT_HOURS = 0.5
+
+
+def build_baseline_profile(usage_cube):
+    """Return the mean kWh used in each ``HH:MM`` half-hour of the day.
+
+    Each slot is averaged over the days that have usage in it, so partly
+    filled days, such as the latest one, do not pull the later slots down.
+    """
+    day_counts = usage_cube.slot_day_counts()
+    return {
+        slot_key: kwh / day_counts[slot_key]
+        for slot_key, kwh in usage_cube.slot_totals().items()
+    }
+
+
+def schedule_battery(
+    prices,
+    now,
+    baseline_profile,
+    capacity_kwh,
+    max_charge_kw,
+    max_discharge_kw,
+    round_trip_efficiency,
+    initial_soc_kwh,
+    min_final_soc_kwh=0.0,
+    soc_steps=DEFAULT_SOC_STEPS,
+    vectorized=None,
+):
+    """Return the cheapest half-hourly charge and discharge plan for a home battery.
+
+    The plan covers the gap-free run of prices from the slot in force at
+    ``now``.  Each slot's household load comes from ``baseline_profile``, keyed
+    by local ``HH:MM``, and the battery can only offset that load, not export.
+    Round-trip losses are split evenly between charging and discharging, and
+    charge rates are limits on grid-side power.
+
+    State of charge is held on a grid of ``soc_steps`` equal steps, and a
+    backward dynamic program finds the cheapest path from the grid level
+    nearest ``initial_soc_kwh`` that ends at or above ``min_final_soc_kwh``.
+    ``savings_gbp`` compares the plan with running the house from the grid,
+    after charging the house for any stored energy the plan uses up: the drop
+    in charge, as delivered to the house, is valued at the mean horizon price.
+    ``vectorized`` selects the NumPy engine, which is used by default when
+    NumPy is installed; both engines produce the same plan.  The Flatpak
+    does not bundle NumPy, so the app uses the pure-Python engine.  Returns
+    ``None`` when no prices cover ``now`` or no plan can reach the final
+    charge.
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    elif vectorized and np is None:
+        raise RuntimeError("NumPy is required for the vectorized battery engine.")
+
+    slots = _get_horizon_slots(prices, now)
+    if not slots or capacity_kwh <= 0 or soc_steps <= 0:
+        return None
+
+    step_kwh = capacity_kwh / soc_steps
+    leg_efficiency = math.sqrt(round_trip_efficiency)
+    max_charge_steps = int(max_charge_kw * SLOT_HOURS * leg_efficiency / step_kwh + 1e-9)
+    max_discharge_steps = int(max_discharge_kw * SLOT_HOURS / leg_efficiency / step_kwh + 1e-9)
+    state_count = soc_steps + 1
+    # Net grid kWh added by moving between grid levels, before the household
+    # load is added; ``None`` marks moves faster than the rate limits allow.
+    transitions = [
+        [
+            _get_transition_grid_kwh(target - source, step_kwh, leg_efficiency, max_charge_steps, max_discharge_steps)
+            for target in range(state_count)
+        ]
+        for source in range(state_count)
+    ]
+    baselines = [baseline_profile.get(_get_slot_key(slot), 0.0) for slot in slots]
+    final_state = min(state_count - 1, math.ceil(min_final_soc_kwh / step_kwh - 1e-9))
+    initial_state = max(0, min(state_count - 1, round(initial_soc_kwh / step_kwh)))
+
+    if vectorized:
+        policy, plan_cost = _solve_vectorized(slots, baselines, transitions, final_state, initial_state)
+    else:
+        policy, plan_cost = _solve(slots, baselines, transitions, final_state, initial_state)
+    if not math.isfinite(plan_cost):
+        return None
+
+    scheduled_slots = []
+    state = initial_state
+    baseline_cost = 0.0
+    for index, slot in enumerate(slots):
+        next_state = policy[index][state]
+        delta_kwh = (next_state - state) * step_kwh
+        grid_kwh = max(0.0, baselines[index] + transitions[state][next_state])
+        scheduled_slots.append({
+            'start': slot['valid_from'],
+            'end': slot['valid_to'],
+            'price_gbp': slot['price_gbp'],
+            'baseline_kwh': baselines[index],
+            'charge_kwh': max(0.0, delta_kwh) / leg_efficiency,
+            'discharge_kwh': max(0.0, -delta_kwh) * leg_efficiency,
+            'grid_kwh': grid_kwh,
+            'soc_kwh': next_state * step_kwh,
+        })
+        baseline_cost += baselines[index] * slot['price_gbp']
+        state = next_state
+
+    mean_price_gbp = sum(slot['price_gbp'] for slot in slots) / len(slots)
+    stored_energy_used_gbp = (initial_state - state) * step_kwh * leg_efficiency * mean_price_gbp
+    return {
+        'slots': scheduled_slots,
+        'total_cost_gbp': plan_cost,
+        'baseline_cost_gbp': baseline_cost,
+        'savings_gbp': baseline_cost - plan_cost - stored_energy_used_gbp,
+    }
+
+
+def _get_horizon_slots(prices, now):
+    slots = []
+    for price in as_price_series(prices):
+        if price['valid_to'] <= now:
+            continue
+        if not slots and price['valid_from'] > now:
+            return []
+        if slots and slots[-1]['valid_to'] != price['valid_from']:
+            break
+        slots.append(price)
+    return slots
+
+
+def _get_slot_key(slot):
+    return slot['valid_from'].astimezone(UK_TIMEZONE).strftime('%H:%M')
+
+
+def _get_transition_grid_kwh(step_change, step_kwh, leg_efficiency, max_charge_steps, max_discharge_steps):
+    if step_change > max_charge_steps or -step_change > max_discharge_steps:
+        return None
+    if step_change >= 0:
+        return step_change * step_kwh / leg_efficiency
+    return step_change * step_kwh * leg_efficiency
+
+
+def _solve(slots, baselines, transitions, final_state, initial_state):
+    """Return the per-slot best next state for every state, and the cost from ``initial_state``."""
+    state_count = len(transitions)
+    values = [0.0 if state >= final_state else math.inf for state in range(state_count)]
+    policy = [None] * len(slots)
+    for index in range(len(slots) - 1, -1, -1):
+        price_gbp = slots[index]['price_gbp']
+        baseline_kwh = baselines[index]
+        next_values = []
+        choices = []
+        for source in range(state_count):
+            best_value = math.inf
+            best_target = source
+            for target, grid_kwh in enumerate(transitions[source]):
+                if grid_kwh is None:
+                    continue
+                value = max(0.0, baseline_kwh + grid_kwh) * price_gbp + values[target]
+                if value < best_value:
+                    best_value = value
+                    best_target = target
+            next_values.append(best_value)
+            choices.append(best_target)
+        values = next_values
+        policy[index] = choices
+    return policy, values[initial_state]
+
+
+def _solve_vectorized(slots, baselines, transitions, final_state, initial_state):
+    state_count = len(transitions)
+    grid_kwh = np.array(
+        [[np.nan if kwh is None else kwh for kwh in row] for row in transitions],
+        dtype=np.float64,
+    )
+    blocked = np.isnan(grid_kwh)
+    grid_kwh[blocked] = 0.0
+    values = np.where(np.arange(state_count) >= final_state, 0.0, np.inf)
+    policy = [None] * len(slots)
+    for index in range(len(slots) - 1, -1, -1):
+        costs = np.maximum(0.0, baselines[index] + grid_kwh) * slots[index]['price_gbp'] + values[np.newaxis, :]
+        costs[blocked] = np.inf
+        choices = np.argmin(costs, axis=1)
+        values = costs[np.arange(state_count), choices]
+        policy[index] = choices.tolist()
+    return policy, float(values[initial_state])
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from .price_logic import PriceIntegralIndex, find_cheapest_slots, find_cheapest_timer_slot
+
+PLAN_DURATIONS_HOURS = tuple(step / 2 for step in range(1, 49))
+PLAN_START_WITHIN_HOURS = tuple(range(1, 25))
+SLOT_SECONDS = 30 * 60
+
+
+class CheapestWindowTable:
+    """Plan results for every supported duration and search window during one half-hour.
+
+    Each lookup matches ``find_cheapest_slot`` and ``find_cheapest_timer_slot``
+    for the same prices and minute.  When every price starts and ends on a
+    half-hour, the cheapest contiguous windows are the same for each minute
+    of a half-hour, so they are found once for the half-hour containing
+    ``now``.  Timer delays are counted in ``timer_step_minutes`` steps from
+    the current minute, so timer results are searched on first use and kept
+    per minute, sharing the table's price index.  Prices off the half-hour
+    grid limit the table to the minute it was built in.
+    """
+
+    __slots__ = (
+        "_entries",
+        "_price_index",
+        "_timer_entries",
+        "prices",
+        "timer_step_minutes",
+        "valid_from",
+        "valid_until",
+    )
+
+    def __init__(
+        self,
+        prices,
+        now,
+        durations_hours=PLAN_DURATIONS_HOURS,
+        start_within_hours_values=PLAN_START_WITHIN_HOURS,
+        timer_step_minutes=60,
+    ):
+        self.prices = prices
+        self.timer_step_minutes = timer_step_minutes
+        self._price_index = PriceIntegralIndex(prices)
+        minute = now.replace(second=0, microsecond=0)
+        if all(boundary.timestamp() % SLOT_SECONDS == 0 for boundary in self._price_index.boundaries()):
+            self.valid_from = minute - timedelta(seconds=minute.timestamp() % SLOT_SECONDS)
+            self.valid_until = self.valid_from + timedelta(seconds=SLOT_SECONDS)
+        else:
+            self.valid_from = minute
+            self.valid_until = minute + timedelta(minutes=1)
+        self._entries = find_cheapest_slots(prices, self.valid_from, durations_hours, start_within_hours_values)
+        self._timer_entries = {}
+
+    def is_current(self, prices, now, timer_step_minutes=60):
+        return (
+            prices is self.prices
+            and self.valid_from <= now < self.valid_until
+            and timer_step_minutes == self.timer_step_minutes
+        )
+
+    def lookup(self, now, duration_hours, start_within_hours):
+        """Return ``(cheapest_slot, start_timer_slot, finish_timer_slot)``, or ``None`` outside the table."""
+        key = (duration_hours, start_within_hours)
+        if key not in self._entries:
+            return None
+
+        minute = now.replace(second=0, microsecond=0)
+        timer_key = (minute, *key)
+        if timer_key not in self._timer_entries:
+            self._timer_entries[timer_key] = tuple(
+                find_cheapest_timer_slot(
+                    self.prices,
+                    minute,
+                    duration_hours,
+                    start_within_hours,
+                    timer_mode,
+                    self._price_index,
+                    self.timer_step_minutes,
+                )
+                for timer_mode in ("start", "finish")
+            )
+        return (self._entries[key], *self._timer_entries[timer_key])
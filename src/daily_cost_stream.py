@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from datetime import date
+
+from .historical_costs import build_daily_costs, parse_octopus_datetime
+from .historical_rate_cache import get_cached_rate_records
+from .uk_time import UK_TIMEZONE, local_day_bounds_utc, local_days_between
+
+
+class DailyCostAccumulator:
+    """Cost each GB day as soon as both its usage samples and its tariff records are complete.
+
+    Samples must arrive in period order, as the consumption endpoint returns
+    them with ``order_by=period``; a day's samples are complete once a later
+    sample has been seen or the sample stream has finished.  Tariff records
+    are read from historical rate cache entries, one per tariff code, and a
+    day's rates are complete once every tariff in force that day has been
+    marked ready for it.
+    """
+
+    def __init__(self, tariff_periods, rate_entries):
+        self._tariff_periods = tariff_periods
+        self._rate_entries = rate_entries
+        self._ready_rate_days = {tariff_code: set() for tariff_code in rate_entries}
+        self._samples_by_day = {}
+        self._pending_days = set()
+        self._latest_sample_start = None
+        self._samples_finished = False
+        self._daily_costs = {}
+
+    @property
+    def daily_costs(self):
+        return [self._daily_costs[day_key] for day_key in sorted(self._daily_costs)]
+
+    @property
+    def pending_days(self):
+        return sorted(self._pending_days)
+
+    def add_samples(self, samples):
+        for sample in samples:
+            start = parse_octopus_datetime(sample.get("interval_start"))
+            if not start:
+                continue
+            day_key = start.astimezone(UK_TIMEZONE).date().isoformat()
+            self._samples_by_day.setdefault(day_key, []).append(sample)
+            # A late sample reopens its day so the cost is rebuilt with it.
+            self._pending_days.add(day_key)
+            if self._latest_sample_start is None or start > self._latest_sample_start:
+                self._latest_sample_start = start
+        self._finalize_ready_days()
+
+    def finish_samples(self):
+        self._samples_finished = True
+        self._finalize_ready_days()
+
+    def mark_rates_ready(self, tariff_code, period_start, period_end):
+        """Record that the cache entry for ``tariff_code`` now holds every record in a period."""
+        self._ready_rate_days.setdefault(tariff_code, set()).update(
+            day.isoformat() for day in local_days_between(period_start, period_end)
+        )
+        self._finalize_ready_days()
+
+    def mark_cached_rates_ready(self, tariff_code):
+        entry = self._rate_entries.get(tariff_code) or {}
+        self._ready_rate_days.setdefault(tariff_code, set()).update(
+            day_key for day_key, cached_day in entry.get("days", {}).items() if cached_day.get("immutable")
+        )
+        self._finalize_ready_days()
+
+    def _finalize_ready_days(self):
+        for day_key in sorted(self._pending_days):
+            day_start, day_end = local_day_bounds_utc(date.fromisoformat(day_key))
+            samples_complete = self._samples_finished or (
+                self._latest_sample_start is not None and self._latest_sample_start >= day_end
+            )
+            if not samples_complete:
+                continue
+
+            tariff_codes = self._get_day_tariff_codes(day_start, day_end)
+            if not all(day_key in self._ready_rate_days.get(tariff_code, ()) for tariff_code in tariff_codes):
+                continue
+
+            rates_by_tariff = {}
+            standing_charges_by_tariff = {}
+            for tariff_code in tariff_codes:
+                rates_by_tariff[tariff_code], standing_charges_by_tariff[tariff_code] = get_cached_rate_records(
+                    self._rate_entries[tariff_code],
+                    day_start,
+                    day_end,
+                )
+            costed_days = build_daily_costs(
+                self._samples_by_day[day_key],
+                self._tariff_periods,
+                rates_by_tariff,
+                standing_charges_by_tariff,
+                annotate_samples=True,
+            )
+            for costed_day in costed_days:
+                self._daily_costs[costed_day["date"]] = costed_day
+            self._pending_days.discard(day_key)
+
+    def _get_day_tariff_codes(self, day_start, day_end):
+        return sorted({
+            period["tariff_code"]
+            for period in self._tariff_periods
+            if period["valid_from"] < day_end and (period.get("valid_to") is None or day_start < period["valid_to"])
+        })
@@ -38,6 +38,26 @@ def build_find_cheapest_presentation(
     }
 
 
+def build_ranked_window_ranges(ranked_slots):
+    """Return chart ranges for the runner-up windows, labelled by rank."""
+    return [
+        (slot['start'], slot['end'], f"#{rank}")
+        for rank, slot in enumerate(ranked_slots[1:], start=2)
+    ]
+
+
+def build_split_highlight(selection, duration_hours):
+    """Return chart ``(ranges, label)`` for a split selection, or ``None`` without one."""
+    if not selection:
+        return None
+
+    ranges = [(block['start'], block['end']) for block in selection['blocks']]
+    label = f"Best {format_duration(duration_hours)}"
+    if len(ranges) > 1:
+        label = f"{label} in {len(ranges)} blocks"
+    return ranges, label
+
+
 def build_fixed_start_presentation(slot, best_average_price):
     if not slot:
         return None
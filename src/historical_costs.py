@@ -1,7 +1,15 @@
 from __future__ import annotations
 
 from bisect import bisect_right
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, time, timedelta, timezone
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python engine covers every case.
+    np = None
+# The Flatpak does not bundle NumPy, so the app runs the pure-Python engines.
+# The NumPy engines run where NumPy is installed, such as development and
+# test environments, and are checked against the pure-Python ones there.
 
 from .price_bands import (
     PRICE_BAND_HIGH,
@@ -12,6 +20,12 @@ from .price_bands import (
 )
 from .uk_time import UK_TIMEZONE
 
+SAMPLE_UNIT_RATE_KEY = "unit_rate_gbp"
+PRICE_BAND_KWH_TOLERANCE = 1e-6
+# Each tariff's rate timeline is offset into its own block of this many bits
+# of epoch seconds, so every tariff can be searched in one sorted array.
+TARIFF_TIMELINE_BITS = 40
+
 
 def parse_octopus_datetime(value):
     if not value:
@@ -69,8 +83,27 @@ def get_usage_period(samples):
     return min(starts), max(ends)
 
 
-def build_daily_costs(samples, tariff_periods, rates_by_tariff, standing_charges_by_tariff):
-    daily = {}
+def build_daily_costs(
+    samples,
+    tariff_periods,
+    rates_by_tariff,
+    standing_charges_by_tariff,
+    annotate_samples=False,
+    vectorized=None,
+):
+    """Cost samples per GB day against the tariff records in force for each interval.
+
+    With ``annotate_samples`` the matched unit rate is stored on each sample,
+    so price band columns can later be rebuilt without fetching rates again.
+    ``vectorized`` selects the NumPy engine, which is used by default when
+    NumPy is installed; both engines produce the same days.  The Flatpak
+    does not bundle NumPy, so the app uses the pure-Python engine.
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    elif vectorized and np is None:
+        raise RuntimeError("NumPy is required for the vectorized daily cost engine.")
+
     tariff_lookup = _prepare_tariff_lookup(tariff_periods)
     rates_lookup = {
         tariff_code: _prepare_record_lookup(records)
@@ -81,6 +114,197 @@ def build_daily_costs(samples, tariff_periods, rates_by_tariff, standing_charges
         for tariff_code, records in standing_charges_by_tariff.items()
     }
 
+    if vectorized:
+        daily = _sum_daily_usage_vectorized(samples, tariff_lookup, rates_lookup, annotate_samples)
+    else:
+        daily = _sum_daily_usage(samples, tariff_lookup, rates_lookup, annotate_samples)
+
+    for day_key, day in daily.items():
+        midday = datetime.fromisoformat(day_key).replace(hour=12, tzinfo=UK_TIMEZONE)
+        tariff_code = _find_tariff_code(tariff_lookup, midday)
+        standing_charge = (
+            _find_record(standing_charge_lookup.get(tariff_code, []), midday)
+            if tariff_code
+            else None
+        )
+        if standing_charge:
+            day["standing_charge_gbp"] = float(standing_charge.get("value_inc_vat", 0.0)) / 100.0
+        day["total_cost_gbp"] = day["energy_cost_gbp"] + day["standing_charge_gbp"]
+
+    return [daily[key] for key in sorted(daily)]
+
+
+def compare_tariff_costs(samples, rates_by_tariff, standing_charges_by_tariff, vectorized=None):
+    """Replay usage samples against each tariff as if it had been in force throughout.
+
+    Returns a dict keyed by tariff code, in ``rates_by_tariff`` order, with
+    each tariff's daily costs and its totals over the samples.  Samples are
+    parsed and grouped into GB days once, and the vectorized engine then
+    matches every tariff's rates in a single search, so adding tariffs costs
+    little more than the first.  ``vectorized`` selects the NumPy engine,
+    which is used by default when NumPy is installed; both engines produce
+    the same costs.  The Flatpak does not bundle NumPy, so the app uses the
+    pure-Python engine.
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    elif vectorized and np is None:
+        raise RuntimeError("NumPy is required for the vectorized tariff comparison engine.")
+
+    tariff_codes = list(rates_by_tariff)
+    usage = _parse_usage_samples(samples)
+    if vectorized:
+        daily_by_tariff = _replay_tariffs_vectorized(usage, [rates_by_tariff[code] for code in tariff_codes])
+    else:
+        rates_lookups = [_prepare_record_lookup(rates_by_tariff[code]) for code in tariff_codes]
+        daily_by_tariff = _replay_tariffs(usage, rates_lookups)
+
+    comparison = {}
+    for tariff_code, daily in zip(tariff_codes, daily_by_tariff, strict=True):
+        standing_charge_lookup = _prepare_record_lookup(standing_charges_by_tariff.get(tariff_code, []))
+        days = [daily[key] for key in sorted(daily)]
+        for day in days:
+            midday = datetime.fromisoformat(day["date"]).replace(hour=12, tzinfo=UK_TIMEZONE)
+            standing_charge = _find_record(standing_charge_lookup, midday)
+            if standing_charge:
+                day["standing_charge_gbp"] = float(standing_charge.get("value_inc_vat", 0.0)) / 100.0
+            day["total_cost_gbp"] = day["energy_cost_gbp"] + day["standing_charge_gbp"]
+        comparison[tariff_code] = {
+            "tariff_code": tariff_code,
+            "days": days,
+            "kwh": sum(day["kwh"] for day in days),
+            "energy_cost_gbp": sum(day["energy_cost_gbp"] for day in days),
+            "standing_charge_gbp": sum(day["standing_charge_gbp"] for day in days),
+            "total_cost_gbp": sum(day["total_cost_gbp"] for day in days),
+            "missing_rate_count": sum(day["missing_rate_count"] for day in days),
+        }
+    return comparison
+
+
+def _new_tariff_day(day_key):
+    return {
+        "date": day_key,
+        "kwh": 0.0,
+        "matched_kwh": 0.0,
+        "energy_cost_gbp": 0.0,
+        "standing_charge_gbp": 0.0,
+        "total_cost_gbp": 0.0,
+        "missing_rate_count": 0,
+        "sample_count": 0,
+    }
+
+
+def _parse_usage_samples(samples):
+    """Return ``(start, kwh)`` for each sample with a start and numeric consumption."""
+    usage = []
+    for sample in samples:
+        start = parse_octopus_datetime(sample.get("interval_start"))
+        if not start:
+            continue
+        try:
+            usage.append((start, float(sample.get("consumption", 0.0))))
+        except (TypeError, ValueError):
+            continue
+    return usage
+
+
+def _replay_tariffs(usage, rates_lookups):
+    day_keys = [start.astimezone(UK_TIMEZONE).date().isoformat() for start, _kwh in usage]
+    daily_by_tariff = []
+    for rates_lookup in rates_lookups:
+        daily = {}
+        for (start, kwh), day_key in zip(usage, day_keys, strict=True):
+            day = daily.get(day_key)
+            if day is None:
+                day = daily[day_key] = _new_tariff_day(day_key)
+            day["kwh"] += kwh
+            day["sample_count"] += 1
+
+            rate = _find_record(rates_lookup, start)
+            if not rate:
+                day["missing_rate_count"] += 1
+                continue
+            day["matched_kwh"] += kwh
+            day["energy_cost_gbp"] += kwh * float(rate.get("value_inc_vat", 0.0)) / 100.0
+        daily_by_tariff.append(daily)
+    return daily_by_tariff
+
+
+def _replay_tariffs_vectorized(usage, rate_records_by_tariff):
+    """Match every tariff's rates in one ``searchsorted`` and total tariff days with one ``bincount``."""
+    if not usage or not rate_records_by_tariff:
+        return [{} for _records in rate_records_by_tariff]
+
+    starts = np.array([int(start.timestamp()) for start, _kwh in usage], dtype=np.int64)
+    consumption = np.array([kwh for _start, kwh in usage], dtype=np.float64)
+    first_day, day_count, day_index = _get_uk_day_index(starts)
+
+    timelines = [
+        _build_rate_timeline(records, tariff_index << TARIFF_TIMELINE_BITS)
+        for tariff_index, records in enumerate(rate_records_by_tariff)
+    ]
+    range_starts, range_ends, range_rates = (np.concatenate(columns) for columns in zip(*timelines, strict=True))
+
+    tariff_count = len(rate_records_by_tariff)
+    tariff_offsets = np.arange(tariff_count, dtype=np.int64)[:, np.newaxis]
+    targets = (tariff_offsets << TARIFF_TIMELINE_BITS) + starts[np.newaxis, :]
+    if range_starts.size:
+        range_index = np.searchsorted(range_starts, targets, side="right") - 1
+        found = range_index >= 0
+        range_index = np.maximum(range_index, 0)
+        found &= targets < range_ends[range_index]
+        unit_rates = np.where(found, range_rates[range_index], 0.0)
+    else:
+        found = np.zeros(targets.shape, dtype=bool)
+        unit_rates = np.zeros(targets.shape, dtype=np.float64)
+
+    cells = (tariff_offsets * day_count + day_index[np.newaxis, :]).ravel()
+    cell_count = tariff_count * day_count
+    matched_kwh = np.where(found, consumption[np.newaxis, :], 0.0).ravel()
+    totals = {
+        "matched_kwh": np.bincount(cells, weights=matched_kwh, minlength=cell_count),
+        "energy_cost_gbp": np.bincount(cells, weights=(unit_rates * consumption).ravel(), minlength=cell_count),
+        "missing_rate_count": np.bincount(cells[~found.ravel()], minlength=cell_count),
+    }
+    totals = {key: values.reshape(tariff_count, day_count).tolist() for key, values in totals.items()}
+    day_kwh = np.bincount(day_index, weights=consumption, minlength=day_count).tolist()
+    sample_counts = np.bincount(day_index, minlength=day_count).tolist()
+
+    daily_by_tariff = []
+    for tariff_index in range(tariff_count):
+        daily = {}
+        for index, sample_count in enumerate(sample_counts):
+            if not sample_count:
+                continue
+            day_key = (first_day + timedelta(days=index)).isoformat()
+            day = daily[day_key] = _new_tariff_day(day_key)
+            day["kwh"] = day_kwh[index]
+            day["sample_count"] = sample_count
+            for key, values in totals.items():
+                day[key] = values[tariff_index][index]
+        daily_by_tariff.append(daily)
+    return daily_by_tariff
+
+
+def _new_daily_cost(day_key):
+    return {
+        "date": day_key,
+        "kwh": 0.0,
+        "energy_cost_gbp": 0.0,
+        "standing_charge_gbp": 0.0,
+        "total_cost_gbp": 0.0,
+        "matched_kwh": 0.0,
+        "cheap_kwh": 0.0,
+        "negative_kwh": 0.0,
+        "high_kwh": 0.0,
+        "price_band_version": PRICE_BAND_VERSION,
+        "missing_rate_count": 0,
+        "sample_count": 0,
+    }
+
+
+def _sum_daily_usage(samples, tariff_lookup, rates_lookup, annotate_samples):
+    daily = {}
     for sample in samples:
         start = parse_octopus_datetime(sample.get("interval_start"))
         if not start:
@@ -92,23 +316,9 @@ def build_daily_costs(samples, tariff_periods, rates_by_tariff, standing_charges
             continue
 
         day_key = start.astimezone(UK_TIMEZONE).date().isoformat()
-        day = daily.setdefault(
-            day_key,
-            {
-                "date": day_key,
-                "kwh": 0.0,
-                "energy_cost_gbp": 0.0,
-                "standing_charge_gbp": 0.0,
-                "total_cost_gbp": 0.0,
-                "matched_kwh": 0.0,
-                "cheap_kwh": 0.0,
-                "negative_kwh": 0.0,
-                "high_kwh": 0.0,
-                "price_band_version": PRICE_BAND_VERSION,
-                "missing_rate_count": 0,
-                "sample_count": 0,
-            },
-        )
+        day = daily.get(day_key)
+        if day is None:
+            day = daily[day_key] = _new_daily_cost(day_key)
         day["kwh"] += consumption
         day["sample_count"] += 1
 
@@ -119,29 +329,285 @@ def build_daily_costs(samples, tariff_periods, rates_by_tariff, standing_charges
             continue
 
         unit_rate_gbp = float(rate.get("value_inc_vat", 0.0)) / 100.0
-        price_band = get_price_band(unit_rate_gbp)
+        if annotate_samples:
+            sample[SAMPLE_UNIT_RATE_KEY] = unit_rate_gbp
         day["matched_kwh"] += consumption
-        if price_band == PRICE_BAND_NEGATIVE:
-            day["negative_kwh"] += consumption
-        if price_band in (PRICE_BAND_NEGATIVE, PRICE_BAND_LOW):
-            day["cheap_kwh"] += consumption
-        if price_band == PRICE_BAND_HIGH:
-            day["high_kwh"] += consumption
+        _add_price_band_kwh(day, unit_rate_gbp, consumption)
         day["energy_cost_gbp"] += consumption * unit_rate_gbp
+    return daily
 
-    for day_key, day in daily.items():
-        midday = datetime.fromisoformat(day_key).replace(hour=12, tzinfo=UK_TIMEZONE)
-        tariff_code = _find_tariff_code(tariff_lookup, midday)
-        standing_charge = (
-            _find_record(standing_charge_lookup.get(tariff_code, []), midday)
-            if tariff_code
-            else None
+
+def _sum_daily_usage_vectorized(samples, tariff_lookup, rates_lookup, annotate_samples):
+    """Join samples to tariffs and rates with ``searchsorted`` and total each day with ``bincount``."""
+    costed_samples = []
+    starts = []
+    consumption = []
+    for sample in samples:
+        start = parse_octopus_datetime(sample.get("interval_start"))
+        if not start:
+            continue
+        try:
+            kwh = float(sample.get("consumption", 0.0))
+        except (TypeError, ValueError):
+            continue
+        costed_samples.append(sample)
+        starts.append(start.timestamp())
+        consumption.append(kwh)
+    if not costed_samples:
+        return {}
+
+    starts = np.array(starts, dtype=np.float64)
+    consumption = np.array(consumption, dtype=np.float64)
+
+    first_day, day_count, day_index = _get_uk_day_index(starts)
+
+    unit_rates = np.full(len(starts), np.nan)
+    tariff_index, tariff_found = _search_ranges(tariff_lookup, starts)
+    tariff_codes = [tariff_code for _valid_from, _valid_to, tariff_code in tariff_lookup[1]]
+    for tariff_code in set(tariff_codes):
+        code_mask = np.array([code == tariff_code for code in tariff_codes], dtype=bool)
+        sample_mask = tariff_found & code_mask[tariff_index]
+        if not sample_mask.any():
+            continue
+        rate_lookup = rates_lookup.get(tariff_code, [])
+        rate_values = np.array(
+            [float(record.get("value_inc_vat", 0.0)) / 100.0 for _valid_from, _valid_to, record in rate_lookup[1]]
+            if rate_lookup
+            else [],
+            dtype=np.float64,
         )
-        if standing_charge:
-            day["standing_charge_gbp"] = float(standing_charge.get("value_inc_vat", 0.0)) / 100.0
-        day["total_cost_gbp"] = day["energy_cost_gbp"] + day["standing_charge_gbp"]
+        rate_index, rate_found = _search_ranges(rate_lookup, starts[sample_mask])
+        tariff_rates = np.full(len(rate_index), np.nan)
+        tariff_rates[rate_found] = rate_values[rate_index[rate_found]]
+        unit_rates[sample_mask] = tariff_rates
+
+    matched = ~np.isnan(unit_rates)
+    matched_kwh = np.where(matched, consumption, 0.0)
+    energy_cost = np.where(matched, consumption * unit_rates, 0.0)
+
+    totals = {
+        "kwh": np.bincount(day_index, weights=consumption, minlength=day_count),
+        "sample_count": np.bincount(day_index, minlength=day_count),
+        "matched_kwh": np.bincount(day_index, weights=matched_kwh, minlength=day_count),
+        **{
+            key: np.bincount(day_index, weights=band_kwh, minlength=day_count)
+            for key, band_kwh in _get_price_band_kwh(np.where(matched, unit_rates, 0.0), matched_kwh).items()
+        },
+        "energy_cost_gbp": np.bincount(day_index, weights=energy_cost, minlength=day_count),
+        "missing_rate_count": np.bincount(day_index[~matched], minlength=day_count),
+    }
 
-    return [daily[key] for key in sorted(daily)]
+    if annotate_samples:
+        for sample_index in np.flatnonzero(matched).tolist():
+            costed_samples[sample_index][SAMPLE_UNIT_RATE_KEY] = float(unit_rates[sample_index])
+
+    daily = {}
+    for index in np.flatnonzero(totals["sample_count"]).tolist():
+        day_key = (first_day + timedelta(days=index)).isoformat()
+        day = daily[day_key] = _new_daily_cost(day_key)
+        for key, values in totals.items():
+            day[key] = int(values[index]) if key.endswith("_count") else float(values[index])
+    return daily
+
+
+def _get_uk_day_index(starts):
+    """Return the first GB day, the number of days spanned and each epoch-second start's day offset.
+
+    Days are split at UK midnights, so clock-change days keep their 46 or
+    50 half-hours.
+    """
+    first_day = datetime.fromtimestamp(float(starts.min()), UK_TIMEZONE).date()
+    last_day = datetime.fromtimestamp(float(starts.max()), UK_TIMEZONE).date()
+    day_count = (last_day - first_day).days + 1
+    midnights = np.array([
+        datetime.combine(first_day + timedelta(days=offset), time.min, tzinfo=UK_TIMEZONE).timestamp()
+        for offset in range(day_count)
+    ])
+    return first_day, day_count, np.searchsorted(midnights, starts, side="right") - 1
+
+
+def _build_rate_timeline(records, offset):
+    """Return ``offset``-shifted epoch-second starts and ends and GBP unit rates, sorted by start.
+
+    Records without a start are dropped and open-ended records run to the
+    end of the offset block, matching ``_prepare_record_lookup``.
+    """
+    starts = _parse_epoch_seconds([record.get("valid_from") for record in records])
+    ends = _parse_epoch_seconds([record.get("valid_to") for record in records])
+    rates = np.array([float(record.get("value_inc_vat", 0.0)) / 100.0 for record in records], dtype=np.float64)
+    has_start = starts >= 0
+    starts, ends, rates = starts[has_start], ends[has_start], rates[has_start]
+    ends = np.where(ends >= 0, ends, (1 << TARIFF_TIMELINE_BITS) - 1)
+    order = np.argsort(starts, kind="stable")
+    return starts[order] + offset, ends[order] + offset, rates[order]
+
+
+def _parse_epoch_seconds(values):
+    """Return epoch seconds for Octopus timestamps, with ``-1`` for missing values.
+
+    UTC ``Z`` timestamps, which the API returns, are parsed by NumPy in one
+    call; anything else falls back to ``parse_octopus_datetime``.
+    """
+    if all(isinstance(value, str) and value.endswith("Z") for value in values):
+        try:
+            return np.array([value[:-1] for value in values], dtype="datetime64[s]").astype(np.int64)
+        except ValueError:
+            pass
+    parsed_values = (parse_octopus_datetime(value) for value in values)
+    return np.array([int(parsed.timestamp()) if parsed else -1 for parsed in parsed_values], dtype=np.int64)
+
+
+def _search_ranges(lookup, targets):
+    """Return the candidate range index for each target and whether the range covers it."""
+    if not lookup or not lookup[0]:
+        return np.zeros(len(targets), dtype=np.intp), np.zeros(len(targets), dtype=bool)
+
+    starts, ranges = lookup
+    range_starts = np.array([valid_from.timestamp() for valid_from in starts])
+    range_ends = np.array([
+        np.inf if valid_to.year == datetime.max.year else valid_to.timestamp()
+        for _valid_from, valid_to, _value in ranges
+    ])
+    index = np.searchsorted(range_starts, targets, side="right") - 1
+    found = index >= 0
+    index = np.maximum(index, 0)
+    found &= targets < range_ends[index]
+    return index, found
+
+
+def reband_daily_costs(daily_costs, samples, vectorized=None):
+    """Rebuild price band kWh for each day from the unit rates stored on samples.
+
+    Returns ``None`` when no sample carries a unit rate.  Days whose rated kWh
+    no longer match their costed kWh are dropped so the next refresh recosts
+    them.  ``vectorized`` selects the NumPy engine for the per-day band
+    totals, which is used by default when NumPy is installed.  The Flatpak
+    does not bundle NumPy, so the app uses the pure-Python engine.
+    """
+    if vectorized is None:
+        vectorized = np is not None
+    elif vectorized and np is None:
+        raise RuntimeError("NumPy is required for the vectorized price band engine.")
+
+    band_days = _sum_band_days_vectorized(samples) if vectorized else _sum_band_days(samples)
+    if band_days is None:
+        return None
+
+    rebanded = []
+    for day in daily_costs:
+        band_day = band_days.get(day.get("date"), {"matched_kwh": 0.0})
+        try:
+            matched_kwh = float(day.get("matched_kwh", 0.0))
+        except (TypeError, ValueError):
+            continue
+        if abs(band_day["matched_kwh"] - matched_kwh) > PRICE_BAND_KWH_TOLERANCE:
+            continue
+        rebanded.append({
+            **day,
+            "cheap_kwh": band_day.get("cheap_kwh", 0.0),
+            "negative_kwh": band_day.get("negative_kwh", 0.0),
+            "high_kwh": band_day.get("high_kwh", 0.0),
+            "price_band_version": PRICE_BAND_VERSION,
+        })
+    return rebanded
+
+
+def _parse_rated_sample(sample):
+    """Return ``(start, consumption, unit_rate_gbp)`` for a sample with a usable unit rate, else ``None``."""
+    unit_rate_gbp = sample.get(SAMPLE_UNIT_RATE_KEY)
+    if unit_rate_gbp is None:
+        return None
+    try:
+        start = parse_octopus_datetime(sample.get("interval_start"))
+        consumption = float(sample.get("consumption", 0.0))
+        unit_rate_gbp = float(unit_rate_gbp)
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if not start:
+        return None
+    return start, consumption, unit_rate_gbp
+
+
+def _sum_band_days(samples):
+    band_days = {}
+    has_unit_rates = False
+    for sample in samples:
+        rated_sample = _parse_rated_sample(sample)
+        if rated_sample is None:
+            continue
+
+        has_unit_rates = True
+        start, consumption, unit_rate_gbp = rated_sample
+        day_key = start.astimezone(UK_TIMEZONE).date().isoformat()
+        band_day = band_days.setdefault(
+            day_key,
+            {"matched_kwh": 0.0, "cheap_kwh": 0.0, "negative_kwh": 0.0, "high_kwh": 0.0},
+        )
+        band_day["matched_kwh"] += consumption
+        _add_price_band_kwh(band_day, unit_rate_gbp, consumption)
+
+    return band_days if has_unit_rates else None
+
+
+def _sum_band_days_vectorized(samples):
+    """Group rated samples into GB days with ``searchsorted`` and total each band with ``bincount``."""
+    rated_samples = [
+        rated_sample
+        for rated_sample in map(_parse_rated_sample, samples)
+        if rated_sample is not None
+    ]
+    if not rated_samples:
+        return None
+
+    starts = np.array([start.timestamp() for start, _kwh, _rate in rated_samples], dtype=np.float64)
+    consumption = np.array([kwh for _start, kwh, _rate in rated_samples], dtype=np.float64)
+    unit_rates = np.array([rate for _start, _kwh, rate in rated_samples], dtype=np.float64)
+
+    first_day, day_count, day_index = _get_uk_day_index(starts)
+    totals = {
+        "matched_kwh": np.bincount(day_index, weights=consumption, minlength=day_count),
+        **{
+            key: np.bincount(day_index, weights=band_kwh, minlength=day_count)
+            for key, band_kwh in _get_price_band_kwh(unit_rates, consumption).items()
+        },
+    }
+    sample_counts = np.bincount(day_index, minlength=day_count)
+
+    band_days = {}
+    for index in np.flatnonzero(sample_counts).tolist():
+        band_days[(first_day + timedelta(days=index)).isoformat()] = {
+            key: float(values[index]) for key, values in totals.items()
+        }
+    return band_days
+
+
+def _get_price_band_kwh(unit_rates, consumption):
+    """Return each sample's kWh in the cheap, negative and high columns, as ``_add_price_band_kwh`` adds them.
+
+    Each distinct rate is classified once with ``get_price_band``, so both
+    engines share the band rules.
+    """
+    band_keys = ("cheap_kwh", "negative_kwh", "high_kwh")
+    rates, rate_index = np.unique(unit_rates, return_inverse=True)
+    rate_bands = []
+    for rate in rates.tolist():
+        rate_band = dict.fromkeys(band_keys, 0.0)
+        _add_price_band_kwh(rate_band, rate, 1.0)
+        rate_bands.append(rate_band)
+    return {
+        key: consumption * np.array([rate_band[key] for rate_band in rate_bands], dtype=np.float64)[rate_index]
+        for key in band_keys
+    }
+
+
+def _add_price_band_kwh(day, unit_rate_gbp, consumption):
+    price_band = get_price_band(unit_rate_gbp)
+    if price_band == PRICE_BAND_NEGATIVE:
+        day["negative_kwh"] += consumption
+    if price_band in (PRICE_BAND_NEGATIVE, PRICE_BAND_LOW):
+        day["cheap_kwh"] += consumption
+    if price_band == PRICE_BAND_HIGH:
+        day["high_kwh"] += consumption
 
 
 def _prepare_tariff_lookup(tariff_periods):
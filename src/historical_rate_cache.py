@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from .historical_costs import parse_octopus_datetime
+from .uk_time import UK_TIMEZONE, local_day_bounds_utc, local_days_between
+
+HISTORICAL_RATE_CACHE_VERSION = 1
+HISTORICAL_RATE_RETENTION_DAYS = 121
+RATE_RECORD_KINDS = ("unit_rates", "standing_charges")
+
+
+def build_historical_rates_cache_key(tariff_code: str) -> str:
+    return f"octopus_historical_rates_{tariff_code}"
+
+
+def load_rate_cache(cache_manager, tariff_codes) -> dict:
+    """Read the persisted cache entry of each tariff that has one, keyed by tariff code."""
+    rate_cache = {}
+    for tariff_code in tariff_codes:
+        cached_entry, _cache_mtime = cache_manager.get(build_historical_rates_cache_key(tariff_code))
+        if cached_entry is not None:
+            rate_cache[tariff_code] = cached_entry
+    return rate_cache
+
+
+def store_rate_cache(cache_manager, rate_cache) -> None:
+    for tariff_code, cache_entry in rate_cache.items():
+        cache_manager.set(build_historical_rates_cache_key(tariff_code), cache_entry)
+
+
+def new_rate_cache_entry() -> dict:
+    return {"cache_version": HISTORICAL_RATE_CACHE_VERSION, "days": {}}
+
+
+def compatible_rate_cache_entry(entry) -> dict:
+    """Return a usable cache entry, replacing missing or outdated payloads."""
+    if (
+        not isinstance(entry, dict)
+        or entry.get("cache_version") != HISTORICAL_RATE_CACHE_VERSION
+        or not isinstance(entry.get("days"), dict)
+    ):
+        return new_rate_cache_entry()
+    return entry
+
+
+def get_uncached_day_spans(entry, period_start, period_end):
+    """Return contiguous UTC spans of GB days that are not cached as immutable.
+
+    Rates for a finished GB day never change, so only missing or still-current
+    days need to go back to the API.
+    """
+    spans = []
+    for day in local_days_between(period_start, period_end):
+        cached_day = entry["days"].get(day.isoformat())
+        if cached_day and cached_day.get("immutable"):
+            continue
+
+        day_start, day_end = local_day_bounds_utc(day)
+        if spans and spans[-1][1] == day_start:
+            spans[-1] = (spans[-1][0], day_end)
+        else:
+            spans.append((day_start, day_end))
+    return spans
+
+
+def store_rate_records(entry, unit_rates, standing_charges, span_start, span_end, now):
+    """Split freshly fetched records into the GB days of a span."""
+    parsed = {
+        kind: _parse_record_windows(records)
+        for kind, records in zip(RATE_RECORD_KINDS, (unit_rates, standing_charges), strict=True)
+    }
+    for day in local_days_between(span_start, span_end):
+        day_start, day_end = local_day_bounds_utc(day)
+        cached_day = {"immutable": day_end <= now}
+        for kind in RATE_RECORD_KINDS:
+            cached_day[kind] = [
+                record
+                for valid_from, valid_to, record in parsed[kind]
+                if valid_from < day_end and day_start < valid_to
+            ]
+        entry["days"][day.isoformat()] = cached_day
+
+
+def get_cached_rate_records(entry, period_start, period_end):
+    """Return de-duplicated unit rates and standing charges covering a period."""
+    records = {kind: {} for kind in RATE_RECORD_KINDS}
+    for day in local_days_between(period_start, period_end):
+        cached_day = entry["days"].get(day.isoformat())
+        if not cached_day:
+            continue
+        for kind in RATE_RECORD_KINDS:
+            for record in cached_day.get(kind, []):
+                records[kind][(record.get("valid_from"), record.get("valid_to"))] = record
+    return tuple(list(records[kind].values()) for kind in RATE_RECORD_KINDS)
+
+
+def prune_rate_cache_entry(entry, now):
+    cutoff = (now.astimezone(UK_TIMEZONE).date() - timedelta(days=HISTORICAL_RATE_RETENTION_DAYS)).isoformat()
+    entry["days"] = {
+        day_key: cached_day
+        for day_key, cached_day in entry["days"].items()
+        if day_key >= cutoff
+    }
+    return entry
+
+
+def _parse_record_windows(records):
+    parsed = []
+    for record in records or []:
+        try:
+            valid_from = parse_octopus_datetime(record.get("valid_from"))
+            valid_to = parse_octopus_datetime(record.get("valid_to")) or datetime.max.replace(tzinfo=timezone.utc)
+        except (AttributeError, TypeError, ValueError):
+            continue
+        if valid_from:
+            parsed.append((valid_from, valid_to, record))
+    return parsed
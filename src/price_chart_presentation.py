@@ -1,3 +1,5 @@
+from bisect import bisect_left
+
 try:
     from .uk_time import UK_TIMEZONE
 except ImportError:
@@ -49,6 +51,35 @@ def find_price_index_by_start(prices, target_time):
     )
 
 
+def get_range_index_spans(valid_from_values, ranges):
+    """Return ``(first_index, last_index, label)`` for each range that covers a visible slot."""
+    spans = []
+    for start_time, end_time, label in ranges:
+        first_index = bisect_left(valid_from_values, start_time)
+        last_index = bisect_left(valid_from_values, end_time) - 1
+        if first_index <= last_index:
+            spans.append((first_index, last_index, label))
+    return spans
+
+
+def get_window_shift(previous_prices, prices):
+    """Return how many slots ``prices`` has moved on from ``previous_prices``.
+
+    Returns ``None`` unless the slots the two windows share are the same
+    records, as they are when one price list's window moves forward.
+    """
+    if not previous_prices or not prices:
+        return None
+
+    shift = bisect_left([price['valid_from'] for price in previous_prices], prices[0]['valid_from'])
+    if shift == len(previous_prices) or previous_prices[shift] is not prices[0]:
+        return None
+    overlap = min(len(previous_prices) - shift, len(prices))
+    if any(prices[index] is not previous_prices[shift + index] for index in range(overlap)):
+        return None
+    return shift
+
+
 def get_flyout_horizontal_position(
     point_x,
     flyout_width,
@@ -71,16 +102,21 @@ def get_flyout_horizontal_position(
     return max(minimum_x, min(preferred_x, maximum_x))
 
 
-def get_day_transition_markers(valid_from_values, local_timezone=UK_TIMEZONE):
-    """Return each visible day boundary as an index and short chart label."""
-    if not valid_from_values:
+def get_day_transition_markers(valid_from_values, local_timezone=UK_TIMEZONE, start_index=1):
+    """Return each visible day boundary as an index and short chart label.
+
+    Boundaries before ``start_index`` are skipped, so markers can be found for
+    newly visible slots alone; labels still count days from the first slot.
+    """
+    start_index = max(1, start_index)
+    if start_index >= len(valid_from_values):
         return []
 
     first_date = valid_from_values[0].astimezone(local_timezone).date()
-    previous_date = first_date
+    previous_date = valid_from_values[start_index - 1].astimezone(local_timezone).date()
     markers = []
 
-    for index, valid_from in enumerate(valid_from_values[1:], start=1):
+    for index, valid_from in enumerate(valid_from_values[start_index:], start=start_index):
         current_date = valid_from.astimezone(local_timezone).date()
         if current_date != previous_date:
             day_offset = (current_date - first_date).days
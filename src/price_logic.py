@@ -1,11 +1,29 @@
-from datetime import datetime, time, timedelta, timezone
-from itertools import pairwise
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
 
 try:
+    from .price_series import as_price_series
+    from .time_of_use import (
+        ECONOMY_7_SCHEDULE,
+        TimeOfUseSchedule,
+        build_time_of_use_prices,
+        get_representative_rate,
+    )
     from .uk_time import UK_TIMEZONE
 except ImportError:
+    from price_series import as_price_series
+    from time_of_use import (
+        ECONOMY_7_SCHEDULE,
+        TimeOfUseSchedule,
+        build_time_of_use_prices,
+        get_representative_rate,
+    )
     from uk_time import UK_TIMEZONE
 
+PRICE_SUM_TOLERANCE_GBP = 1e-9
+
 
 def extract_product_code(selected_tariff_code):
     parts = selected_tariff_code.split('-')
@@ -19,81 +37,326 @@ def find_cheapest_slot(
     start_within_hours,
     whole_hour_starts_only=False,
 ):
-    num_slots = round(duration_hours * 2)
-    cutoff = now + timedelta(hours=start_within_hours)
-    sorted_prices = sorted(prices, key=lambda price: price['valid_from'])
-    prices_to_search = [p for p in sorted_prices if now < p['valid_to'] and p['valid_from'] < cutoff]
+    return find_cheapest_slots(
+        prices,
+        now,
+        [duration_hours],
+        [start_within_hours],
+        whole_hour_starts_only,
+    )[(duration_hours, start_within_hours)]
 
-    if len(prices_to_search) < num_slots:
-        return None
 
-    best_window = None
-    best_total_price = float('inf')
+def find_cheapest_slots(
+    prices,
+    now,
+    durations_hours,
+    start_within_hours_values,
+    whole_hour_starts_only=False,
+):
+    """Return the cheapest contiguous price window for every duration and search window.
+
+    Results are keyed by ``(duration_hours, start_within_hours)``.  Prices are
+    sorted, prefix-summed and indexed by contiguous run once, then each
+    duration is a single scan whose windows are bucketed by the earliest
+    search window they fit, so a running minimum answers every search window.
+    Equal-cost windows resolve to the earliest start.
+    """
+    start_within_values = sorted(set(start_within_hours_values))
+    if not start_within_values:
+        return {}
+
+    cutoffs = [now + timedelta(hours=start_within_hours) for start_within_hours in start_within_values]
+    price_index = _build_price_series_index(prices, now, cutoffs[-1], whole_hour_starts_only)
+    results = {}
+    for duration_hours in dict.fromkeys(durations_hours):
+        num_slots = round(duration_hours * 2)
+        best_windows = _find_cheapest_windows(price_index, num_slots, cutoffs)
+        for start_within_hours, best_window in zip(start_within_values, best_windows, strict=True):
+            results[(duration_hours, start_within_hours)] = _build_cheapest_slot(
+                price_index[0],
+                best_window,
+                num_slots,
+            )
+    return results
+
+
+def find_ranked_cheapest_slots(
+    prices,
+    now,
+    duration_hours,
+    start_within_hours,
+    count,
+    whole_hour_starts_only=False,
+):
+    """Return up to ``count`` cheapest non-overlapping contiguous windows, cheapest first.
+
+    Every window that fits the search is priced from the prefix sums and
+    heapified once.  Windows are popped cheapest first and kept unless they
+    overlap a window already kept, which is found by bisecting the kept start
+    indexes, so the first result matches ``find_cheapest_slot``.
+    """
+    num_slots = round(duration_hours * 2)
+    if count <= 0 or num_slots <= 0:
+        return []
 
-    for i in range(len(prices_to_search) - num_slots + 1):
-        window = prices_to_search[i:i + num_slots]
-        if whole_hour_starts_only and window[0]['valid_from'].astimezone(UK_TIMEZONE).minute != 0:
+    cutoff = now + timedelta(hours=start_within_hours)
+    price_index = _build_price_series_index(prices, now, cutoff, whole_hour_starts_only)
+    series, prefix_sums, run_starts, allowed_starts = price_index
+    # Prefix-sum differences carry rounding noise, so totals are rounded well
+    # below a hundredth of a penny before ties fall back to the earliest start.
+    candidates = [
+        (round(prefix_sums[start + num_slots] - prefix_sums[start], 9), start)
+        for start in range(len(series) - num_slots + 1)
+        if run_starts[start + num_slots - 1] <= start
+        and (allowed_starts is None or allowed_starts[start])
+        and series[start + num_slots - 1]['valid_to'] <= cutoff
+    ]
+    heapq.heapify(candidates)
+
+    ranked_slots = []
+    kept_starts = []
+    while candidates and len(ranked_slots) < count:
+        candidate = heapq.heappop(candidates)
+        start = candidate[1]
+        position = bisect_left(kept_starts, start)
+        if position < len(kept_starts) and kept_starts[position] - start < num_slots:
             continue
-        if window[-1]['valid_to'] > cutoff or not _has_contiguous_price_coverage(window):
+        if position and start - kept_starts[position - 1] < num_slots:
             continue
+        insort(kept_starts, start)
+        ranked_slots.append(_build_cheapest_slot(series, candidate, num_slots))
+    return ranked_slots
+
 
-        total_price = sum(p['price_gbp'] for p in window)
-        if total_price < best_total_price:
-            best_total_price = total_price
-            best_window = window
+def find_cheapest_split_slots(
+    prices,
+    now,
+    slot_count,
+    deadline,
+    min_run_slots=1,
+    max_blocks=None,
+):
+    """Return the cheapest ``slot_count`` half-hours that finish by ``deadline``, in any blocks.
 
-    if not best_window:
+    The result holds the chosen ``blocks`` as contiguous windows in time
+    order and the ``average_price_gbp`` across every chosen slot, or ``None``
+    when the slots cannot be fitted.  Without run constraints this is a heap
+    selection of the cheapest slots; a minimum run length or block limit
+    switches to a DP that adds one whole run at a time from the prefix sums.
+    """
+    if slot_count <= 0 or min_run_slots <= 0 or (max_blocks is not None and max_blocks <= 0):
         return None
 
-    return {
-        'start': best_window[0]['valid_from'],
-        'end': best_window[-1]['valid_to'],
-        'average_price_gbp': best_total_price / num_slots,
-    }
+    series, prefix_sums, run_starts, _allowed_starts = _build_price_series_index(prices, now, deadline, False)
+    usable_count = len(series)
+    while usable_count and series[usable_count - 1]['valid_to'] > deadline:
+        usable_count -= 1
+
+    if min_run_slots == 1 and max_blocks is None:
+        chosen = heapq.nsmallest(
+            slot_count,
+            range(usable_count),
+            key=lambda index: (series[index]['price_gbp'], index),
+        )
+        if len(chosen) < slot_count:
+            return None
+        chosen.sort()
+    else:
+        chosen = _select_cheapest_runs(
+            prefix_sums,
+            run_starts,
+            usable_count,
+            slot_count,
+            min_run_slots,
+            max_blocks,
+        )
+        if chosen is None:
+            return None
+    return _build_split_selection(series, chosen)
+
 
+def find_cheapest_timer_slot(
+    prices,
+    now,
+    duration_hours,
+    start_within_hours,
+    timer_mode,
+    price_index=None,
+    timer_step_minutes=60,
+):
+    return find_cheapest_timer_slots(
+        prices,
+        now,
+        [duration_hours],
+        [start_within_hours],
+        timer_mode,
+        price_index,
+        timer_step_minutes,
+    )[(duration_hours, start_within_hours)]
+
+
+def find_cheapest_timer_slots(
+    prices,
+    now,
+    durations_hours,
+    start_within_hours_values,
+    timer_mode,
+    price_index=None,
+    timer_step_minutes=60,
+):
+    """Return the cheapest timer delay for every duration and search window.
+
+    Delays are multiples of ``timer_step_minutes`` from ``now``, whole hours
+    by default.  Results are keyed like ``find_cheapest_slots``.  Each delay
+    is priced once per duration and bucketed by the shortest search window
+    that contains its run, so a running minimum answers every search window.
+    """
+    if timer_mode not in ("start", "finish"):
+        raise ValueError(f"Unsupported timer mode: {timer_mode}")
+    if timer_step_minutes <= 0:
+        raise ValueError("timer_step_minutes must be positive")
+
+    start_within_values = sorted(set(start_within_hours_values))
+    if not start_within_values:
+        return {}
 
-def find_cheapest_timer_slot(prices, now, duration_hours, start_within_hours, timer_mode):
     now = now.replace(second=0, microsecond=0)
-    duration = timedelta(hours=duration_hours)
-    cutoff = now + timedelta(hours=start_within_hours)
-    sorted_prices = sorted(prices, key=lambda price: price['valid_from'])
-
-    best_slot = None
-    best_average_price = float('inf')
-
-    for hours_from_now in range(start_within_hours + 1):
-        timer_time = now + timedelta(hours=hours_from_now)
-        if timer_mode == "start":
-            start = timer_time
-            end = start + duration
-        elif timer_mode == "finish":
-            end = timer_time
-            start = end - duration
-        else:
-            raise ValueError(f"Unsupported timer mode: {timer_mode}")
+    price_index = price_index or PriceIntegralIndex(prices)
+    cutoffs = [now + timedelta(hours=start_within_hours) for start_within_hours in start_within_values]
+    timer_step = timedelta(minutes=timer_step_minutes)
+    results = {}
+    for duration_hours in dict.fromkeys(durations_hours):
+        duration = timedelta(hours=duration_hours)
+        best_by_cutoff = [None] * len(cutoffs)
+        for steps_from_now in _get_timer_candidate_steps(price_index, now, duration, cutoffs, timer_mode, timer_step):
+            start, end = _get_timer_window(now + timer_step * steps_from_now, duration, timer_mode)
+            # The run ends no earlier than the timer fires, so one bisect
+            # covers both the delay and the run limit.
+            cutoff_index = bisect_left(cutoffs, end)
+            if start < now or cutoff_index == len(cutoffs):
+                continue
+
+            average_price = price_index.weighted_average(start, end)
+            if average_price is None:
+                continue
+            candidate = (average_price, steps_from_now)
+            if _is_cheaper_window(candidate, best_by_cutoff[cutoff_index]):
+                best_by_cutoff[cutoff_index] = candidate
+
+        best_slot = None
+        best_window = None
+        for start_within_hours, candidate in zip(start_within_values, best_by_cutoff, strict=True):
+            if _is_cheaper_window(candidate, best_window):
+                best_window = candidate
+                start, end = _get_timer_window(now + timer_step * candidate[1], duration, timer_mode)
+                best_slot = {
+                    'start': start,
+                    'end': end,
+                    'average_price_gbp': candidate[0],
+                }
+            results[(duration_hours, start_within_hours)] = best_slot
+    return results
+
+
+def _get_timer_window(timer_time, duration, timer_mode):
+    if timer_mode == "start":
+        return timer_time, timer_time + duration
+    return timer_time - duration, timer_time
+
+
+def _get_timer_candidate_steps(price_index, now, duration, cutoffs, timer_mode, timer_step):
+    """Return, in ascending order, the timer steps that can hold the cheapest run.
+
+    A run's cost is linear in its timer time until its start or end crosses a
+    price slot boundary, ``now`` or a search cutoff, and coverage only changes
+    at those crossings too.  The cheapest step on each linear piece is its
+    first or last, so only the steps either side of each crossing are priced,
+    unless pricing every step is cheaper.
+    """
+    last_step = (cutoffs[-1] - now) // timer_step
+    boundaries = [now, *cutoffs, *price_index.boundaries()]
+    if last_step < 4 * len(boundaries):
+        return range(last_step + 1)
+
+    start_offset = timedelta(0) if timer_mode == "start" else -duration
+    steps = {0, last_step}
+    for boundary in boundaries:
+        for timer_time in (boundary - start_offset, boundary - start_offset - duration):
+            step = (timer_time - now) // timer_step
+            steps.update((step, step + 1))
+    return sorted(step for step in steps if 0 <= step <= last_step)
+
+
+class PriceIntegralIndex:
+    """Cumulative price-seconds over sorted price slots.
+
+    The weighted average price over any ``[start, end)`` is two bisects and a
+    subtraction.  Where slots overlap, the earlier slot keeps the overlap; a
+    window touching a gap in price coverage has no average.
+    """
 
-        if start < now or end > cutoff:
-            continue
+    __slots__ = ("_cumulative", "_ends", "_prices", "_run_ids", "_starts")
+
+    def __init__(self, prices):
+        self._starts = []
+        self._ends = []
+        self._prices = []
+        self._cumulative = []
+        self._run_ids = []
+        covered_until = None
+        run_id = -1
+        total = 0.0
+        for price in as_price_series(prices):
+            slot_start = price['valid_from'].timestamp()
+            slot_end = price['valid_to'].timestamp()
+            if covered_until is not None and slot_end <= covered_until:
+                continue
+            if covered_until is None or slot_start > covered_until:
+                run_id += 1
+            else:
+                slot_start = covered_until
+            self._starts.append(slot_start)
+            self._ends.append(slot_end)
+            self._prices.append(price['price_gbp'])
+            self._cumulative.append(total)
+            self._run_ids.append(run_id)
+            total += price['price_gbp'] * (slot_end - slot_start)
+            covered_until = slot_end
+
+    def weighted_average(self, start, end):
+        """Return the time-weighted average price over ``[start, end)``, or ``None`` without full coverage."""
+        start_seconds = start.timestamp()
+        end_seconds = end.timestamp()
+        if end_seconds <= start_seconds:
+            return None
 
-        average_price = _calculate_weighted_average_price(sorted_prices, start, end)
-        if average_price is None:
-            continue
+        first = bisect_right(self._starts, start_seconds) - 1
+        last = bisect_left(self._ends, end_seconds)
+        if (
+            first < 0
+            or last >= len(self._ends)
+            or self._ends[first] <= start_seconds
+            or self._run_ids[first] != self._run_ids[last]
+        ):
+            return None
+
+        total = self._integral_to(last, end_seconds) - self._integral_to(first, start_seconds)
+        return total / (end_seconds - start_seconds)
 
-        if average_price < best_average_price:
-            best_average_price = average_price
-            best_slot = {
-                'start': start,
-                'end': end,
-                'average_price_gbp': average_price,
-            }
+    def boundaries(self):
+        """Return every slot start and end, including the edges of coverage gaps."""
+        return [
+            datetime.fromtimestamp(seconds, timezone.utc)
+            for seconds in sorted({*self._starts, *self._ends})
+        ]
 
-    return best_slot
+    def _integral_to(self, index, seconds):
+        return self._cumulative[index] + self._prices[index] * (seconds - self._starts[index])
 
 
-def build_fixed_start_price_window(prices, start, duration_hours):
+def build_fixed_start_price_window(prices, start, duration_hours, price_index=None):
     end = start + timedelta(hours=duration_hours)
-    sorted_prices = sorted(prices, key=lambda price: price['valid_from'])
-    average_price = _calculate_weighted_average_price(sorted_prices, start, end)
+    average_price = (price_index or PriceIntegralIndex(prices)).weighted_average(start, end)
     if average_price is None:
         return None
 
@@ -104,40 +367,158 @@ def build_fixed_start_price_window(prices, start, duration_hours):
     }
 
 
-def _has_contiguous_price_coverage(window):
-    return all(
-        current_price['valid_to'] == next_price['valid_from']
-        for current_price, next_price in pairwise(window)
-    )
-
+def _build_price_series_index(prices, now, cutoff, whole_hour_starts_only):
+    """Return the searchable prices with their prefix sums, run starts and allowed starts.
 
-def _calculate_weighted_average_price(prices, start, end):
-    duration_seconds = (end - start).total_seconds()
-    if duration_seconds <= 0:
+    ``run_starts[i]`` is the index where the gap-free run containing price
+    ``i`` begins, so a window ``[start, end]`` is contiguous exactly when
+    ``run_starts[end] <= start``.
+    """
+    series = as_price_series(prices).active_window(now, cutoff)
+    prefix_sums = list(accumulate(series.prices_gbp, initial=0.0))
+    starts = series.starts
+    ends = series.ends
+    run_starts = []
+    for index in range(len(series)):
+        if index and ends[index - 1] == starts[index]:
+            run_starts.append(run_starts[-1])
+        else:
+            run_starts.append(index)
+
+    allowed_starts = None
+    if whole_hour_starts_only:
+        allowed_starts = [price['valid_from'].astimezone(UK_TIMEZONE).minute == 0 for price in series]
+    return series, prefix_sums, run_starts, allowed_starts
+
+
+def _find_cheapest_windows(price_index, num_slots, cutoffs):
+    """Return ``(total_price, start_index)`` of the cheapest window for each ascending cutoff."""
+    series, prefix_sums, run_starts, allowed_starts = price_index
+    best_by_cutoff = [None] * len(cutoffs)
+    if num_slots > 0:
+        for start in range(len(series) - num_slots + 1):
+            last = start + num_slots - 1
+            if run_starts[last] > start or (allowed_starts is not None and not allowed_starts[start]):
+                continue
+            cutoff_index = bisect_left(cutoffs, series[last]['valid_to'])
+            if cutoff_index == len(cutoffs):
+                continue
+            candidate = (prefix_sums[last + 1] - prefix_sums[start], start)
+            if _is_cheaper_window(candidate, best_by_cutoff[cutoff_index]):
+                best_by_cutoff[cutoff_index] = candidate
+
+    best_windows = []
+    best_window = None
+    for candidate in best_by_cutoff:
+        if _is_cheaper_window(candidate, best_window):
+            best_window = candidate
+        best_windows.append(best_window)
+    return best_windows
+
+
+def _is_cheaper_window(candidate, best):
+    if candidate is None:
+        return False
+    if best is None:
+        return True
+    # Prefix-sum differences carry rounding noise, so near-equal totals are ties.
+    if abs(candidate[0] - best[0]) <= PRICE_SUM_TOLERANCE_GBP:
+        return candidate[1] < best[1]
+    return candidate[0] < best[0]
+
+
+def _build_cheapest_slot(series, best_window, num_slots):
+    if best_window is None:
         return None
 
-    cursor = start
-    total_price_seconds = 0.0
+    window = series[best_window[1]:best_window[1] + num_slots]
+    return {
+        'start': window[0]['valid_from'],
+        'end': window[-1]['valid_to'],
+        'average_price_gbp': sum(p['price_gbp'] for p in window) / num_slots,
+    }
+
 
-    for price in prices:
-        if price['valid_to'] <= cursor:
-            continue
-        if price['valid_from'] >= end:
+def _select_cheapest_runs(prefix_sums, run_starts, usable_count, slot_count, min_run_slots, max_blocks):
+    """Return the sorted slot indexes of the cheapest runs, or ``None`` when none fit.
+
+    ``states[i]`` maps ``(slots_chosen, blocks_used)`` to the cheapest way of
+    deciding every slot before ``i``.  A run always ends at a skipped slot or a
+    price gap, so runs never merge and each one counts as a block.
+    """
+    run_ends = [0] * usable_count
+    for index in range(usable_count - 1, -1, -1):
+        if index + 1 < usable_count and run_starts[index + 1] == run_starts[index]:
+            run_ends[index] = run_ends[index + 1]
+        else:
+            run_ends[index] = index + 1
+
+    states = [{} for _ in range(usable_count + 1)]
+    states[0][(0, 0)] = (0.0, None)
+    for index in range(usable_count):
+        for (chosen_count, blocks_used), (cost, _back) in states[index].items():
+            _relax_run_state(states[index + 1], (chosen_count, blocks_used), cost, (index, chosen_count, blocks_used, 0))
+            if max_blocks is not None and blocks_used >= max_blocks:
+                continue
+
+            next_blocks_used = blocks_used + 1 if max_blocks is not None else 0
+            longest_run = min(slot_count - chosen_count, run_ends[index] - index)
+            for length in range(min_run_slots, longest_run + 1):
+                end = index + length
+                next_index = end if end == usable_count or run_starts[end] == end else end + 1
+                _relax_run_state(
+                    states[next_index],
+                    (chosen_count + length, next_blocks_used),
+                    cost + prefix_sums[end] - prefix_sums[index],
+                    (index, chosen_count, blocks_used, length),
+                )
+
+    final_states = [
+        (cost, key)
+        for key, (cost, _back) in states[usable_count].items()
+        if key[0] == slot_count
+    ]
+    if not final_states:
+        return None
+
+    _cost, key = min(final_states, key=lambda state: state[0])
+    chosen = []
+    index = usable_count
+    while True:
+        back = states[index][key][1]
+        if back is None:
             break
-        if price['valid_from'] > cursor:
-            return None
+        index, chosen_count, blocks_used, length = back
+        chosen.extend(range(index, index + length))
+        key = (chosen_count, blocks_used)
+    chosen.sort()
+    return chosen
 
-        overlap_start = max(cursor, price['valid_from'])
-        overlap_end = min(end, price['valid_to'])
-        if overlap_end <= overlap_start:
-            continue
 
-        total_price_seconds += price['price_gbp'] * (overlap_end - overlap_start).total_seconds()
-        cursor = overlap_end
-        if cursor >= end:
-            return total_price_seconds / duration_seconds
+def _relax_run_state(states, key, cost, back):
+    current = states.get(key)
+    if current is None or cost < current[0] - PRICE_SUM_TOLERANCE_GBP:
+        states[key] = (cost, back)
 
-    return None
+
+def _build_split_selection(series, chosen):
+    blocks = []
+    block_start = chosen[0]
+    for position, index in enumerate(chosen):
+        next_index = chosen[position + 1] if position + 1 < len(chosen) else None
+        if next_index == index + 1 and series[index]['valid_to'] == series[next_index]['valid_from']:
+            continue
+        window = series[block_start:index + 1]
+        blocks.append({
+            'start': window[0]['valid_from'],
+            'end': window[-1]['valid_to'],
+            'average_price_gbp': sum(p['price_gbp'] for p in window) / len(window),
+        })
+        block_start = next_index
+    return {
+        'blocks': blocks,
+        'average_price_gbp': sum(series[index]['price_gbp'] for index in chosen) / len(chosen),
+    }
 
 
 def build_dual_register_price_windows(
@@ -145,33 +526,35 @@ def build_dual_register_price_windows(
     night_rates,
     period_start,
     period_end,
-    # Octopus documents smart-meter Economy 7 off-peak as 00:30-07:30 UTC.
-    # https://octopus.energy/help-and-faqs/articles/what-is-an-economy-7-meter-and-tariff/
-    night_start=time(0, 30),
-    night_end=time(7, 30),
+    night_start=ECONOMY_7_SCHEDULE.bands[0][1],
+    night_end=ECONOMY_7_SCHEDULE.bands[0][2],
 ):
     """
-    Expands day/night unit-rate records into the half-hour windows used by the chart.
-    The Economy 7 switching times are treated as UTC clock times.
+    Expands day/night unit-rate records into half-hour Octopus rate records.
+    The Economy 7 switching times are treated as UTC clock times.  Live
+    prices use ``build_time_of_use_prices`` directly; these string records
+    are for callers that store rates in the API's own shape.
     """
-    current = _floor_to_half_hour(period_start.astimezone(timezone.utc))
-    period_end = period_end.astimezone(timezone.utc)
-    day_rate = _representative_register_rate(day_rates, current, period_end)
-    night_rate = _representative_register_rate(night_rates, current, period_end)
-    prices = []
-
-    while current < period_end:
-        next_slot = current + timedelta(minutes=30)
-        rate = night_rate if _is_night_slot(current, night_start, night_end) else day_rate
-        if rate:
-            prices.append({
-                'valid_from': current.isoformat().replace("+00:00", "Z"),
-                'valid_to': next_slot.isoformat().replace("+00:00", "Z"),
-                'value_inc_vat': rate['value_inc_vat'],
-            })
-        current = next_slot
+    schedule = TimeOfUseSchedule((("night", night_start, night_end),))
+    register_rates = {"day": day_rates, "night": night_rates}
+    register_start = _floor_to_half_hour(period_start.astimezone(timezone.utc))
+    values = {
+        register: rate['value_inc_vat']
+        for register, rates in register_rates.items()
+        if (rate := get_representative_rate(rates, register_start, period_end))
+    }
+    return [
+        {
+            'valid_from': _format_utc_timestamp(slot['valid_from']),
+            'valid_to': _format_utc_timestamp(slot['valid_to']),
+            'value_inc_vat': values[slot['register']],
+        }
+        for slot in build_time_of_use_prices(schedule, register_rates, period_start, period_end)
+    ]
 
-    return prices
+
+def _format_utc_timestamp(value):
+    return value.isoformat().replace("+00:00", "Z")
 
 
 def _floor_to_half_hour(value):
@@ -179,51 +562,6 @@ def _floor_to_half_hour(value):
     return value.replace(minute=minute, second=0, microsecond=0)
 
 
-def _is_night_slot(value, night_start, night_end):
-    slot_time = value.time().replace(tzinfo=None)
-    if night_start <= night_end:
-        return night_start <= slot_time < night_end
-    return slot_time >= night_start or slot_time < night_end
-
-
-def _representative_register_rate(rates, period_start, period_end):
-    parsed_rates = []
-    for rate in rates:
-        parsed = _parse_rate_window(rate)
-        if not parsed:
-            continue
-
-        valid_from, valid_to = parsed
-        if valid_from < period_end and period_start < valid_to:
-            parsed_rates.append((rate, valid_from, valid_to))
-
-    if not parsed_rates:
-        return None
-
-    current_rate = next(
-        (rate for rate, valid_from, valid_to in parsed_rates if valid_from <= period_start < valid_to),
-        None,
-    )
-    if current_rate:
-        return current_rate
-
-    return min(parsed_rates, key=lambda item: item[1])[0]
-
-
-def _parse_rate_window(rate):
-    try:
-        valid_from = datetime.fromisoformat(rate['valid_from'].replace('Z', '+00:00'))
-        valid_to = (
-            datetime.fromisoformat(rate['valid_to'].replace('Z', '+00:00'))
-            if rate.get('valid_to')
-            else datetime.max.replace(tzinfo=timezone.utc)
-        )
-    except (KeyError, ValueError, TypeError):
-        return None
-
-    return valid_from, valid_to
-
-
 def build_region_to_tariffs_map(product_data, region_code_to_name):
     region_to_tariffs_map = {code: [] for code in region_code_to_name}
     product_name = product_data.get('full_name', 'Agile Tariff')
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from itertools import pairwise
+
+try:
+    from .price_bands import (
+        PRICE_BAND_HIGH,
+        PRICE_BAND_LOW,
+        PRICE_BAND_MEDIUM,
+        PRICE_BAND_NEGATIVE,
+        get_price_band,
+    )
+except ImportError:
+    from price_bands import (
+        PRICE_BAND_HIGH,
+        PRICE_BAND_LOW,
+        PRICE_BAND_MEDIUM,
+        PRICE_BAND_NEGATIVE,
+        get_price_band,
+    )
+
+PRICE_BAND_CODES = (PRICE_BAND_NEGATIVE, PRICE_BAND_LOW, PRICE_BAND_MEDIUM, PRICE_BAND_HIGH)
+
+
+class PriceSeries(Sequence):
+    """Price slots sorted by start, backed by parallel arrays and never changed once built.
+
+    Items are the original ``valid_from``/``valid_to``/``price_gbp`` dicts, so
+    a series can stand in for the sorted price lists used elsewhere.  Starts
+    and ends are also held as epoch seconds, prices as floats and price bands
+    as indexes into ``PRICE_BAND_CODES``.  Slicing returns a view over the
+    same arrays, and time lookups bisect the epoch starts.
+    """
+
+    __slots__ = ("_band_codes", "_ends", "_offset", "_prices", "_records", "_starts", "_stop")
+
+    def __init__(self, prices=()):
+        records = list(prices)
+        if any(left['valid_from'] > right['valid_from'] for left, right in pairwise(records)):
+            records.sort(key=lambda price: price['valid_from'])
+        self._records = tuple(records)
+        self._starts = memoryview(array('q', (int(price['valid_from'].timestamp()) for price in records)))
+        self._ends = memoryview(array('q', (int(price['valid_to'].timestamp()) for price in records)))
+        self._prices = memoryview(array('d', (price['price_gbp'] for price in records)))
+        self._band_codes = memoryview(array(
+            'b',
+            (PRICE_BAND_CODES.index(get_price_band(price['price_gbp'])) for price in records),
+        ))
+        self._offset = 0
+        self._stop = len(records)
+
+    @classmethod
+    def _view(cls, source, offset, stop):
+        view = cls.__new__(cls)
+        view._records = source._records
+        view._starts = source._starts[offset:stop]
+        view._ends = source._ends[offset:stop]
+        view._prices = source._prices[offset:stop]
+        view._band_codes = source._band_codes[offset:stop]
+        view._offset = source._offset + offset
+        view._stop = source._offset + stop
+        return view
+
+    def __len__(self):
+        return self._stop - self._offset
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("PriceSeries views must be contiguous")
+            return PriceSeries._view(self, start, max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PriceSeries index out of range")
+        return self._records[self._offset + index]
+
+    def __iter__(self):
+        return iter(self._records[self._offset:self._stop])
+
+    def __eq__(self, other):
+        if isinstance(other, (PriceSeries, list, tuple)):
+            return len(self) == len(other) and all(left == right for left, right in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    @property
+    def starts(self):
+        """Epoch-second slot starts."""
+        return self._starts
+
+    @property
+    def ends(self):
+        """Epoch-second slot ends."""
+        return self._ends
+
+    @property
+    def prices_gbp(self):
+        return self._prices
+
+    @property
+    def band_codes(self):
+        return self._band_codes
+
+    def band_at(self, index):
+        return PRICE_BAND_CODES[self._band_codes[index]]
+
+    def index_at(self, moment):
+        """Return the index of the slot in force at ``moment``, or ``-1``."""
+        index = bisect_right(self._starts, moment.timestamp()) - 1
+        if index >= 0 and moment.timestamp() < self._ends[index]:
+            return index
+        return -1
+
+    def window(self, start, end):
+        """Return a view of the slots starting in ``[start, end)``."""
+        return self[
+            bisect_left(self._starts, start.timestamp()):bisect_left(self._starts, end.timestamp())
+        ]
+
+    def active_window(self, now, cutoff):
+        """Return a view of the slots that end after ``now`` and start before ``cutoff``.
+
+        Price slots do not overlap, so only the slot in force at ``now`` can
+        start before it and still qualify.
+        """
+        now_seconds = now.timestamp()
+        first = bisect_right(self._starts, now_seconds)
+        while first > 0 and self._ends[first - 1] > now_seconds:
+            first -= 1
+        return self[first:max(first, bisect_left(self._starts, cutoff.timestamp()))]
+
+    def mean_price_gbp(self):
+        if not len(self):
+            return None
+        return sum(self._prices) / len(self)
+
+
+def as_price_series(prices):
+    """Return ``prices`` when it is already a ``PriceSeries``, otherwise a new sorted series."""
+    return prices if isinstance(prices, PriceSeries) else PriceSeries(prices)
@@ -0,0 +1,339 @@
+"""Flat arrays of region boundaries and their compact, memory-mappable form.
+
+Boundaries are held as offset tables into one coordinate array, with a
+bounding box per ring and a uniform grid of ring segments, so lookups can
+read them without building Python objects per point.  The binary form is
+written at build time from the bundled GeoJSON and mapped read-only at run
+time; the arrays inside it are used in place.
+
+The binary form stores coordinates as float32, which holds GB latitudes
+and longitudes to within about 0.2 m.  A point that close to a boundary,
+or to one of its vertices, can therefore fall in the neighbouring region
+from the one the float64 GeoJSON gives.  Location fixes are far coarser
+than that, and a fix whose reported accuracy reaches a boundary is
+already passed back for the user to confirm.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+REGION_GEOMETRY_MAGIC = b"OAGR"
+REGION_GEOMETRY_VERSION = 1
+# The segment grid has this many cells along each side of the mapped area.
+REGION_GRID_SIZE = 128
+
+_HEADER = struct.Struct("<4s7I4d")
+
+
+class RegionGeometry:
+    """Region boundaries as flat offset tables over one coordinate array.
+
+    Feature ``i`` owns polygons ``feature_polygon_offsets[i:i + 2]``, each
+    polygon owns rings from ``polygon_ring_offsets`` and each ring owns
+    points from ``ring_point_offsets``, with its outer ring first.
+    ``coordinates`` interleaves longitude and latitude.  Segment ``j`` runs
+    to point ``j`` from the previous point of its ring, wrapping at the
+    ring's start, and ``segment_rings`` names its ring.  Grid cell ``c``
+    lists the segments whose boxes touch it in
+    ``cell_segments[cell_offsets[c]:cell_offsets[c + 1]]``.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "cell_offsets",
+        "cell_segments",
+        "coordinates",
+        "feature_polygon_offsets",
+        "grid_bounds",
+        "grid_size",
+        "names",
+        "polygon_ring_offsets",
+        "ring_boxes",
+        "ring_point_offsets",
+        "segment_rings",
+    )
+
+    def __init__(
+        self,
+        names,
+        feature_polygon_offsets,
+        polygon_ring_offsets,
+        ring_point_offsets,
+        ring_boxes,
+        coordinates,
+        segment_rings,
+        grid_size,
+        grid_bounds,
+        cell_offsets,
+        cell_segments,
+        buffer=None,
+    ):
+        self.names = names
+        self.feature_polygon_offsets = feature_polygon_offsets
+        self.polygon_ring_offsets = polygon_ring_offsets
+        self.ring_point_offsets = ring_point_offsets
+        self.ring_boxes = ring_boxes
+        self.coordinates = coordinates
+        self.segment_rings = segment_rings
+        self.grid_size = grid_size
+        self.grid_bounds = grid_bounds
+        self.cell_offsets = cell_offsets
+        self.cell_segments = cell_segments
+        self._buffer = buffer
+
+    @classmethod
+    def from_features(
+        cls,
+        features: Iterable[dict[str, Any]],
+        coordinate_typecode: str = "d",
+        grid_size: int = REGION_GRID_SIZE,
+    ) -> RegionGeometry:
+        """Flatten GeoJSON Polygon and MultiPolygon features.
+
+        Features keep their ``longname`` property as their name.  With a
+        ``coordinate_typecode`` of ``"f"`` coordinates are rounded to
+        float32 before boxes and grid cells are worked out, as in the
+        binary form.
+        """
+        names = []
+        feature_polygon_offsets = array("I", [0])
+        polygon_ring_offsets = array("I", [0])
+        ring_point_offsets = array("I", [0])
+        coordinates = array(coordinate_typecode)
+        for feature in features:
+            properties = feature.get("properties")
+            name = properties.get("longname") if isinstance(properties, dict) else None
+            names.append(name if isinstance(name, str) else "")
+            geometry = feature.get("geometry")
+            for polygon in _polygons_for_geometry(geometry if isinstance(geometry, dict) else {}):
+                for ring in filter(None, polygon):
+                    for longitude, latitude, *_altitude in ring:
+                        coordinates.append(longitude)
+                        coordinates.append(latitude)
+                    ring_point_offsets.append(len(coordinates) // 2)
+                polygon_ring_offsets.append(len(ring_point_offsets) - 1)
+            feature_polygon_offsets.append(len(polygon_ring_offsets) - 1)
+
+        ring_count = len(ring_point_offsets) - 1
+        segment_rings = array("H" if ring_count <= 0xFFFF else "I")
+        ring_boxes = array(coordinate_typecode)
+        for ring_id in range(ring_count):
+            start, end = ring_point_offsets[ring_id], ring_point_offsets[ring_id + 1]
+            segment_rings.extend([ring_id] * (end - start))
+            longitudes = coordinates[2 * start:2 * end:2]
+            latitudes = coordinates[2 * start + 1:2 * end:2]
+            ring_boxes.extend((min(longitudes), min(latitudes), max(longitudes), max(latitudes)))
+
+        geometry = cls(
+            names,
+            feature_polygon_offsets,
+            polygon_ring_offsets,
+            ring_point_offsets,
+            ring_boxes,
+            coordinates,
+            segment_rings,
+            grid_size,
+            (0.0, 0.0, 0.0, 0.0),
+            array("I", [0] * (grid_size * grid_size + 1)),
+            array("I"),
+        )
+        geometry._build_grid()
+        return geometry
+
+    def _build_grid(self):
+        ring_boxes = self.ring_boxes
+        if len(ring_boxes):
+            self.grid_bounds = (
+                min(ring_boxes[0::4]),
+                min(ring_boxes[1::4]),
+                max(ring_boxes[2::4]),
+                max(ring_boxes[3::4]),
+            )
+        cells = {}
+        for segment_id in range(len(self.segment_rings)):
+            x1, y1, x2, y2 = self.segment(segment_id)
+            first_column, first_row = self.cell(min(x1, x2), min(y1, y2))
+            last_column, last_row = self.cell(max(x1, x2), max(y1, y2))
+            for row in range(first_row, last_row + 1):
+                for column in range(first_column, last_column + 1):
+                    cells.setdefault(row * self.grid_size + column, []).append(segment_id)
+
+        cell_offsets = array("I", [0])
+        cell_segments = array("I")
+        for cell_id in range(self.grid_size * self.grid_size):
+            cell_segments.extend(cells.get(cell_id, ()))
+            cell_offsets.append(len(cell_segments))
+        self.cell_offsets = cell_offsets
+        self.cell_segments = cell_segments
+
+    @classmethod
+    def from_buffer(cls, buffer) -> RegionGeometry:
+        """Read the binary form in place; the arrays are views into ``buffer``."""
+        if sys.byteorder != "little":
+            raise ValueError("Binary region geometry is little-endian.")
+        if len(buffer) < _HEADER.size:
+            raise ValueError("Binary region geometry is truncated.")
+        (
+            magic,
+            version,
+            grid_size,
+            feature_count,
+            polygon_count,
+            ring_count,
+            point_count,
+            cell_segment_count,
+            *grid_bounds,
+        ) = _HEADER.unpack_from(buffer)
+        if magic != REGION_GEOMETRY_MAGIC or version != REGION_GEOMETRY_VERSION:
+            raise ValueError("Unsupported binary region geometry.")
+
+        # Check the whole layout before taking any views, so a rejected
+        # buffer has no exports left and can be closed.
+        layout = []
+        offset = _HEADER.size
+        for typecode, count in (
+            ("I", feature_count + 1),
+            ("I", polygon_count + 1),
+            ("I", ring_count + 1),
+            ("I", grid_size * grid_size + 1),
+            ("I", cell_segment_count),
+            ("f", ring_count * 4),
+            ("f", point_count * 2),
+            ("H" if ring_count <= 0xFFFF else "I", point_count),
+        ):
+            end = offset + count * struct.calcsize(typecode)
+            if end > len(buffer):
+                raise ValueError("Binary region geometry is truncated.")
+            layout.append((typecode, offset, end))
+            offset = _align(end)
+        names = bytes(buffer[offset:]).decode("utf-8").split("\0") if feature_count else []
+        if len(names) != feature_count:
+            raise ValueError("Binary region geometry has the wrong number of names.")
+
+        view = memoryview(buffer)
+        sections = [view[start:end].cast(typecode) for typecode, start, end in layout]
+        (
+            feature_polygon_offsets,
+            polygon_ring_offsets,
+            ring_point_offsets,
+            cell_offsets,
+            cell_segments,
+            ring_boxes,
+            coordinates,
+            segment_rings,
+        ) = sections
+        return cls(
+            names,
+            feature_polygon_offsets,
+            polygon_ring_offsets,
+            ring_point_offsets,
+            ring_boxes,
+            coordinates,
+            segment_rings,
+            grid_size,
+            tuple(grid_bounds),
+            cell_offsets,
+            cell_segments,
+            buffer,
+        )
+
+    def to_bytes(self) -> bytes:
+        """Return the binary form, with float32 coordinates and boxes."""
+        chunks = [
+            _HEADER.pack(
+                REGION_GEOMETRY_MAGIC,
+                REGION_GEOMETRY_VERSION,
+                self.grid_size,
+                len(self.names),
+                len(self.polygon_ring_offsets) - 1,
+                len(self.ring_point_offsets) - 1,
+                len(self.segment_rings),
+                len(self.cell_segments),
+                *self.grid_bounds,
+            )
+        ]
+        for typecode, values in (
+            ("I", self.feature_polygon_offsets),
+            ("I", self.polygon_ring_offsets),
+            ("I", self.ring_point_offsets),
+            ("I", self.cell_offsets),
+            ("I", self.cell_segments),
+            ("f", self.ring_boxes),
+            ("f", self.coordinates),
+            ("H" if len(self.ring_point_offsets) - 1 <= 0xFFFF else "I", self.segment_rings),
+        ):
+            section = array(typecode, values)
+            if sys.byteorder != "little":
+                section.byteswap()
+            data = section.tobytes()
+            chunks.append(data + bytes(_align(len(data)) - len(data)))
+        chunks.append("\0".join(self.names).encode("utf-8"))
+        return b"".join(chunks)
+
+    def segment(self, segment_id: int) -> tuple[float, float, float, float]:
+        """Return the ``(x1, y1, x2, y2)`` ends of a ring segment."""
+        coordinates = self.coordinates
+        ring_start = self.ring_point_offsets[self.segment_rings[segment_id]]
+        if segment_id == ring_start:
+            start = self.ring_point_offsets[self.segment_rings[segment_id] + 1] - 1
+        else:
+            start = segment_id - 1
+        return (
+            coordinates[2 * start],
+            coordinates[2 * start + 1],
+            coordinates[2 * segment_id],
+            coordinates[2 * segment_id + 1],
+        )
+
+    def ring_box(self, ring_id: int) -> tuple[float, float, float, float]:
+        return tuple(self.ring_boxes[4 * ring_id:4 * ring_id + 4])
+
+    def cell(self, longitude: float, latitude: float) -> tuple[int, int]:
+        """Return the ``(column, row)`` of the grid cell nearest a point."""
+        west, south, east, north = self.grid_bounds
+        column = int((longitude - west) / max(east - west, 1e-9) * self.grid_size)
+        row = int((latitude - south) / max(north - south, 1e-9) * self.grid_size)
+        return min(self.grid_size - 1, max(0, column)), min(self.grid_size - 1, max(0, row))
+
+    def cell_segment_ids(self, column: int, row: int):
+        cell_id = row * self.grid_size + column
+        return self.cell_segments[self.cell_offsets[cell_id]:self.cell_offsets[cell_id + 1]]
+
+
+def load_region_geometry(path: str | Path) -> RegionGeometry:
+    """Map a binary region geometry file read-only and read it in place."""
+    with Path(path).open("rb") as data_file:
+        buffer = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return RegionGeometry.from_buffer(buffer)
+    except ValueError:
+        buffer.close()
+        raise
+
+
+def write_region_geometry(features: Iterable[dict[str, Any]], path: str | Path) -> None:
+    """Write the binary form of GeoJSON features."""
+    Path(path).write_bytes(RegionGeometry.from_features(features, coordinate_typecode="f").to_bytes())
+
+
+def _polygons_for_geometry(geometry: dict[str, Any]) -> list[list[list[list[float]]]]:
+    if geometry.get("type") == "Polygon":
+        coordinates = geometry.get("coordinates")
+        polygons = [coordinates] if coordinates else []
+    elif geometry.get("type") == "MultiPolygon":
+        polygons = geometry.get("coordinates") or []
+    else:
+        return []
+    # A polygon without an outer ring cannot hold any point.
+    return [polygon for polygon in polygons if polygon and polygon[0]]
+
+
+def _align(size: int) -> int:
+    return (size + 3) & ~3
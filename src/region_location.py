@@ -10,12 +10,22 @@ from __future__ import annotations
 import json
 import math
 import secrets
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from contextlib import suppress
 from pathlib import Path
 from typing import Any
 
+try:
+    from .region_geometry import RegionGeometry, load_region_geometry
+except ImportError:
+    from region_geometry import RegionGeometry, load_region_geometry
+
 REGION_DATA_PATH = "/app/share/octopusagile/gb-electricity-regions.geojson"
+REGION_GEOMETRY_PATH = "/app/share/octopusagile/gb-electricity-regions.bin"
+# Six decimal places of a degree is about 0.1 m, far finer than a location fix.
+REGION_CACHE_DECIMAL_PLACES = 6
+REGION_CACHE_SIZE = 256
+METRES_PER_DEGREE_LATITUDE = 111_320.0
 
 # A deliberately broad envelope lets the UI recognise locations that are
 # plainly overseas without pretending that it is a political-border lookup.
@@ -65,6 +75,9 @@ DNO_NAME_TO_REGION_CODE = {
     "SSE": "_P",
 }
 
+_bundled_region_index = None
+_supplied_region_index = None
+
 
 def load_region_features(path: str | Path = REGION_DATA_PATH) -> list[dict[str, Any]]:
     """Load the installed, offline GeoJSON boundary snapshot."""
@@ -137,24 +150,15 @@ def point_in_geometry(longitude: float, latitude: float, geometry: dict[str, Any
     return False
 
 
-def _rings_for_geometry(geometry: dict[str, Any]) -> Iterable[list[list[float]]]:
-    if geometry.get("type") == "Polygon":
-        yield from geometry.get("coordinates", [])
-    elif geometry.get("type") == "MultiPolygon":
-        for polygon in geometry.get("coordinates", []):
-            yield from polygon
-
-
 def _distance_to_segment_meters(
     longitude: float, latitude: float, start: list[float], end: list[float]
 ) -> float:
     """Approximate point-to-segment distance for the small areas used here."""
-    metres_per_degree_latitude = 111_320.0
-    metres_per_degree_longitude = metres_per_degree_latitude * math.cos(math.radians(latitude))
+    metres_per_degree_longitude = METRES_PER_DEGREE_LATITUDE * math.cos(math.radians(latitude))
     start_x = (start[0] - longitude) * metres_per_degree_longitude
-    start_y = (start[1] - latitude) * metres_per_degree_latitude
+    start_y = (start[1] - latitude) * METRES_PER_DEGREE_LATITUDE
     end_x = (end[0] - longitude) * metres_per_degree_longitude
-    end_y = (end[1] - latitude) * metres_per_degree_latitude
+    end_y = (end[1] - latitude) * METRES_PER_DEGREE_LATITUDE
     delta_x = end_x - start_x
     delta_y = end_y - start_y
     length_squared = delta_x * delta_x + delta_y * delta_y
@@ -164,6 +168,181 @@ def _distance_to_segment_meters(
     return math.hypot(start_x + factor * delta_x, start_y + factor * delta_y)
 
 
+class RegionIndex:
+    """Point lookups over flattened region geometry.
+
+    Only features whose names map to an Octopus region take part.  A lookup
+    considers the rings whose bounding boxes hold the point and casts its
+    ray through the point's row of the segment grid, towards the nearer
+    edge, so it reads the nearby edges rather than every ring.  With
+    ``cache_results``, results are cached per point rounded to
+    ``REGION_CACHE_DECIMAL_PLACES``; the bundled index does not cache, so
+    device location fixes are not kept after a lookup.
+    """
+
+    def __init__(self, geometry: RegionGeometry, cache_results: bool = False):
+        self._geometry = geometry
+        self._cache = {} if cache_results else None
+        self._features = []
+        self._mapped_rings = bytearray(len(geometry.ring_point_offsets) - 1)
+        feature_polygon_offsets = geometry.feature_polygon_offsets
+        polygon_ring_offsets = geometry.polygon_ring_offsets
+        for feature_id, name in enumerate(geometry.names):
+            region_code = DNO_NAME_TO_REGION_CODE.get(name)
+            if region_code is None:
+                continue
+            polygons = []
+            for polygon_id in range(feature_polygon_offsets[feature_id], feature_polygon_offsets[feature_id + 1]):
+                ring_ids = range(polygon_ring_offsets[polygon_id], polygon_ring_offsets[polygon_id + 1])
+                if not ring_ids:
+                    continue
+                polygons.append((geometry.ring_box(ring_ids[0]), ring_ids))
+                for ring_id in ring_ids:
+                    self._mapped_rings[ring_id] = 1
+            if polygons:
+                self._features.append((region_code, _union_box(box for box, _rings in polygons), polygons))
+
+    @classmethod
+    def from_features(cls, features: Iterable[dict[str, Any]], cache_results: bool = False) -> RegionIndex:
+        return cls(RegionGeometry.from_features(features), cache_results)
+
+    def clear_cache(self):
+        if self._cache is not None:
+            self._cache.clear()
+
+    def find_region(self, latitude: float, longitude: float) -> str | None:
+        """Return the one region code whose geometry holds the point, as ``find_region_for_coordinates``."""
+        key = (round(latitude, REGION_CACHE_DECIMAL_PLACES), round(longitude, REGION_CACHE_DECIMAL_PLACES))
+        if self._cache is not None and key in self._cache:
+            return self._cache[key]
+
+        candidates = [
+            (region_code, [ring_ids for box, ring_ids in polygons if _box_contains(box, longitude, latitude)])
+            for region_code, box, polygons in self._features
+            if _box_contains(box, longitude, latitude)
+        ]
+        crossings = {
+            ring_id: False
+            for _region_code, polygons in candidates
+            for ring_ids in polygons
+            for ring_id in ring_ids
+            if _box_contains(self._geometry.ring_box(ring_id), longitude, latitude)
+        }
+        on_boundary = self._cast_ray(longitude, latitude, crossings) if crossings else set()
+
+        matching_codes = [
+            region_code
+            for region_code, polygons in candidates
+            if any(
+                crossings.get(ring_ids[0])
+                and not any(crossings.get(hole) for hole in ring_ids[1:])
+                and not any(ring_id in on_boundary for ring_id in ring_ids)
+                for ring_ids in polygons
+            )
+        ]
+        region_code = matching_codes[0] if len(matching_codes) == 1 else None
+        if self._cache is not None:
+            if len(self._cache) >= REGION_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[key] = region_code
+        return region_code
+
+    def _cast_ray(self, longitude: float, latitude: float, crossings: dict[int, bool]) -> set[int]:
+        """Flip ``crossings`` for each ring edge the point's ray crosses; return rings the point lies on.
+
+        Every horizontal line crosses a closed ring an even number of times,
+        so a ray towards the nearer grid edge has the same parity as the
+        eastward ray of ``_point_in_ring``.
+        """
+        geometry = self._geometry
+        column, row = geometry.cell(longitude, latitude)
+        eastward = column >= geometry.grid_size // 2
+        columns = range(column, geometry.grid_size) if eastward else range(column + 1)
+        on_boundary = set()
+        seen = set()
+        for cell_column in columns:
+            for segment_id in geometry.cell_segment_ids(cell_column, row):
+                ring_id = geometry.segment_rings[segment_id]
+                if ring_id not in crossings or segment_id in seen:
+                    continue
+                seen.add(segment_id)
+                x1, y1, x2, y2 = geometry.segment(segment_id)
+                if _point_on_segment(longitude, latitude, (x1, y1), (x2, y2)):
+                    on_boundary.add(ring_id)
+                    continue
+                if (y1 > latitude) != (y2 > latitude):
+                    crossing_longitude = (x2 - x1) * (latitude - y1) / (y2 - y1) + x1
+                    if (longitude < crossing_longitude) == eastward:
+                        crossings[ring_id] = not crossings[ring_id]
+        return on_boundary
+
+    def is_near_boundary(self, latitude: float, longitude: float, accuracy_meters: float) -> bool:
+        """Return whether any mapped edge lies within ``accuracy_meters``, as ``is_near_region_boundary``."""
+        geometry = self._geometry
+        metres_per_degree_longitude = METRES_PER_DEGREE_LATITUDE * math.cos(math.radians(latitude))
+        latitude_margin = accuracy_meters / METRES_PER_DEGREE_LATITUDE
+        longitude_margin = (
+            accuracy_meters / metres_per_degree_longitude if metres_per_degree_longitude > 0 else math.inf
+        )
+        west, south, east, north = geometry.grid_bounds
+        if (
+            longitude + longitude_margin < west
+            or longitude - longitude_margin > east
+            or latitude + latitude_margin < south
+            or latitude - latitude_margin > north
+        ):
+            return False
+
+        first_column, first_row = geometry.cell(longitude - longitude_margin, latitude - latitude_margin)
+        last_column, last_row = geometry.cell(longitude + longitude_margin, latitude + latitude_margin)
+        seen = set()
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                for segment_id in geometry.cell_segment_ids(column, row):
+                    if segment_id in seen or not self._mapped_rings[geometry.segment_rings[segment_id]]:
+                        continue
+                    seen.add(segment_id)
+                    x1, y1, x2, y2 = geometry.segment(segment_id)
+                    if _distance_to_segment_meters(longitude, latitude, (x1, y1), (x2, y2)) <= accuracy_meters:
+                        return True
+        return False
+
+
+def get_region_index(features: Iterable[dict[str, Any]] | None = None) -> RegionIndex:
+    """Return the index for ``features``, or for the bundled data when ``None``.
+
+    The bundled index is built once, from the compact binary geometry when
+    it is installed and from the GeoJSON otherwise, and does not cache
+    lookups.  Supplied features reuse the last index, with its lookup cache,
+    while they are the same list object with the same length.
+    """
+    global _bundled_region_index, _supplied_region_index
+    if features is None:
+        if _bundled_region_index is None:
+            try:
+                geometry = load_region_geometry(REGION_GEOMETRY_PATH)
+            except (OSError, ValueError):
+                geometry = RegionGeometry.from_features(load_region_features(REGION_DATA_PATH))
+            _bundled_region_index = RegionIndex(geometry)
+        return _bundled_region_index
+
+    size = len(features) if isinstance(features, Sequence) else None
+    cached = _supplied_region_index
+    if size is not None and cached and cached[0] is features and cached[1] == size:
+        return cached[2]
+    index = RegionIndex.from_features(features, cache_results=True)
+    _supplied_region_index = (features, size, index)
+    return index
+
+
+def clear_region_cache():
+    """Forget every cached region lookup."""
+    if _bundled_region_index is not None:
+        _bundled_region_index.clear_cache()
+    if _supplied_region_index is not None:
+        _supplied_region_index[2].clear_cache()
+
+
 def is_near_region_boundary(
     latitude: float,
     longitude: float,
@@ -173,15 +352,7 @@ def is_near_region_boundary(
     """Return whether reported accuracy makes a boundary result genuinely uncertain."""
     if not math.isfinite(accuracy_meters) or accuracy_meters <= 0:
         return False
-    region_features = features if features is not None else load_region_features()
-    for feature in region_features:
-        if feature_region_code(feature) is None:
-            continue
-        for ring in _rings_for_geometry(feature.get("geometry", {})):
-            for index, end in enumerate(ring):
-                if _distance_to_segment_meters(longitude, latitude, ring[index - 1], end) <= accuracy_meters:
-                    return True
-    return False
+    return get_region_index(features).is_near_boundary(latitude, longitude, accuracy_meters)
 
 
 def find_region_for_coordinates(
@@ -192,17 +363,25 @@ def find_region_for_coordinates(
         return None
     if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
         return None
+    return get_region_index(features).find_region(latitude, longitude)
+
+
+def _union_box(boxes: Iterable[tuple[float, float, float, float]]) -> tuple[float, float, float, float] | None:
+    west = south = math.inf
+    east = north = -math.inf
+    for box_west, box_south, box_east, box_north in boxes:
+        west = min(west, box_west)
+        south = min(south, box_south)
+        east = max(east, box_east)
+        north = max(north, box_north)
+    if west > east:
+        return None
+    return west, south, east, north
+
 
-    matching_codes = []
-    region_features = features if features is not None else load_region_features()
-    for feature in region_features:
-        region_code = feature_region_code(feature)
-        geometry = feature.get("geometry")
-        if region_code is None or not isinstance(geometry, dict):
-            continue
-        if point_in_geometry(longitude, latitude, geometry):
-            matching_codes.append(region_code)
-    return matching_codes[0] if len(matching_codes) == 1 else None
+def _box_contains(box: tuple[float, float, float, float], longitude: float, latitude: float) -> bool:
+    west, south, east, north = box
+    return west <= longitude <= east and south <= latitude <= north
 
 
 def is_clearly_outside_uk(latitude: float, longitude: float) -> bool:
@@ -385,6 +564,7 @@ class LocationPortal:
     def close(self):
         """Close the portal session without retaining any received location data."""
         self._finished = True
+        clear_region_cache()
         if self.session_proxy is not None and self.session_path is not None:
             with suppress(GLib.Error):
                 self.session_proxy.call(
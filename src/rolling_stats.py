@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from collections import Counter, deque
+from heapq import heappop, heappush
+
+
+def rolling_sum(values, window_size):
+    """Return the trailing-window sum at each index, using shorter windows at the start."""
+    _validate_window_size(window_size)
+    sums = []
+    total = 0.0
+    for index, value in enumerate(values):
+        total += value
+        if index >= window_size:
+            total -= values[index - window_size]
+        sums.append(total)
+    return sums
+
+
+def rolling_mean(values, window_size):
+    return [
+        total / min(index + 1, window_size)
+        for index, total in enumerate(rolling_sum(values, window_size))
+    ]
+
+
+def rolling_min(values, window_size):
+    return _rolling_extreme(values, window_size, lambda candidate, current: candidate <= current)
+
+
+def rolling_max(values, window_size):
+    return _rolling_extreme(values, window_size, lambda candidate, current: candidate >= current)
+
+
+def rolling_median(values, window_size):
+    window = RollingMedian(window_size)
+    return [window.push(value) for value in values]
+
+
+class RollingMedian:
+    """Median of the last ``window_size`` pushed values in O(log w) per push.
+
+    The lower half lives in a max-heap and the upper half in a min-heap.
+    Values leaving the window are only counted on removal and discarded when
+    they reach the top of a heap, so each push stays logarithmic.
+    """
+
+    def __init__(self, window_size):
+        _validate_window_size(window_size)
+        self.window_size = window_size
+        self._window = deque()
+        self._low = []
+        self._high = []
+        self._low_size = 0
+        self._high_size = 0
+        self._expired = Counter()
+
+    def push(self, value):
+        if not self._low or value <= -self._low[0]:
+            heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heappush(self._high, value)
+            self._high_size += 1
+        self._window.append(value)
+
+        if len(self._window) > self.window_size:
+            self._expire(self._window.popleft())
+        self._rebalance()
+        return self.median()
+
+    def median(self):
+        if not self._window:
+            return None
+        if self._low_size > self._high_size:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+    def _expire(self, value):
+        self._expired[value] += 1
+        if value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune(self._low, -1)
+        else:
+            self._high_size -= 1
+            if self._high and value == self._high[0]:
+                self._prune(self._high, 1)
+
+    def _rebalance(self):
+        if self._low_size > self._high_size + 1:
+            heappush(self._high, -heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, -1)
+        elif self._low_size < self._high_size:
+            heappush(self._low, -heappop(self._high))
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune(self._high, 1)
+
+    def _prune(self, heap, sign):
+        while heap:
+            value = sign * heap[0]
+            if not self._expired[value]:
+                break
+            self._expired[value] -= 1
+            heappop(heap)
+
+
+def _rolling_extreme(values, window_size, keeps_candidate):
+    _validate_window_size(window_size)
+    extremes = []
+    candidates = deque()
+    for index, value in enumerate(values):
+        while candidates and keeps_candidate(value, values[candidates[-1]]):
+            candidates.pop()
+        candidates.append(index)
+        if candidates[0] <= index - window_size:
+            candidates.popleft()
+        extremes.append(values[candidates[0]])
+    return extremes
+
+
+def _validate_window_size(window_size):
+    if window_size <= 0:
+        raise ValueError("window_size must be positive")
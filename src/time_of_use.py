@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, time, timezone
+from functools import lru_cache
+
+try:
+    from .price_series import PriceSeries
+    from .uk_time import UK_TIMEZONE
+except ImportError:
+    from price_series import PriceSeries
+    from uk_time import UK_TIMEZONE
+
+SLOT_SECONDS = 30 * 60
+SLOTS_PER_DAY = 48
+EXPANSION_CACHE_SIZE = 32
+
+
+def _get_slot_of_day(value):
+    if value.minute % 30 or value.second or value.microsecond:
+        raise ValueError("Time-of-use bands must start and end on a half-hour")
+    return value.hour * 2 + value.minute // 30
+
+
+class TimeOfUseSchedule:
+    """A daily pattern of tariff registers, such as a day and night rate.
+
+    ``bands`` holds ``(register, start, end)`` entries with half-hour clock
+    times in ``zone``; a band whose end is before its start runs past
+    midnight, and later bands win where bands overlap.  Slots outside every
+    band use ``default_register``.  Schedules compare and hash by value so
+    expansions can be memoized.
+    """
+
+    __slots__ = ("_slot_registers", "bands", "default_register", "zone")
+
+    def __init__(self, bands, default_register="day", zone=timezone.utc):
+        self.bands = tuple((register, start, end) for register, start, end in bands)
+        self.default_register = default_register
+        self.zone = zone
+        slot_registers = [default_register] * SLOTS_PER_DAY
+        for register, start, end in self.bands:
+            first = _get_slot_of_day(start)
+            slot_count = (_get_slot_of_day(end) - first) % SLOTS_PER_DAY
+            for offset in range(slot_count):
+                slot_registers[(first + offset) % SLOTS_PER_DAY] = register
+        self._slot_registers = tuple(slot_registers)
+
+    def _key(self):
+        return self.bands, self.default_register, self.zone
+
+    def __eq__(self, other):
+        if isinstance(other, TimeOfUseSchedule):
+            return self._key() == other._key()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"TimeOfUseSchedule({self.bands!r}, {self.default_register!r}, {self.zone!r})"
+
+    @property
+    def registers(self):
+        return tuple(dict.fromkeys(self._slot_registers))
+
+    def register_at(self, moment):
+        """Return the register in force for the half-hour containing ``moment``."""
+        local = moment.astimezone(self.zone)
+        return self._slot_registers[local.hour * 2 + local.minute // 30]
+
+
+# Octopus documents smart-meter Economy 7 off-peak as 00:30-07:30 UTC.
+# https://octopus.energy/help-and-faqs/articles/what-is-an-economy-7-meter-and-tariff/
+ECONOMY_7_SCHEDULE = TimeOfUseSchedule((("night", time(0, 30), time(7, 30)),))
+GO_SCHEDULE = TimeOfUseSchedule((("night", time(0, 30), time(5, 30)),), zone=UK_TIMEZONE)
+INTELLIGENT_GO_SCHEDULE = TimeOfUseSchedule((("night", time(23, 30), time(5, 30)),), zone=UK_TIMEZONE)
+
+
+def build_time_of_use_prices(schedule, rates_by_register, period_start, period_end):
+    """Return typed half-hour prices for ``schedule`` from Octopus unit-rate records.
+
+    ``rates_by_register`` maps register names to the records fetched for
+    each register, and each register is priced at its representative rate
+    for the period.  Registers without a usable rate are left out.
+    """
+    period_start = _floor_to_half_hour(period_start.astimezone(timezone.utc))
+    prices_gbp = {}
+    for register, rates in rates_by_register.items():
+        rate = get_representative_rate(rates, period_start, period_end)
+        try:
+            price_gbp = float(rate['value_inc_vat']) / 100.0
+        except (KeyError, TypeError, ValueError):
+            continue
+        if math.isfinite(price_gbp):
+            prices_gbp[register] = price_gbp
+    return expand_time_of_use(schedule, prices_gbp, period_start, period_end)
+
+
+def expand_time_of_use(schedule, prices_gbp, period_start, period_end):
+    """Return a ``PriceSeries`` of the half-hours from ``period_start`` until ``period_end``.
+
+    Each slot carries ``valid_from`` and ``valid_to`` as UTC datetimes, the
+    ``price_gbp`` of its register in ``prices_gbp`` and the ``register``
+    name.  Slots whose register has no price are left out.  Expansions are
+    memoized by schedule, register prices and half-hour range, so repeated
+    refreshes share one immutable series.
+    """
+    start_seconds = int(_floor_to_half_hour(period_start.astimezone(timezone.utc)).timestamp())
+    end_seconds = math.ceil(period_end.timestamp() / SLOT_SECONDS) * SLOT_SECONDS
+    return _expand_time_of_use(schedule, tuple(sorted(prices_gbp.items())), start_seconds, end_seconds)
+
+
+@lru_cache(maxsize=EXPANSION_CACHE_SIZE)
+def _expand_time_of_use(schedule, prices_gbp, start_seconds, end_seconds):
+    register_prices = dict(prices_gbp)
+    # Price each half-hour of the day once, then index the table per slot.
+    slot_prices = [register_prices.get(register) for register in schedule._slot_registers]
+    utc_schedule = schedule.zone == timezone.utc
+    prices = []
+    valid_to = datetime.fromtimestamp(start_seconds, timezone.utc)
+    for slot_seconds in range(start_seconds, end_seconds, SLOT_SECONDS):
+        valid_from = valid_to
+        valid_to = datetime.fromtimestamp(slot_seconds + SLOT_SECONDS, timezone.utc)
+        if utc_schedule:
+            slot_of_day = slot_seconds % 86400 // SLOT_SECONDS
+        else:
+            local = valid_from.astimezone(schedule.zone)
+            slot_of_day = local.hour * 2 + local.minute // 30
+        price_gbp = slot_prices[slot_of_day]
+        if price_gbp is not None:
+            prices.append({
+                'valid_from': valid_from,
+                'valid_to': valid_to,
+                'price_gbp': price_gbp,
+                'register': schedule._slot_registers[slot_of_day],
+            })
+    return PriceSeries(prices)
+
+
+def get_representative_rate(rates, period_start, period_end):
+    """Return the record in force at ``period_start``, else the earliest overlapping the period."""
+    parsed_rates = []
+    for rate in rates:
+        parsed = _parse_rate_window(rate)
+        if not parsed:
+            continue
+
+        valid_from, valid_to = parsed
+        if valid_from < period_end and period_start < valid_to:
+            parsed_rates.append((rate, valid_from, valid_to))
+
+    if not parsed_rates:
+        return None
+
+    current_rate = next(
+        (rate for rate, valid_from, valid_to in parsed_rates if valid_from <= period_start < valid_to),
+        None,
+    )
+    if current_rate:
+        return current_rate
+
+    return min(parsed_rates, key=lambda item: item[1])[0]
+
+
+def _floor_to_half_hour(value):
+    minute = 0 if value.minute < 30 else 30
+    return value.replace(minute=minute, second=0, microsecond=0)
+
+
+def _parse_rate_window(rate):
+    try:
+        valid_from = datetime.fromisoformat(rate['valid_from'].replace('Z', '+00:00'))
+        valid_to = (
+            datetime.fromisoformat(rate['valid_to'].replace('Z', '+00:00'))
+            if rate.get('valid_to')
+            else datetime.max.replace(tzinfo=timezone.utc)
+        )
+    except (KeyError, ValueError, TypeError):
+        return None
+
+    return valid_from, valid_to
@@ -12,30 +12,49 @@ import cairo
 import requests
 from gi.repository import Adw, Gdk, Gio, GLib, Gtk
 
+from ..battery_schedule import build_baseline_profile, schedule_battery
+from ..cheapest_window_table import CheapestWindowTable
 from ..find_cheapest_presentation import (
     build_find_cheapest_presentation,
     build_fixed_start_presentation,
+    build_ranked_window_ranges,
+    build_split_highlight,
 )
+from ..historical_rate_cache import load_rate_cache, store_rate_cache
 from ..octopus_api import OctopusApiError
 from ..price_bands import PRICE_BAND_NEGATIVE, PRICE_BAND_VERSION, get_price_band
 from ..price_cache import build_rates_cache_key, is_rates_cache_stale
 from ..price_formatting import format_gbp, format_unit_price_gbp
-from ..price_logic import build_dual_register_price_windows, build_fixed_start_price_window, extract_product_code
+from ..price_logic import (
+    PriceIntegralIndex,
+    build_fixed_start_price_window,
+    extract_product_code,
+    find_cheapest_split_slots,
+    find_ranked_cheapest_slots,
+)
 from ..price_logic import find_cheapest_slot as calculate_cheapest_slot
 from ..price_logic import find_cheapest_timer_slot as calculate_cheapest_timer_slot
+from ..price_series import PriceSeries
 from ..secrets_manager import get_api_key
+from ..time_of_use import ECONOMY_7_SCHEDULE, build_time_of_use_prices
 from ..uk_time import UK_TIMEZONE, is_complete_usage_day
+from ..usage_analysis import UsageAnalysisExecutor
+from ..usage_cube import UsageCube
 from ..usage_history import (
     USAGE_CACHE_VERSION,
-    build_historical_usage_costs,
-    fetch_daily_usage_archive,
-    fetch_recent_usage_samples,
     get_account_data,
-    get_usage_archive_refresh_start,
-    get_usage_refresh_start,
-    merge_usage_history,
+    get_account_tariff_codes,
+    reband_usage_cache,
+    refresh_usage_history,
+)
+from ..usage_insight_memo import (
+    ContentHashCache,
+    build_usage_insight_memo_cache_key,
+    combine_content_hashes,
+    get_memoized_usage_insight,
+    store_memoized_usage_insight,
 )
-from ..usage_insights import build_rolling_average, build_usage_dashboard_data
+from ..usage_insights import build_rolling_average
 from ..utils import CacheManager
 from .adaptive_layout import (
     DEFAULT_CHART_SLOTS,
@@ -70,6 +89,7 @@ USAGE_BACKGROUND_REFRESH_INTERVAL_SECONDS = 6 * 60 * 60
 SUBTLE_ANIMATION_DURATION_MS = 180
 SUBTLE_ANIMATION_FRAME_MS = 16
 MAIN_VIEW_NAMES = frozenset(("prices", "plan", "usage"))
+RANKED_CHEAPEST_WINDOW_COUNT = 3
 
 class MainWindow(Adw.ApplicationWindow):
     """
@@ -89,8 +109,17 @@ class MainWindow(Adw.ApplicationWindow):
             self.settings.set_boolean("setup-completed", True)
         self._update_window_title()
 
-        self.all_prices = []
-        self.chart_prices = []
+        self.all_prices = PriceSeries()
+        self._price_integral_index = None
+        self._price_integral_index_source = None
+        self._cheapest_window_table = None
+        self._cheapest_window_table_pending = None
+        self._split_selection = None
+        self._split_selection_pending = None
+        self._battery_plan = None
+        self._battery_plan_pending = None
+        self._battery_usage_cube = None
+        self.chart_prices = PriceSeries()
         self.current_price_data = None
         self.cache_manager = CacheManager() # Initialize CacheManager
         self.usage_cache_manager = CacheManager(
@@ -103,6 +132,19 @@ class MainWindow(Adw.ApplicationWindow):
         self.settings.connect("changed::selected-tariff-code", self.on_setting_changed)
         self.settings.connect("changed::selected-region-code", self.on_setting_changed)
         self.settings.connect("changed::octopus-account-number", self.on_usage_account_changed)
+        for key in (
+            "find-cheapest-timer-step-minutes",
+            "find-cheapest-max-blocks",
+            "find-cheapest-min-run-slots",
+        ):
+            self.settings.connect(f"changed::{key}", self.on_plan_search_setting_changed)
+        for key in (
+            "battery-capacity-kwh",
+            "battery-power-kw",
+            "battery-round-trip-efficiency",
+            "battery-reserve-kwh",
+        ):
+            self.settings.connect(f"changed::{key}", self.on_battery_setting_changed)
 
         self.settings.bind("window-width", self, "default-width", Gio.SettingsBindFlags.DEFAULT)
         self.settings.bind("window-height", self, "default-height", Gio.SettingsBindFlags.DEFAULT)
@@ -133,11 +175,14 @@ class MainWindow(Adw.ApplicationWindow):
         self.usage_chart_reference_value = None
         self._fade_animation_sources = {}
         self._price_chart_signature = None
+        self._displayed_price_window = None
         self._usage_chart_signature = None
         self._usage_insights_input_signature = None
         self._usage_dashboard_insight = None
         self._usage_daily_costs = []
         self._usage_analysis_generation = 0
+        self._usage_analysis_executor = UsageAnalysisExecutor()
+        self._usage_content_hashes = ContentHashCache()
         self._adaptive_layout_signature = None
         self._usage_chart_layout_signature = None
         self._standing_charge_fetches = set()
@@ -147,6 +192,7 @@ class MainWindow(Adw.ApplicationWindow):
         self.connect("notify::default-width", self.on_window_width_changed)
         self.connect("notify::default-height", self.on_window_width_changed)
         self.connect("notify::maximized", self.on_window_state_changed)
+        self.connect("close-request", self.on_close_request)
 
         key_controller = Gtk.EventControllerKey.new()
         key_controller.connect("key-pressed", self.on_key_pressed)
@@ -431,6 +477,11 @@ class MainWindow(Adw.ApplicationWindow):
 
         self.setup_window.present()
 
+    def on_close_request(self, _window):
+        # The analysis worker is a separate process, so it must not outlive the window.
+        self._usage_analysis_executor.shutdown()
+        return False
+
     def on_setup_closed(self, _window):
         self.setup_window = None
         return False
@@ -1058,6 +1109,14 @@ class MainWindow(Adw.ApplicationWindow):
         self.plan_timer_group.set_title("Appliance timers")
         self.plan_pane.append(self.plan_timer_group)
 
+        self.battery_plan_group = Adw.PreferencesGroup()
+        self.battery_plan_group.set_title("Home battery")
+        self.battery_plan_group.set_description(
+            "The cheapest charge plan for the published prices and your usual usage, updated every half-hour."
+        )
+        self.battery_plan_group.set_visible(False)
+        self.plan_pane.append(self.battery_plan_group)
+
         narrow_plan_box = Gtk.Box.new(orientation=Gtk.Orientation.VERTICAL, spacing=16)
         narrow_plan_box.set_valign(Gtk.Align.START)
         narrow_plan_pane_slot = Adw.LayoutSlot.new("plan-pane")
@@ -1155,6 +1214,11 @@ class MainWindow(Adw.ApplicationWindow):
         self.finish_timer_row, self.finish_time_label = self._create_summary_value_row("Finish in")
         self.plan_timer_group.add(self.finish_timer_row)
 
+        self.battery_action_row, self.battery_action_label = self._create_summary_value_row("This half-hour")
+        self.battery_plan_group.add(self.battery_action_row)
+        self.battery_savings_row, self.battery_savings_label = self._create_summary_value_row("Estimated saving")
+        self.battery_plan_group.add(self.battery_savings_row)
+
         self.best_slot_result_rows = [
             self.best_slot_result_row,
             self.average_price_row,
@@ -1540,6 +1604,16 @@ class MainWindow(Adw.ApplicationWindow):
 
         self.refresh_price(force=True)
 
+    def on_plan_search_setting_changed(self, _settings, _key):
+        if self.main_view_stack.get_visible_child_name() == "plan":
+            self.find_cheapest_slot(
+                self.duration_spin_button.get_value(),
+                self.start_within_spin_button.get_value_as_int(),
+            )
+
+    def on_battery_setting_changed(self, _settings, _key):
+        self._replan_battery()
+
     def on_find_cheapest_slot_triggered(self, spin_button):
         self._update_find_cheapest_settings()
         if self.main_view_stack.get_visible_child_name() != "plan":
@@ -1553,26 +1627,13 @@ class MainWindow(Adw.ApplicationWindow):
     def find_cheapest_slot(self, duration_hours, start_within_hours):
         self.price_chart.set_highlight_range(None, None) # Clear previous highlight
         self.plan_price_chart.set_highlight_range(None, None)
+        self.price_chart.set_ranked_ranges([])
+        self.plan_price_chart.set_ranked_ranges([])
         now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
-        cheapest_slot = calculate_cheapest_slot(
-            self.all_prices,
-            now,
-            duration_hours,
-            start_within_hours,
-        )
-        start_timer_slot = calculate_cheapest_timer_slot(
-            self.all_prices,
-            now,
-            duration_hours,
-            start_within_hours,
-            "start",
-        )
-        finish_timer_slot = calculate_cheapest_timer_slot(
-            self.all_prices,
+        cheapest_slot, start_timer_slot, finish_timer_slot = self._get_cheapest_window_results(
             now,
             duration_hours,
             start_within_hours,
-            "finish",
         )
         presentation = build_find_cheapest_presentation(
             cheapest_slot,
@@ -1599,17 +1660,26 @@ class MainWindow(Adw.ApplicationWindow):
         was_visible = self.best_slot_result_row.get_visible()
         best_slot_start_time = presentation["highlight_start"]
         best_slot_end_time = presentation["highlight_end"]
-        self.price_chart.set_highlight_range(
-            best_slot_start_time,
-            best_slot_end_time,
-            presentation["highlight_label"],
-        )
-        self.plan_price_chart.set_highlight_range(
-            best_slot_start_time,
-            best_slot_end_time,
-            presentation["highlight_label"],
-        )
-        self._scroll_chart_to_time(best_slot_start_time)
+        split_highlight = self._get_split_highlight(now, duration_hours, start_within_hours)
+        if split_highlight:
+            highlight_ranges, highlight_label = split_highlight
+            ranked_ranges = []
+        else:
+            highlight_ranges = [(best_slot_start_time, best_slot_end_time)]
+            highlight_label = presentation["highlight_label"]
+            ranked_ranges = build_ranked_window_ranges(
+                find_ranked_cheapest_slots(
+                    self.all_prices,
+                    now,
+                    duration_hours,
+                    start_within_hours,
+                    RANKED_CHEAPEST_WINDOW_COUNT,
+                )
+            )
+        for chart in (self.price_chart, self.plan_price_chart):
+            chart.set_highlight_ranges(highlight_ranges, highlight_label)
+            chart.set_ranked_ranges(ranked_ranges)
+        self._scroll_chart_to_time(highlight_ranges[0][0])
 
         self.best_slot_result_label.set_text(presentation["best_window_text"])
         self.timer_label.set_text(presentation["start_timer_text"])
@@ -1630,6 +1700,242 @@ class MainWindow(Adw.ApplicationWindow):
         self.best_slot_average_price = cheapest_slot['average_price_gbp']
         self._update_plan_comparison()
 
+    def _get_cheapest_window_results(self, now, duration_hours, start_within_hours):
+        timer_step_minutes = self._get_timer_step_minutes()
+        table = self._cheapest_window_table
+        if table is not None and table.is_current(self.all_prices, now, timer_step_minutes):
+            results = table.lookup(now, duration_hours, start_within_hours)
+            if results is not None:
+                return results
+        else:
+            # The table is missing or was built for another half-hour, so answer
+            # this change directly and bring the table up to date for the next one.
+            self._rebuild_cheapest_window_table(now)
+
+        price_index = self._get_price_integral_index()
+        return (
+            calculate_cheapest_slot(
+                self.all_prices,
+                now,
+                duration_hours,
+                start_within_hours,
+            ),
+            calculate_cheapest_timer_slot(
+                self.all_prices,
+                now,
+                duration_hours,
+                start_within_hours,
+                "start",
+                price_index=price_index,
+                timer_step_minutes=timer_step_minutes,
+            ),
+            calculate_cheapest_timer_slot(
+                self.all_prices,
+                now,
+                duration_hours,
+                start_within_hours,
+                "finish",
+                price_index=price_index,
+                timer_step_minutes=timer_step_minutes,
+            ),
+        )
+
+    def _get_timer_step_minutes(self):
+        return self._clamp_int_setting("find-cheapest-timer-step-minutes", 1, 60, 60)
+
+    def _get_split_highlight(self, now, duration_hours, start_within_hours):
+        max_blocks = self._clamp_int_setting("find-cheapest-max-blocks", 1, 8, 1)
+        if max_blocks == 1:
+            return None
+
+        search = (
+            round(duration_hours * 2),
+            now + timedelta(hours=start_within_hours),
+            self._clamp_int_setting("find-cheapest-min-run-slots", 1, 48, 1),
+            max_blocks,
+        )
+        cached = self._split_selection
+        if cached is not None and cached[0] is self.all_prices and cached[1:3] == (now, search):
+            return build_split_highlight(cached[3], duration_hours)
+
+        # The run search can take tens of milliseconds, so it runs off the GTK
+        # thread and the contiguous window stays highlighted until it answers.
+        self._start_split_selection(now, search)
+        return None
+
+    def _start_split_selection(self, now, search):
+        pending = self._split_selection_pending
+        if pending is not None and pending[0] is self.all_prices and pending[1:] == (now, search):
+            return
+
+        self._split_selection_pending = (self.all_prices, now, search)
+        thread = threading.Thread(
+            target=self._find_split_selection_background,
+            args=(self.all_prices, now, search),
+        )
+        thread.daemon = True
+        thread.start()
+
+    def _find_split_selection_background(self, prices, now, search):
+        try:
+            selection = find_cheapest_split_slots(prices, now, *search)
+        except Exception as exc:  # ruff: ignore[BLE001] The contiguous window stays highlighted.
+            logger.debug("Split cheapest window search failed: %s", type(exc).__name__)
+            selection = None
+        GLib.idle_add(self._apply_split_selection, prices, now, search, selection)
+
+    def _apply_split_selection(self, prices, now, search, selection):
+        pending = self._split_selection_pending
+        if pending is None or pending[0] is not prices or pending[1:] != (now, search):
+            # A newer Plan search replaced this one.
+            return False
+
+        self._split_selection_pending = None
+        self._split_selection = (prices, now, search, selection)
+        if prices is self.all_prices and self.main_view_stack.get_visible_child_name() == "plan":
+            self.find_cheapest_slot(
+                self.duration_spin_button.get_value(),
+                self.start_within_spin_button.get_value_as_int(),
+            )
+        return False
+
+    def _rebuild_cheapest_window_table(self, now=None):
+        now = (now or datetime.now(timezone.utc)).replace(second=0, microsecond=0)
+        timer_step_minutes = self._get_timer_step_minutes()
+        table = self._cheapest_window_table
+        if table is not None and table.is_current(self.all_prices, now, timer_step_minutes):
+            return
+        pending = self._cheapest_window_table_pending
+        if pending is not None and pending[0] is self.all_prices and pending[1:] == (now, timer_step_minutes):
+            return
+
+        self._cheapest_window_table_pending = (self.all_prices, now, timer_step_minutes)
+        thread = threading.Thread(
+            target=self._build_cheapest_window_table_background,
+            args=(self.all_prices, now, timer_step_minutes),
+        )
+        thread.daemon = True
+        thread.start()
+
+    def _build_cheapest_window_table_background(self, prices, now, timer_step_minutes):
+        try:
+            table = CheapestWindowTable(prices, now, timer_step_minutes=timer_step_minutes)
+        except Exception as exc:  # ruff: ignore[BLE001] Plan lookups fall back to direct searches.
+            logger.debug("Cheapest window table build failed: %s", type(exc).__name__)
+            table = None
+        GLib.idle_add(self._apply_cheapest_window_table, prices, now, timer_step_minutes, table)
+
+    def _apply_cheapest_window_table(self, prices, now, timer_step_minutes, table):
+        pending = self._cheapest_window_table_pending
+        if pending is not None and pending[0] is prices and pending[1:] == (now, timer_step_minutes):
+            self._cheapest_window_table_pending = None
+        if table is not None and prices is self.all_prices:
+            self._cheapest_window_table = table
+        return False
+
+    def _replan_battery(self, now=None):
+        """Re-solve the home battery plan from the half-hour in force, off the GTK thread."""
+        capacity_kwh = self._clamp_float_setting("battery-capacity-kwh", 0.0, 1000.0, 0.0)
+        current_index = self.all_prices.index_at(now or datetime.now(timezone.utc)) if self.all_prices else -1
+        if capacity_kwh <= 0 or current_index < 0:
+            self._battery_plan = None
+            self._battery_plan_pending = None
+            self._update_battery_plan_rows()
+            return
+
+        slot_start = self.all_prices[current_index]['valid_from']
+        battery = (
+            capacity_kwh,
+            self._clamp_float_setting("battery-power-kw", 0.0, 100.0, 3.0),
+            self._clamp_float_setting("battery-round-trip-efficiency", 0.5, 1.0, 0.9),
+            min(capacity_kwh, self._clamp_float_setting("battery-reserve-kwh", 0.0, 1000.0, 0.0)),
+        )
+        for planned in (self._battery_plan, self._battery_plan_pending):
+            if (
+                planned is not None
+                and planned[0] is self.all_prices
+                and planned[1:3] == (slot_start, battery)
+                and planned[3] is self._battery_usage_cube
+            ):
+                return
+
+        initial_soc_kwh = min(capacity_kwh, self._get_battery_start_soc(slot_start, battery[3]))
+        request = (self.all_prices, slot_start, battery, self._battery_usage_cube)
+        self._battery_plan_pending = request
+        thread = threading.Thread(
+            target=self._solve_battery_plan_background,
+            args=(request, initial_soc_kwh),
+        )
+        thread.daemon = True
+        thread.start()
+
+    def _get_battery_start_soc(self, slot_start, reserve_kwh):
+        """Carry on from the charge the previous plan reached by ``slot_start``, or start at the reserve."""
+        if self._battery_plan is None:
+            return reserve_kwh
+        previous_slot_start, _battery, _usage_cube, initial_soc_kwh, plan = self._battery_plan[1:]
+        if previous_slot_start == slot_start:
+            return initial_soc_kwh
+        for slot in plan['slots']:
+            if slot['end'] == slot_start:
+                return slot['soc_kwh']
+        return reserve_kwh
+
+    def _solve_battery_plan_background(self, request, initial_soc_kwh):
+        prices, slot_start, battery, usage_cube_payload = request
+        capacity_kwh, power_kw, round_trip_efficiency, reserve_kwh = battery
+        try:
+            usage_cube = UsageCube.from_payload(usage_cube_payload)
+            plan = schedule_battery(
+                prices,
+                slot_start,
+                build_baseline_profile(usage_cube) if usage_cube is not None else {},
+                capacity_kwh,
+                power_kw,
+                power_kw,
+                round_trip_efficiency,
+                initial_soc_kwh,
+                min_final_soc_kwh=reserve_kwh,
+            )
+        except Exception as exc:  # ruff: ignore[BLE001] The battery plan stays hidden.
+            logger.debug("Battery plan failed: %s", type(exc).__name__)
+            plan = None
+        GLib.idle_add(self._apply_battery_plan, request, initial_soc_kwh, plan)
+
+    def _apply_battery_plan(self, request, initial_soc_kwh, plan):
+        if self._battery_plan_pending is not request:
+            # Newer prices, settings or usage replaced this plan.
+            return False
+
+        self._battery_plan_pending = None
+        self._battery_plan = (*request, initial_soc_kwh, plan) if plan is not None else None
+        self._update_battery_plan_rows()
+        return False
+
+    def _update_battery_plan_rows(self):
+        if self._battery_plan is None:
+            self.battery_plan_group.set_visible(False)
+            return
+
+        plan = self._battery_plan[-1]
+        first_slot = plan['slots'][0]
+        if first_slot['charge_kwh'] > 0:
+            action = f"Charge {first_slot['charge_kwh']:.1f} kWh"
+        elif first_slot['discharge_kwh'] > 0:
+            action = f"Use {first_slot['discharge_kwh']:.1f} kWh"
+        else:
+            action = "Hold"
+        self.battery_action_label.set_label(action)
+        self.battery_savings_label.set_label(format_gbp(plan['savings_gbp']))
+        self.battery_plan_group.set_visible(True)
+
+    def _get_price_integral_index(self):
+        """Return the weighted-average index for the current prices, rebuilding it when they are replaced."""
+        if self._price_integral_index_source is not self.all_prices:
+            self._price_integral_index = PriceIntegralIndex(self.all_prices)
+            self._price_integral_index_source = self.all_prices
+        return self._price_integral_index
+
     def _update_plan_comparison(self):
         if self.plan_comparison_start_time is None or self.best_slot_average_price is None:
             self._clear_plan_comparison(show_instruction=True)
@@ -1639,6 +1945,7 @@ class MainWindow(Adw.ApplicationWindow):
             self.all_prices,
             self.plan_comparison_start_time,
             self.duration_spin_button.get_value(),
+            price_index=self._get_price_integral_index(),
         )
         presentation = build_fixed_start_presentation(slot, self.best_slot_average_price)
         if not presentation:
@@ -1828,7 +2135,7 @@ class MainWindow(Adw.ApplicationWindow):
                     return
 
                 if self._is_dual_register_response(response):
-                    raw_rates = self._fetch_dual_register_rates(product_code, selected_tariff_code, now, auth)
+                    raw_rates = self._fetch_dual_register_rates(product_code, selected_tariff_code, auth)
                 else:
                     response.raise_for_status()
                     data = response.json()
@@ -1838,7 +2145,10 @@ class MainWindow(Adw.ApplicationWindow):
             if not self._is_current_fetch(request_id):
                 return
 
-            if raw_rates:
+            if isinstance(raw_rates, dict):
+                # Dual-register tariffs are cached as their register records.
+                self._set_register_prices(raw_rates, now, request_id)
+            elif raw_rates:
                 self._process_and_set_prices(raw_rates, request_id)
             else:
                 GLib.idle_add(self._show_error_if_current, "No price data available from API.", request_id)
@@ -1916,15 +2226,11 @@ class MainWindow(Adw.ApplicationWindow):
                 filtered_rates_dict[rate['valid_from']] = rate
         return sorted(filtered_rates_dict.values(), key=lambda x: x['valid_from'])
 
-    def _fetch_dual_register_rates(self, product_code, tariff_code, now, auth):
-        day_rates = self._fetch_tariff_endpoint(product_code, tariff_code, "day-unit-rates", auth)
-        night_rates = self._fetch_tariff_endpoint(product_code, tariff_code, "night-unit-rates", auth)
-        return build_dual_register_price_windows(
-            day_rates,
-            night_rates,
-            now - timedelta(days=1),
-            now + timedelta(days=4),
-        )
+    def _fetch_dual_register_rates(self, product_code, tariff_code, auth):
+        return {
+            "day": self._fetch_tariff_endpoint(product_code, tariff_code, "day-unit-rates", auth),
+            "night": self._fetch_tariff_endpoint(product_code, tariff_code, "night-unit-rates", auth),
+        }
 
     @staticmethod
     def _fetch_tariff_endpoint(product_code, tariff_code, endpoint, auth, period_from=None, period_to=None):
@@ -2024,8 +2330,23 @@ class MainWindow(Adw.ApplicationWindow):
                 logger.warning("Skipping an invalid rate: %s", type(exc).__name__)
                 continue
 
-        processed_prices.sort(key=lambda price: price['valid_from'])
-        GLib.idle_add(self._apply_processed_prices, processed_prices, request_id)
+        GLib.idle_add(self._apply_processed_prices, PriceSeries(processed_prices), request_id)
+
+    def _set_register_prices(self, register_rates, now, request_id):
+        """
+        Expands day and night register records straight into the typed half-hour price list.
+        """
+        prices = build_time_of_use_prices(
+            ECONOMY_7_SCHEDULE,
+            register_rates,
+            now - timedelta(days=1),
+            now + timedelta(days=4),
+        )
+        if not prices:
+            GLib.idle_add(self._show_error_if_current, "No price data available from API.", request_id)
+            return
+
+        GLib.idle_add(self._apply_processed_prices, prices, request_id)
 
     def update_current_price(self):
         """
@@ -2035,28 +2356,41 @@ class MainWindow(Adw.ApplicationWindow):
             return
 
         now_utc = datetime.now(timezone.utc)
-        current_rate = None
-        for rate in self.all_prices:
-            if rate['valid_from'] <= now_utc < rate['valid_to']:
-                current_rate = rate
-                break
+        current_index = self.all_prices.index_at(now_utc)
+        chart_slot_count = get_chart_slot_count(
+            self.get_width() or self.settings.get_int("window-width")
+        )
+        previous_window = self._displayed_price_window
+        same_prices = previous_window is not None and previous_window[0] is self.all_prices
+        if current_index >= 0 and same_prices and previous_window[1:] == (current_index, chart_slot_count):
+            return
+
+        # Prices changed or a new half-hour began; refresh Plan lookups off the GTK thread.
+        self._rebuild_cheapest_window_table()
+        self._replan_battery(now_utc)
+        current_rate = self.all_prices[current_index] if current_index >= 0 else None
 
         if current_rate:
+            # Within the same price list and chart size, the chart only needs
+            # to move on by the slots that have ended.
+            advance = same_prices and previous_window[2] == chart_slot_count
+            self._displayed_price_window = (self.all_prices, current_index, chart_slot_count)
             display_from = current_rate['valid_from']
-            chart_slot_count = get_chart_slot_count(
-                self.get_width() or self.settings.get_int("window-width")
-            )
             display_to = display_from + timedelta(minutes=30 * chart_slot_count)
-            self.chart_prices = [p for p in self.all_prices if display_from <= p['valid_from'] < display_to]
+            self.chart_prices = self.all_prices.window(display_from, display_to)
 
             current_index_in_chart = 0 # Current price is always the first in the chart view
-            self.update_display(current_rate, self.chart_prices, current_index_in_chart)
+            self.update_display(current_rate, self.chart_prices, current_index_in_chart, advance)
         else:
+            self._displayed_price_window = None
             self.show_error("No current price data found. Rates may not be published yet.")
 
-    def update_display(self, current_rate, chart_prices, current_index):
+    def update_display(self, current_rate, chart_prices, current_index, advance=False):
         """
         Updates the UI with the processed price data.
+
+        ``advance`` moves the charts on from their previous window rather than
+        loading ``chart_prices`` afresh.
         """
         self.current_price_data = current_rate
         price_pounds = current_rate['price_gbp']
@@ -2080,7 +2414,10 @@ class MainWindow(Adw.ApplicationWindow):
             self.get_width() or self.settings.get_int("window-width"),
             len(chart_prices),
         )
-        self.price_chart.set_prices(chart_prices, current_index)
+        if advance:
+            self.price_chart.advance_prices(chart_prices, current_index)
+        else:
+            self.price_chart.set_prices(chart_prices, current_index)
         plan_chart_width = get_plan_chart_width(
             self.get_width() or self.settings.get_int("window-width"),
             get_content_margin(self.get_width() or self.settings.get_int("window-width")),
@@ -2090,16 +2427,16 @@ class MainWindow(Adw.ApplicationWindow):
             plan_chart_width,
             len(chart_prices),
         )
-        self.plan_price_chart.set_prices(chart_prices, current_index)
+        if advance:
+            self.plan_price_chart.advance_prices(chart_prices, current_index)
+        else:
+            self.plan_price_chart.set_prices(chart_prices, current_index)
         if self.main_view_stack.get_visible_child_name() == "plan":
             self.find_cheapest_slot(
                 self.duration_spin_button.get_value(),
                 self.start_within_spin_button.get_value_as_int(),
             )
-        chart_signature = tuple(
-            (price["valid_from"], price["price_gbp"])
-            for price in chart_prices
-        )
+        chart_signature = (chart_prices.starts.tobytes(), chart_prices.prices_gbp.tobytes())
         if chart_signature != self._price_chart_signature:
             self._fade_widget_in(self.chart_scroller)
             self._price_chart_signature = chart_signature
@@ -2194,46 +2531,63 @@ class MainWindow(Adw.ApplicationWindow):
             return
 
         daily_costs = cached_data.get("daily_costs", [])
-        input_signature = self._build_usage_insights_input_signature(
-            account_number,
-            cached_data,
-            daily_costs,
-        )
+        usage_content_hash = self._build_usage_content_hash(cached_data, daily_costs)
+        input_signature = self._build_usage_insights_input_signature(account_number, usage_content_hash)
         if input_signature == self._usage_insights_input_signature:
             return
         self._usage_insights_input_signature = input_signature
+        self._battery_usage_cube = cached_data.get("usage_cube")
+        self._replan_battery()
 
         self._set_usage_updated_label(cached_data.get("synced_at"))
         self._set_usage_cost_graph_controls_enabled(self._has_complete_daily_costs(daily_costs))
         self._usage_analysis_generation += 1
         generation = self._usage_analysis_generation
-        thread = threading.Thread(
-            target=self._build_usage_dashboard_background,
-            args=(
-                generation,
-                input_signature,
+        synced_at = cached_data.get("synced_at")
+        memo_cache_key = build_usage_insight_memo_cache_key(account_number)
+        memo, _memo_mtime = self.usage_cache_manager.get(memo_cache_key)
+        memoized_insight = get_memoized_usage_insight(memo, usage_content_hash)
+        if memoized_insight is not None:
+            self._finish_usage_dashboard_analysis(generation, input_signature, memoized_insight, daily_costs, synced_at)
+            return
+
+        future = self._usage_analysis_executor.submit(
+            (
                 cached_data.get("samples", []),
-                cached_data.get("synced_at"),
+                synced_at,
                 daily_costs,
                 cached_data.get("daily_usage_archive", []),
+                cached_data.get("hourly_usage", []),
+                cached_data.get("usage_cube"),
             ),
+            use_process_pool=self.settings.get_boolean("usage-analysis-process-pool"),
+        )
+        future.add_done_callback(
+            lambda done: self._deliver_usage_dashboard_analysis(
+                done,
+                generation,
+                input_signature,
+                daily_costs,
+                synced_at,
+                memo_cache_key,
+                usage_content_hash,
+            )
         )
-        thread.daemon = True
-        thread.start()
 
-    def _build_usage_dashboard_background(
+    def _deliver_usage_dashboard_analysis(
         self,
+        future,
         generation,
         input_signature,
-        samples,
-        synced_at,
         daily_costs,
-        daily_archive,
+        synced_at,
+        memo_cache_key,
+        usage_content_hash,
     ):
         try:
-            insight = build_usage_dashboard_data(samples, synced_at, daily_costs, daily_archive)
+            insight = future.result()
         except Exception as error:  # Keep malformed cached data away from the GTK thread.
-            logger.exception("Unable to analyse usage history")
+            logger.error("Unable to analyse usage history", exc_info=error)
             GLib.idle_add(
                 self._fail_usage_dashboard_analysis,
                 generation,
@@ -2249,6 +2603,11 @@ class MainWindow(Adw.ApplicationWindow):
             daily_costs,
             synced_at,
         )
+        memo, _memo_mtime = self.usage_cache_manager.get(memo_cache_key)
+        self.usage_cache_manager.set(
+            memo_cache_key,
+            store_memoized_usage_insight(memo, usage_content_hash, insight),
+        )
 
     def _fail_usage_dashboard_analysis(self, generation, input_signature, error):
         if (
@@ -2398,79 +2757,25 @@ class MainWindow(Adw.ApplicationWindow):
             self._fade_widget_in(self.usage_chart_scroller)
             self._usage_chart_signature = chart_signature
 
-    def _build_usage_insights_input_signature(self, account_number, cached_data, daily_costs):
-        samples = cached_data.get("samples", [])
-        daily_archive = cached_data.get("daily_usage_archive", [])
-        sample_edges = self._get_usage_sample_edges(samples)
-        daily_cost_edges = self._get_daily_cost_edges(daily_costs)
-        price_signature = self._get_price_data_signature(self.all_prices)
-        standing_charge_signature = self._get_cached_standing_charge_signature()
+    def _build_usage_insights_input_signature(self, account_number, usage_content_hash):
         return (
             account_number,
-            cached_data.get("synced_at"),
-            cached_data.get("price_band_version"),
-            len(samples),
-            sample_edges,
-            len(daily_costs),
-            daily_cost_edges,
-            len(daily_archive),
-            self._get_daily_usage_archive_edges(daily_archive),
-            price_signature,
-            standing_charge_signature,
-        )
-
-    def _get_daily_usage_archive_edges(self, daily_archive):
-        if not daily_archive:
-            return None
-        first = daily_archive[0]
-        last = daily_archive[-1]
-        return (
-            first.get("date"),
-            first.get("kwh"),
-            last.get("date"),
-            last.get("kwh"),
-        )
-
-    def _get_usage_sample_edges(self, samples):
-        if not samples:
-            return None
-
-        first = samples[0]
-        last = samples[-1]
-        return (
-            first.get("interval_start"),
-            first.get("interval_end"),
-            first.get("consumption"),
-            last.get("interval_start"),
-            last.get("interval_end"),
-            last.get("consumption"),
+            usage_content_hash,
+            self._usage_content_hashes.digest("prices", self.all_prices),
+            self._get_cached_standing_charge_signature(),
         )
 
-    def _get_daily_cost_edges(self, daily_costs):
-        if not daily_costs:
-            return None
-
-        first = daily_costs[0]
-        last = daily_costs[-1]
-        return (
-            first.get("date"),
-            first.get("kwh"),
-            first.get("energy_cost_gbp"),
-            first.get("total_cost_gbp"),
-            first.get("missing_rate_count"),
-            first.get("sample_count"),
-            last.get("date"),
-            last.get("kwh"),
-            last.get("energy_cost_gbp"),
-            last.get("total_cost_gbp"),
-            last.get("missing_rate_count"),
-            last.get("sample_count"),
-        )
-
-    def _get_price_data_signature(self, prices):
-        return tuple(
-            (price.get("valid_from"), price.get("price_gbp"))
-            for price in prices
+    def _build_usage_content_hash(self, cached_data, daily_costs):
+        """Return a content hash of every input to the usage dashboard analysis."""
+        content_hashes = self._usage_content_hashes
+        return combine_content_hashes(
+            cached_data.get("synced_at"),
+            cached_data.get("price_band_version"),
+            content_hashes.digest("samples", cached_data.get("samples", [])),
+            content_hashes.digest("daily_costs", daily_costs),
+            content_hashes.digest("daily_usage_archive", cached_data.get("daily_usage_archive", [])),
+            content_hashes.digest("hourly_usage", cached_data.get("hourly_usage", [])),
+            content_hashes.digest("usage_cube", cached_data.get("usage_cube")),
         )
 
     def _get_cached_standing_charge_signature(self):
@@ -2569,6 +2874,9 @@ class MainWindow(Adw.ApplicationWindow):
 
     def _get_usage_cache(self, cache_key):
         cached_data, cache_mtime = self.usage_cache_manager.get(cache_key)
+        if cached_data and cached_data.get("price_band_version") != PRICE_BAND_VERSION:
+            # Rebanding is a local pass; the next refresh persists the new version.
+            cached_data = reband_usage_cache(cached_data) or cached_data
         if cached_data:
             return cached_data, cache_mtime
         return self.cache_manager.get(cache_key)
@@ -2576,27 +2884,13 @@ class MainWindow(Adw.ApplicationWindow):
     def _refresh_usage_history_background(self, account_number, cached_data):
         try:
             account_data = get_account_data(account_number)
-            refresh_started_at = datetime.now(timezone.utc)
-            refresh_start = get_usage_refresh_start(cached_data, refresh_started_at)
-            fresh_samples = fetch_recent_usage_samples(
-                account_data,
-                period_from=refresh_start,
-                now=refresh_started_at,
-            )
-            if fresh_samples:
-                fresh_daily_costs = self._build_historical_usage_costs_for_cache(account_data, fresh_samples)
-                fresh_daily_archive = self._fetch_daily_usage_archive_for_cache(
-                    account_data,
-                    cached_data,
-                    refresh_started_at,
-                )
-                refreshed_data = merge_usage_history(
-                    cached_data,
-                    fresh_samples,
-                    fresh_daily_costs,
-                    now=datetime.now(timezone.utc),
-                    fresh_daily_archive=fresh_daily_archive,
-                )
+            rate_cache = load_rate_cache(self.usage_cache_manager, get_account_tariff_codes(account_data))
+            try:
+                refreshed_data = refresh_usage_history(account_data, cached_data, rate_cache=rate_cache)
+            finally:
+                # Days fetched before a failure are still valid, so keep them for the next refresh.
+                store_rate_cache(self.usage_cache_manager, rate_cache)
+            if refreshed_data:
                 cache_key = f"octopus_usage_{account_number}"
                 self.usage_cache_manager.set(cache_key, refreshed_data)
                 GLib.idle_add(self._finish_usage_history_background_refresh, True)
@@ -2612,32 +2906,6 @@ class MainWindow(Adw.ApplicationWindow):
             logger.debug("Unexpected background usage refresh error: %s", type(exc).__name__)
             GLib.idle_add(self._finish_usage_history_background_refresh, False)
 
-    def _build_historical_usage_costs_for_cache(self, account_data, usage_samples):
-        try:
-            return build_historical_usage_costs(account_data, usage_samples)
-        except OctopusApiError as exc:
-            logger.debug("Historical usage cost refresh failed: %s", type(exc).__name__)
-        except requests.exceptions.RequestException as exc:
-            logger.debug("Historical usage cost network error: %s", type(exc).__name__)
-        except Exception as exc:  # ruff: ignore[BLE001] Optional cost enrichment must not fail the refresh.
-            logger.debug("Unexpected historical usage cost error: %s", type(exc).__name__)
-        return None
-
-    def _fetch_daily_usage_archive_for_cache(self, account_data, cached_data, now):
-        try:
-            return fetch_daily_usage_archive(
-                account_data,
-                period_from=get_usage_archive_refresh_start(cached_data, now),
-                now=now,
-            )
-        except OctopusApiError as exc:
-            logger.debug("Seasonal usage refresh failed: %s", type(exc).__name__)
-        except requests.exceptions.RequestException as exc:
-            logger.debug("Seasonal usage network error: %s", type(exc).__name__)
-        except Exception as exc:  # ruff: ignore[BLE001] Optional seasonal enrichment must not fail usage.
-            logger.debug("Unexpected seasonal usage error: %s", type(exc).__name__)
-        return None
-
     def _finish_usage_history_background_refresh(self, updated):
         self.usage_refresh_in_progress = False
         if updated or self.main_view_stack.get_visible_child_name() == "usage":
@@ -3148,7 +3416,7 @@ class MainWindow(Adw.ApplicationWindow):
     def _get_average_unit_price_gbp(self):
         if not self.all_prices:
             return 0.25
-        return sum(p['price_gbp'] for p in self.all_prices) / len(self.all_prices)
+        return self.all_prices.mean_price_gbp()
 
     def _get_standing_charge_gbp_per_day(self):
         selected_tariff_code = self.settings.get_string("selected-tariff-code")
@@ -9,8 +9,9 @@ from datetime import datetime, timezone
 from typing import ClassVar
 
 import requests
-from gi.repository import Adw, GLib, Gtk
+from gi.repository import Adw, Gio, GLib, Gtk
 
+from ..historical_rate_cache import load_rate_cache, store_rate_cache
 from ..octopus_api import OctopusApiError, get_json
 from ..price_logic import build_region_to_tariffs_map
 from ..region_location import (
@@ -24,13 +25,9 @@ from ..region_location import (
 )
 from ..secrets_manager import clear_api_key, get_api_key, store_api_key
 from ..usage_history import (
-    build_historical_usage_costs,
-    fetch_daily_usage_archive,
-    fetch_recent_usage_samples,
     get_account_data,
-    get_usage_archive_refresh_start,
-    get_usage_refresh_start,
-    merge_usage_history,
+    get_account_tariff_codes,
+    refresh_usage_history,
 )
 from ..utils import CacheManager
 
@@ -46,6 +43,13 @@ class PreferencesWindow(Adw.PreferencesWindow):
     TARIFF_CODE_TO_NAME: ClassVar[dict[str, str]] = {v: k for k, v in TARIFF_TYPE_CODES.items()}
     REGION_CODE_TO_NAME: ClassVar[dict[str, str]] = SHARED_REGION_CODE_TO_NAME
     REGION_NAME_TO_CODE: ClassVar[dict[str, str]] = SHARED_REGION_NAME_TO_CODE
+    # Settings key, title, subtitle, lower, upper, step and digits for each home battery row.
+    BATTERY_ROWS: ClassVar[list[tuple]] = [
+        ("battery-capacity-kwh", "Capacity", "Usable kWh; zero turns the battery plan off", 0.0, 1000.0, 0.5, 1),
+        ("battery-power-kw", "Power", "Largest charge or discharge rate, in kW", 0.0, 100.0, 0.1, 1),
+        ("battery-round-trip-efficiency", "Round-Trip Efficiency", "Share of charged energy given back", 0.5, 1.0, 0.01, 2),
+        ("battery-reserve-kwh", "Reserve", "kWh left in the battery when the plan ends", 0.0, 1000.0, 0.5, 1),
+    ]
 
     @staticmethod
     def _contains_token(value, token):
@@ -190,6 +194,21 @@ class PreferencesWindow(Adw.PreferencesWindow):
         self.usage_status.set_accessible_role(Gtk.AccessibleRole.STATUS)
         api_group.add(self.usage_status)
 
+        battery_group = Adw.PreferencesGroup.new()
+        battery_group.set_title("Home Battery")
+        battery_group.set_description("Shows the cheapest charge plan for the published prices in the Plan view.")
+        page.add(battery_group)
+
+        self.battery_rows = {}
+        for key, title, subtitle, lower, upper, step, digits in self.BATTERY_ROWS:
+            row = Adw.SpinRow.new_with_range(lower, upper, step)
+            row.set_title(title)
+            row.set_subtitle(subtitle)
+            row.set_digits(digits)
+            self.settings.bind(key, row, "value", Gio.SettingsBindFlags.DEFAULT)
+            battery_group.add(row)
+            self.battery_rows[key] = row
+
         self.present()
 
     def on_api_key_changed(self, entry):
@@ -349,30 +368,16 @@ class PreferencesWindow(Adw.PreferencesWindow):
             cached_data, _cache_mtime = self.usage_cache_manager.get(cache_key)
             if not cached_data:
                 cached_data, _cache_mtime = self.cache_manager.get(cache_key)
-            refresh_started_at = datetime.now(timezone.utc)
-            refresh_start = get_usage_refresh_start(cached_data, refresh_started_at)
-            fresh_samples = self._fetch_recent_usage_samples(
-                account_data,
-                period_from=refresh_start,
-                now=refresh_started_at,
-            )
-            if not fresh_samples:
+            rate_cache = load_rate_cache(self.usage_cache_manager, get_account_tariff_codes(account_data))
+            try:
+                refreshed_data = refresh_usage_history(account_data, cached_data, rate_cache=rate_cache)
+            finally:
+                # Days fetched before a failure are still valid, so keep them for the next refresh.
+                store_rate_cache(self.usage_cache_manager, rate_cache)
+            if not refreshed_data:
                 GLib.idle_add(self._set_usage_status, "No recent usage data found for this account.")
                 return
 
-            fresh_daily_costs = self._build_historical_usage_costs_for_cache(account_data, fresh_samples)
-            fresh_daily_archive = self._fetch_daily_usage_archive_for_cache(
-                account_data,
-                cached_data,
-                refresh_started_at,
-            )
-            refreshed_data = merge_usage_history(
-                cached_data,
-                fresh_samples,
-                fresh_daily_costs,
-                now=datetime.now(timezone.utc),
-                fresh_daily_archive=fresh_daily_archive,
-            )
             self.usage_cache_manager.set(cache_key, refreshed_data)
             GLib.idle_add(
                 self._set_usage_status,
@@ -388,31 +393,6 @@ class PreferencesWindow(Adw.PreferencesWindow):
         finally:
             GLib.idle_add(self._set_refresh_usage_button_state, True)
 
-    def _build_historical_usage_costs_for_cache(self, account_data, usage_samples):
-        try:
-            return build_historical_usage_costs(account_data, usage_samples)
-        except OctopusApiError as exc:
-            logger.debug("Historical usage cost refresh failed: %s", type(exc).__name__)
-        except requests.exceptions.RequestException as exc:
-            logger.debug("Historical usage cost network error: %s", type(exc).__name__)
-        except Exception as exc:  # ruff: ignore[BLE001] Optional cost enrichment must not fail the refresh.
-            logger.debug("Unexpected historical usage cost error: %s", type(exc).__name__)
-        return None
-
-    def _fetch_recent_usage_samples(self, account_data, period_from=None, now=None):
-        return fetch_recent_usage_samples(account_data, period_from=period_from, now=now)
-
-    def _fetch_daily_usage_archive_for_cache(self, account_data, cached_data, now):
-        try:
-            return fetch_daily_usage_archive(
-                account_data,
-                period_from=get_usage_archive_refresh_start(cached_data, now),
-                now=now,
-            )
-        except (OctopusApiError, requests.exceptions.RequestException) as exc:
-            logger.debug("Seasonal usage refresh failed: %s", type(exc).__name__)
-        return None
-
     def load_tariffs_and_regions(self):
         """
         Fetches available Octopus tariffs in a separate thread.
@@ -24,8 +24,11 @@ from ..price_chart_presentation import (
     get_day_transition_markers,
     get_flyout_horizontal_position,
     get_price_axis_bounds,
+    get_range_index_spans,
+    get_window_shift,
 )
 from ..price_formatting import format_gbp, format_unit_price_gbp
+from ..price_series import PriceSeries
 from ..uk_time import UK_TIMEZONE
 from .adaptive_layout import (
     get_chart_content_width,
@@ -52,9 +55,9 @@ class PriceChartWidget(Gtk.Overlay):
         self.margin_right = 15
         self.margin_top = 20
         self.margin_bottom = 30
-        self.highlight_start_time = None
-        self.highlight_end_time = None
+        self.highlight_ranges = []
         self.highlight_label = None
+        self.ranked_ranges = []
         self.comparison_start_time = None
         self.comparison_end_time = None
         self.slot_count = 0
@@ -65,12 +68,14 @@ class PriceChartWidget(Gtk.Overlay):
         self.hover_started_at = None
         self.horizontal_adjustment = None
         self._prices_gbp = []
+        self._valid_from_values = []
         self._min_price_index = -1
         self._max_price_index = -1
         self._axis_bounds = (0.0, 0.01)
         self._day_transition_markers = []
         self._layout_signature = None
         self._geometry_cache = None
+        self._shifted_point_ys = None
         self._text_layout_cache = {}
         self._text_style_signature = None
 
@@ -114,9 +119,10 @@ class PriceChartWidget(Gtk.Overlay):
     def _on_horizontal_adjustment_changed(self, _adjustment):
         self._queue_interaction_draw()
 
-    def _queue_static_draw(self):
+    def _queue_static_draw(self, clear_text_layouts=True):
         self._geometry_cache = None
-        self._text_layout_cache.clear()
+        if clear_text_layouts:
+            self._text_layout_cache.clear()
         self._base_area.queue_draw()
         self._interaction_area.queue_draw()
 
@@ -144,6 +150,7 @@ class PriceChartWidget(Gtk.Overlay):
             return
 
         self._layout_signature = layout_signature
+        self._shifted_point_ys = None
         self.compact = compact
         self.slot_count = slot_count
         self.margin_left = margin_left
@@ -166,11 +173,19 @@ class PriceChartWidget(Gtk.Overlay):
         )
         self.prices = prices
         self.current_price_index = current_index
+        self._shifted_point_ys = None
         current_times = [price['valid_from'] for price in self.prices]
-        self._prices_gbp = [price['price_gbp'] for price in self.prices]
-        if self._prices_gbp:
-            self._min_price_index = self._prices_gbp.index(min(self._prices_gbp))
-            self._max_price_index = self._prices_gbp.index(max(self._prices_gbp))
+        self._valid_from_values = current_times
+        if isinstance(prices, PriceSeries):
+            # The series already holds its prices as a float array, so the
+            # chart reads it in place instead of copying it.
+            self._prices_gbp = prices.prices_gbp
+        else:
+            self._prices_gbp = [price['price_gbp'] for price in self.prices]
+        if len(self._prices_gbp):
+            slot_indices = range(len(self._prices_gbp))
+            self._min_price_index = min(slot_indices, key=self._prices_gbp.__getitem__)
+            self._max_price_index = max(slot_indices, key=self._prices_gbp.__getitem__)
             self._axis_bounds = get_price_axis_bounds(self._prices_gbp)
         else:
             self._min_price_index = -1
@@ -192,16 +207,103 @@ class PriceChartWidget(Gtk.Overlay):
         self._update_accessible_summary()
         self._queue_static_draw()
 
+    def advance_prices(self, prices, current_index):
+        """
+        Moves the chart on to ``prices`` after a half-hour rollover.
+
+        When the new window is the old one moved forward along the same price
+        list, the selection, hover energy, extremes, day markers and plotted
+        points are shifted and only the newly visible slots are measured.
+        Anything else falls back to ``set_prices``.
+        """
+        shift = get_window_shift(self.prices, prices)
+        if shift is None or len(prices) != len(self.prices) or not isinstance(prices, PriceSeries):
+            self.set_prices(prices, current_index)
+            return
+
+        kept_count = len(prices) - shift
+        previous_axis_bounds = self._axis_bounds
+        previous_first_date = self._valid_from_values[0].astimezone(UK_TIMEZONE).date()
+        self.prices = prices
+        self.current_price_index = current_index
+        self._prices_gbp = prices.prices_gbp
+        self._valid_from_values = self._valid_from_values[shift:] + [
+            price['valid_from'] for price in prices[kept_count:]
+        ]
+
+        self._min_price_index = self._shift_extreme_index(self._min_price_index, shift, kept_count, min)
+        self._max_price_index = self._shift_extreme_index(self._max_price_index, shift, kept_count, max)
+        self._axis_bounds = get_price_axis_bounds(
+            [self._prices_gbp[self._min_price_index], self._prices_gbp[self._max_price_index]]
+        )
+
+        if self._valid_from_values[0].astimezone(UK_TIMEZONE).date() == previous_first_date:
+            self._day_transition_markers = [
+                (index - shift, label)
+                for index, label in self._day_transition_markers
+                if index - shift > 0
+            ] + get_day_transition_markers(self._valid_from_values, start_index=kept_count)
+        else:
+            self._day_transition_markers = get_day_transition_markers(self._valid_from_values)
+
+        self.selected_index = self.selected_index - shift if self.selected_index >= shift else -1
+        self.hovered_index = -1
+        self.hover_started_at = None
+        self.slot_energies = self.slot_energies[shift:] + [0.0] * shift
+        self._active_energy_indices = {
+            index - shift for index in self._active_energy_indices if index >= shift
+        }
+
+        # Slots keep their x positions, so unless the price axis moved, the
+        # plotted heights of the slots still on screen carry over.
+        self._shifted_point_ys = None
+        if self._geometry_cache and self._axis_bounds == previous_axis_bounds:
+            cache_key, geometry = self._geometry_cache
+            self._shifted_point_ys = (
+                cache_key,
+                [point_y for _point_x, point_y in geometry["points"][shift:]],
+            )
+
+        self._update_accessible_summary()
+        self._queue_static_draw(clear_text_layouts=False)
+
+    def _shift_extreme_index(self, index, shift, kept_count, choose):
+        if index < shift:
+            slot_indices = range(len(self._prices_gbp))
+            return choose(slot_indices, key=self._prices_gbp.__getitem__)
+
+        # Newly visible slots come last, so they only win outright, keeping
+        # the first of equal extremes as a full scan would.
+        index -= shift
+        for new_index in range(kept_count, len(self._prices_gbp)):
+            if choose(self._prices_gbp[new_index], self._prices_gbp[index]) != self._prices_gbp[index]:
+                index = new_index
+        return index
+
     def set_highlight_range(self, start_time, end_time, label=None):
         """
         Sets the time range to highlight on the chart.
         """
-        self.highlight_start_time = start_time
-        self.highlight_end_time = end_time
+        ranges = [(start_time, end_time)] if start_time and end_time else []
+        self.set_highlight_ranges(ranges, label)
+
+    def set_highlight_ranges(self, ranges, label=None):
+        """
+        Sets several ``(start_time, end_time)`` ranges to highlight under one label.
+        """
+        self.highlight_ranges = list(ranges)
         self.highlight_label = label
         self._update_accessible_summary()
         self._queue_static_draw()
 
+    def set_ranked_ranges(self, ranges):
+        """
+        Sets runner-up ``(start_time, end_time, label)`` ranges, drawn more quietly than the highlight.
+        """
+        self.ranked_ranges = list(ranges)
+        self._update_accessible_summary()
+        self._queue_static_draw()
+
     def set_comparison_range(self, start_time, end_time):
         self.comparison_start_time = start_time
         self.comparison_end_time = end_time
@@ -303,6 +405,12 @@ class PriceChartWidget(Gtk.Overlay):
             )
             if self.highlight_label:
                 description += f" Highlighted range: {self.highlight_label}."
+            if self.ranked_ranges:
+                ranked_labels = ", ".join(
+                    f"{label} {start_time.astimezone(UK_TIMEZONE).strftime('%H:%M')}"
+                    for start_time, _end_time, label in self.ranked_ranges
+                )
+                description += f" Alternative ranges: {ranked_labels}."
             if self.comparison_start_time and self.comparison_end_time:
                 comparison_start = self.comparison_start_time.astimezone(UK_TIMEZONE).strftime('%H:%M')
                 comparison_end = self.comparison_end_time.astimezone(UK_TIMEZONE).strftime('%H:%M')
@@ -575,44 +683,30 @@ class PriceChartWidget(Gtk.Overlay):
         display_min_price, display_max_price = self._axis_bounds
         price_range = display_max_price - display_min_price
         chart_zero_y = self.margin_top + chart_height * (display_max_price / price_range)
-        highlight_x_start = None
-        highlight_x_end = None
         comparison_x_start = None
         comparison_x_end = None
-        highlighted_indices = []
         points = []
         slot_bounds = []
         min_index = self._min_price_index
         max_index = self._max_price_index
 
+        shifted_point_ys = []
+        if self._shifted_point_ys and self._shifted_point_ys[0] == cache_key:
+            shifted_point_ys = self._shifted_point_ys[1]
+        self._shifted_point_ys = None
+
         for i, price_data in enumerate(self.prices):
-            price = price_data['price_gbp']
             bar_x_start = self.margin_left + (i * chart_width) / len(self.prices)
             bar_x_end = self.margin_left + ((i + 1) * chart_width) / len(self.prices)
             bar_width = bar_x_end - bar_x_start
             point_x = bar_x_start + bar_width / 2
-            point_y = chart_zero_y - (price / price_range) * chart_height
+            if i < len(shifted_point_ys):
+                point_y = shifted_point_ys[i]
+            else:
+                point_y = chart_zero_y - (price_data['price_gbp'] / price_range) * chart_height
             points.append((point_x, point_y))
             slot_bounds.append((bar_x_start, bar_x_start + bar_width - 1))
 
-            # Highlight the best slot
-            if (
-                self.highlight_start_time
-                and self.highlight_end_time
-                and self.highlight_start_time <= price_data['valid_from'] < self.highlight_end_time
-            ):
-                highlighted_indices.append(i)
-                highlight_x_start = (
-                    bar_x_start
-                    if highlight_x_start is None
-                    else min(highlight_x_start, bar_x_start)
-                )
-                highlight_x_end = (
-                    bar_x_start + bar_width - 1
-                    if highlight_x_end is None
-                    else max(highlight_x_end, bar_x_start + bar_width - 1)
-                )
-
             if (
                 self.comparison_start_time
                 and self.comparison_end_time
@@ -633,6 +727,26 @@ class PriceChartWidget(Gtk.Overlay):
             (slot_bounds[index][0], label)
             for index, label in self._day_transition_markers
         ]
+        highlight_spans = get_range_index_spans(
+            self._valid_from_values,
+            [(start_time, end_time, None) for start_time, end_time in self.highlight_ranges],
+        )
+        highlight_bounds = [
+            (slot_bounds[first_index][0], slot_bounds[last_index][1])
+            for first_index, last_index, _label in highlight_spans
+        ]
+        highlighted_indices = sorted(
+            index
+            for first_index, last_index, _label in highlight_spans
+            for index in range(first_index, last_index + 1)
+        )
+        ranked_bounds = [
+            (slot_bounds[first_index][0], slot_bounds[last_index][1], label)
+            for first_index, last_index, label in get_range_index_spans(
+                self._valid_from_values,
+                self.ranked_ranges,
+            )
+        ]
         geometry = {
             "chart_width": chart_width,
             "chart_height": chart_height,
@@ -642,10 +756,10 @@ class PriceChartWidget(Gtk.Overlay):
             "display_max_price": display_max_price,
             "points": points,
             "slot_bounds": slot_bounds,
-            "highlight_x_start": highlight_x_start,
-            "highlight_x_end": highlight_x_end,
+            "highlight_bounds": highlight_bounds,
             "comparison_x_start": comparison_x_start,
             "comparison_x_end": comparison_x_end,
+            "ranked_bounds": ranked_bounds,
             "highlighted_indices": highlighted_indices,
             "day_transitions": day_transitions,
             "min_index": min_index,
@@ -715,13 +829,15 @@ class PriceChartWidget(Gtk.Overlay):
             geometry["comparison_x_end"],
             chart_height,
         )
-        self._draw_highlight_range(
-            cr,
-            fg_color,
-            geometry["highlight_x_start"],
-            geometry["highlight_x_end"],
-            chart_height,
-        )
+        self._draw_ranked_ranges(cr, fg_color, geometry["ranked_bounds"], chart_height)
+        for highlight_x_start, highlight_x_end in geometry["highlight_bounds"]:
+            self._draw_highlight_range(
+                cr,
+                fg_color,
+                highlight_x_start,
+                highlight_x_end,
+                chart_height,
+            )
 
         for i, price_data in enumerate(self.prices):
             price = price_data['price_gbp']
@@ -774,13 +890,14 @@ class PriceChartWidget(Gtk.Overlay):
             cr.line_to(round(current_x) + 0.5, self.margin_top + chart_height)
             cr.stroke()
 
-        self._draw_highlight_label(
-            cr,
-            fg_color,
-            geometry["highlight_x_start"],
-            geometry["highlight_x_end"],
-            width,
-        )
+        if geometry["highlight_bounds"]:
+            self._draw_highlight_label(
+                cr,
+                fg_color,
+                min(bounds[0] for bounds in geometry["highlight_bounds"]),
+                max(bounds[1] for bounds in geometry["highlight_bounds"]),
+                width,
+            )
 
         for day_transition_x, day_label in geometry["day_transitions"]:
             cr.set_source_rgba(fg_color.red, fg_color.green, fg_color.blue, 0.2)
@@ -934,6 +1051,33 @@ class PriceChartWidget(Gtk.Overlay):
         self._draw_layout(cr, label_layout, label_x + padding_x, label_y + padding_y)
         cr.restore()
 
+    def _draw_ranked_ranges(self, cr, fg_color, ranked_bounds, chart_height):
+        if not ranked_bounds:
+            return
+
+        cr.save()
+        cr.set_line_width(1.0)
+        cr.set_dash([3.0, 3.0])
+        for range_x_start, range_x_end, label in ranked_bounds:
+            range_width = max(1, range_x_end - range_x_start)
+            self._rounded_rectangle(cr, range_x_start, self.margin_top + 2, range_width, max(1, chart_height - 4), 9)
+            cr.set_source_rgba(0.92, 0.70, 0.14, 0.04)
+            cr.fill_preserve()
+            cr.set_source_rgba(0.92, 0.70, 0.14, 0.30)
+            cr.stroke()
+
+            label_layout = self._create_text_layout(label, scale=0.8)
+            label_width, label_height = self._layout_size(label_layout)
+            if label_width + 8 <= range_width:
+                cr.set_source_rgba(fg_color.red, fg_color.green, fg_color.blue, 0.55)
+                self._draw_layout(
+                    cr,
+                    label_layout,
+                    range_x_start + (range_width - label_width) / 2,
+                    self.margin_top + chart_height - label_height - 6,
+                )
+        cr.restore()
+
     def _draw_highlight_range(self, cr, fg_color, highlight_x_start, highlight_x_end, chart_height):
         if highlight_x_start is None or highlight_x_end is None:
             return
@@ -1010,7 +1154,6 @@ class PriceChartWidget(Gtk.Overlay):
         cr.set_line_join(cairo.LINE_JOIN_ROUND)
         cr.set_line_cap(cairo.LINE_CAP_ROUND)
 
-        drew_segment = False
         cr.set_line_width(7.0 if not self.compact else 6.0)
         cr.set_source_rgba(0.92, 0.70, 0.14, 0.20)
         for index in range(len(points) - 1):
@@ -1018,7 +1161,6 @@ class PriceChartWidget(Gtk.Overlay):
                 cr.move_to(points[index][0], points[index][1])
                 cr.line_to(points[index + 1][0], points[index + 1][1])
                 cr.stroke()
-                drew_segment = True
 
         cr.set_line_width(3.4 if not self.compact else 3.0)
         cr.set_source_rgba(1.0, 0.84, 0.30, 0.70)
@@ -1028,12 +1170,12 @@ class PriceChartWidget(Gtk.Overlay):
                 cr.line_to(points[index + 1][0], points[index + 1][1])
                 cr.stroke()
 
-        if not drew_segment:
-            index = highlighted_indices[0]
-            if 0 <= index < len(points):
-                cr.arc(points[index][0], points[index][1], 8.0, 0, math.tau)
-                cr.set_source_rgba(1.0, 0.84, 0.30, 0.24)
-                cr.fill()
+        for index in highlighted_indices:
+            if index - 1 in highlighted or index + 1 in highlighted or not 0 <= index < len(points):
+                continue
+            cr.arc(points[index][0], points[index][1], 8.0, 0, math.tau)
+            cr.set_source_rgba(1.0, 0.84, 0.30, 0.24)
+            cr.fill()
 
         cr.restore()
 
@@ -1231,11 +1373,12 @@ class PriceChartWidget(Gtk.Overlay):
         return viewport_left, max(viewport_left, viewport_right)
 
     def _describe_slot(self, index, price, min_index, max_index):
-        in_highlight = False
         in_comparison = False
         valid_from = self.prices[index]['valid_from']
-        if self.highlight_start_time and self.highlight_end_time:
-            in_highlight = self.highlight_start_time <= valid_from < self.highlight_end_time
+        in_highlight = any(
+            start_time <= valid_from < end_time
+            for start_time, end_time in self.highlight_ranges
+        )
         if self.comparison_start_time and self.comparison_end_time:
             in_comparison = self.comparison_start_time <= valid_from < self.comparison_end_time
 
@@ -1257,6 +1400,9 @@ class PriceChartWidget(Gtk.Overlay):
             return self.highlight_label or "Cheapest window"
         if in_comparison:
             return "Selected comparison window"
+        for start_time, end_time, label in self.ranked_ranges:
+            if start_time <= valid_from < end_time:
+                return f"Alternative window {label}"
         return f"{get_price_band(price).title()} price"
 
     def _rounded_rectangle(self, cr, x, y, width, height, radius):
@@ -12,6 +12,22 @@ def expected_half_hours_for_local_day(day: date) -> int:
     return round(duration.total_seconds() / (30 * 60))
 
 
+def local_day_bounds_utc(day: date) -> tuple[datetime, datetime]:
+    """Return the UTC start and end of a Great Britain civil day."""
+    local_start = datetime.combine(day, time.min, tzinfo=UK_TIMEZONE)
+    local_end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=UK_TIMEZONE)
+    return local_start.astimezone(timezone.utc), local_end.astimezone(timezone.utc)
+
+
+def local_days_between(period_start: datetime, period_end: datetime) -> list[date]:
+    """Return every Great Britain civil day touched by a half-open period."""
+    if period_start >= period_end:
+        return []
+    first_day = period_start.astimezone(UK_TIMEZONE).date()
+    last_day = (period_end - timedelta(microseconds=1)).astimezone(UK_TIMEZONE).date()
+    return [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+
+
 def latest_complete_local_day(synced_at: str | datetime | None) -> date | None:
     """Return the latest GB day known to be complete at a synchronization time."""
     if not synced_at:
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .usage_cube import UsageCube
+from .usage_insights import build_usage_dashboard_data
+
+logger = logging.getLogger(__name__)
+
+
+class UsageAnalysisExecutor:
+    """Run ``build_usage_dashboard_data`` away from the GTK main loop.
+
+    Analysis normally runs on a daemon thread.  With ``use_process_pool`` it
+    runs in a single spawned worker process instead, so its parsing does not
+    hold the interpreter lock the main loop needs for chart hover and
+    animation.  When a worker process cannot be started, or dies, the
+    analysis is run on a thread and later submissions stay on threads.
+    """
+
+    def __init__(self):
+        self._process_pool = None
+        self._process_pool_unavailable = False
+        self._lock = threading.Lock()
+
+    def submit(self, args, use_process_pool=False):
+        """Start an analysis of ``build_usage_dashboard_data(*args)`` and return its future."""
+        if use_process_pool:
+            process_pool = self._get_process_pool()
+            if process_pool is not None:
+                try:
+                    process_future = process_pool.submit(build_usage_dashboard_data, *_compact_analysis_args(args))
+                except (BrokenProcessPool, OSError, RuntimeError) as exc:
+                    self._disable_process_pool(exc)
+                else:
+                    future = Future()
+                    process_future.add_done_callback(
+                        lambda done: self._forward_process_result(done, future, args)
+                    )
+                    return future
+        return _submit_to_thread(args)
+
+    def shutdown(self):
+        with self._lock:
+            process_pool, self._process_pool = self._process_pool, None
+        if process_pool is not None:
+            process_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _get_process_pool(self):
+        with self._lock:
+            if self._process_pool is None and not self._process_pool_unavailable:
+                try:
+                    # Forking a process that has GTK threads running is unsafe.
+                    self._process_pool = ProcessPoolExecutor(
+                        max_workers=1,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                except (ImportError, NotImplementedError, OSError) as exc:
+                    self._process_pool_unavailable = True
+                    logger.debug("Usage analysis process pool unavailable: %s", type(exc).__name__)
+            return self._process_pool
+
+    def _disable_process_pool(self, exc):
+        logger.debug("Usage analysis process pool failed; using threads: %s", type(exc).__name__)
+        with self._lock:
+            process_pool, self._process_pool = self._process_pool, None
+            self._process_pool_unavailable = True
+        if process_pool is not None:
+            process_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _forward_process_result(self, process_future, future, args):
+        exc = process_future.exception()
+        if isinstance(exc, BrokenProcessPool):
+            self._disable_process_pool(exc)
+            _submit_to_thread(args, future)
+        elif exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(process_future.result())
+
+
+def _submit_to_thread(args, future=None):
+    future = future or Future()
+    thread = threading.Thread(target=_run_analysis, args=(future, args))
+    thread.daemon = True
+    thread.start()
+    return future
+
+
+def _run_analysis(future, args):
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        future.set_result(build_usage_dashboard_data(*args))
+    except Exception as exc:  # ruff: ignore[BLE001] Malformed cached data is reported through the future.
+        future.set_exception(exc)
+
+
+def _compact_analysis_args(args):
+    """Leave out the half-hour samples when the cached usage cube already summarizes them."""
+    samples, synced_at, daily_costs, daily_archive, hourly_usage, usage_cube = args
+    if UsageCube.from_payload(usage_cube) is not None:
+        samples = []
+    return samples, synced_at, daily_costs, daily_archive, hourly_usage, usage_cube
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from .historical_costs import SAMPLE_UNIT_RATE_KEY
+from .price_bands import PRICE_BAND_VERSION, get_price_band
+from .uk_time import UK_TIMEZONE
+
+USAGE_CUBE_VERSION = 1
+UNPRICED_BAND = "unpriced"
+CELL_KWH = 0
+CELL_COST_GBP = 1
+CELL_SAMPLE_COUNT = 2
+CELL_MIN_KWH = 3
+
+
+class UsageCube:
+    """kWh, cost and sample counts indexed by GB day, half-hour slot of day and price band.
+
+    ``days`` maps ``YYYY-MM-DD`` to ``HH:MM`` slot keys, each mapping a price
+    band (or ``UNPRICED_BAND`` when no unit rate was matched) to a
+    ``[kwh, cost_gbp, sample_count, min_kwh]`` cell.  The repeated autumn
+    hour shares its slots, as it does in the half-hourly insights.
+    """
+
+    __slots__ = ("days",)
+
+    def __init__(self, days=None):
+        self.days = days if days is not None else {}
+
+    def add_sample(self, day_key, slot_key, price_band, kwh, cost_gbp):
+        bands = self.days.setdefault(day_key, {}).setdefault(slot_key, {})
+        cell = bands.get(price_band)
+        if cell is None:
+            bands[price_band] = [kwh, cost_gbp, 1, kwh]
+            return
+        cell[CELL_KWH] += kwh
+        cell[CELL_COST_GBP] += cost_gbp
+        cell[CELL_SAMPLE_COUNT] += 1
+        cell[CELL_MIN_KWH] = min(cell[CELL_MIN_KWH], kwh)
+
+    def daily_totals(self):
+        """Return ``(day_key, kwh, sample_count)`` for every day, oldest first."""
+        totals = []
+        for day_key in sorted(self.days):
+            kwh = 0.0
+            sample_count = 0
+            for cell in _iter_day_cells(self.days[day_key]):
+                kwh += cell[CELL_KWH]
+                sample_count += cell[CELL_SAMPLE_COUNT]
+            totals.append((day_key, kwh, sample_count))
+        return totals
+
+    def day_minimum(self, day_key):
+        return min(cell[CELL_MIN_KWH] for cell in _iter_day_cells(self.days.get(day_key, {})))
+
+    def slot_totals(self):
+        totals = {}
+        for day_key in sorted(self.days):
+            for slot_key, bands in self.days[day_key].items():
+                totals[slot_key] = totals.get(slot_key, 0.0) + sum(cell[CELL_KWH] for cell in bands.values())
+        return totals
+
+    def slot_day_counts(self):
+        """Return how many days have usage in each ``HH:MM`` slot."""
+        counts = {}
+        for slots in self.days.values():
+            for slot_key in slots:
+                counts[slot_key] = counts.get(slot_key, 0) + 1
+        return counts
+
+    def band_totals(self, day_keys):
+        """Return ``{price_band: [kwh, cost_gbp, sample_count]}`` summed over the given days."""
+        totals = {}
+        for day_key in day_keys:
+            for bands in self.days.get(day_key, {}).values():
+                for price_band, cell in bands.items():
+                    total = totals.setdefault(price_band, [0.0, 0.0, 0])
+                    total[0] += cell[CELL_KWH]
+                    total[1] += cell[CELL_COST_GBP]
+                    total[2] += cell[CELL_SAMPLE_COUNT]
+        return totals
+
+    def to_payload(self):
+        return {
+            "cube_version": USAGE_CUBE_VERSION,
+            "price_band_version": PRICE_BAND_VERSION,
+            "days": self.days,
+        }
+
+    @classmethod
+    def from_payload(cls, payload):
+        """Return a cube from a cached payload, or ``None`` when it was built differently."""
+        if (
+            not isinstance(payload, dict)
+            or payload.get("cube_version") != USAGE_CUBE_VERSION
+            or payload.get("price_band_version") != PRICE_BAND_VERSION
+            or not isinstance(payload.get("days"), dict)
+        ):
+            return None
+        return cls(payload["days"])
+
+
+def build_usage_cube(samples):
+    return _add_samples(UsageCube(), _parse_samples(samples))
+
+
+def merge_usage_cube(cached_payload, samples, changed_day_keys):
+    """Rebuild only the changed days of a cached cube from the merged samples.
+
+    Days no longer covered by ``samples`` are dropped.  An incompatible cached
+    payload is rebuilt from every sample.
+    """
+    parsed_samples = _parse_samples(samples)
+    cached_cube = UsageCube.from_payload(cached_payload)
+    if cached_cube is None:
+        return _add_samples(UsageCube(), parsed_samples).to_payload()
+
+    retained_days = {local_start.date().isoformat() for _start, local_start, _kwh, _rate in parsed_samples}
+    days = {
+        day_key: slots
+        for day_key, slots in cached_cube.days.items()
+        if day_key in retained_days and day_key not in changed_day_keys
+    }
+    rebuilt = _add_samples(UsageCube(), parsed_samples, changed_day_keys)
+    days.update(rebuilt.days)
+    return UsageCube(days).to_payload()
+
+
+def _add_samples(cube, parsed_samples, day_keys=None):
+    for _start, local_start, consumption, unit_rate_gbp in parsed_samples:
+        day_key = local_start.date().isoformat()
+        if day_keys is not None and day_key not in day_keys:
+            continue
+        if unit_rate_gbp is None:
+            price_band = UNPRICED_BAND
+            cost_gbp = 0.0
+        else:
+            price_band = get_price_band(unit_rate_gbp)
+            cost_gbp = consumption * unit_rate_gbp
+        cube.add_sample(day_key, f"{local_start.hour:02d}:{local_start.minute:02d}", price_band, consumption, cost_gbp)
+    return cube
+
+
+def _parse_samples(samples):
+    """Return ``(start, local_start, kwh, unit_rate_gbp)`` per interval, later duplicates winning."""
+    parsed_by_start = {}
+    for sample in samples:
+        interval_start = sample.get("interval_start")
+        consumption = sample.get("consumption")
+        if interval_start is None or consumption is None:
+            continue
+        try:
+            start = datetime.fromisoformat(interval_start.replace("Z", "+00:00"))
+            if start.tzinfo is None:
+                start = start.replace(tzinfo=timezone.utc)
+            consumption = float(consumption)
+            unit_rate_gbp = sample.get(SAMPLE_UNIT_RATE_KEY)
+            if unit_rate_gbp is not None:
+                unit_rate_gbp = float(unit_rate_gbp)
+        except (AttributeError, TypeError, ValueError):
+            continue
+        start = start.astimezone(timezone.utc)
+        parsed_by_start[start] = (start, start.astimezone(UK_TIMEZONE), consumption, unit_rate_gbp)
+    return [parsed_by_start[start] for start in sorted(parsed_by_start)]
+
+
+def _iter_day_cells(slots):
+    for bands in slots.values():
+        yield from bands.values()
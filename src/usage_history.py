@@ -1,15 +1,34 @@
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from urllib.parse import quote, urlencode
 
 import requests
 
-from .historical_costs import build_daily_costs, build_tariff_periods, get_usage_period
+from .daily_cost_stream import DailyCostAccumulator
+from .historical_costs import (
+    SAMPLE_UNIT_RATE_KEY,
+    build_daily_costs,
+    build_tariff_periods,
+    compare_tariff_costs,
+    get_usage_period,
+    reband_daily_costs,
+)
+from .historical_rate_cache import (
+    compatible_rate_cache_entry,
+    get_cached_rate_records,
+    get_uncached_day_spans,
+    new_rate_cache_entry,
+    prune_rate_cache_entry,
+    store_rate_records,
+)
 from .octopus_api import OctopusApiError, get_json
 from .price_bands import PRICE_BAND_VERSION
 from .price_logic import build_dual_register_price_windows, extract_product_code
 from .uk_time import UK_TIMEZONE
+from .usage_cube import merge_usage_cube
+from .usage_retention import build_hourly_usage_rollups, merge_hourly_usage_rollups
 from .usage_seasonality import (
     USAGE_ARCHIVE_DAYS,
     build_daily_usage_archive,
@@ -20,6 +39,8 @@ logger = logging.getLogger(__name__)
 USAGE_HISTORY_DAYS = 120
 USAGE_REFRESH_OVERLAP_DAYS = 7
 USAGE_CACHE_VERSION = 4
+MAX_CONCURRENT_METER_POINTS = 4
+MAX_CONCURRENT_RATE_SPANS = 4
 ACCOUNT_NUMBER_PATTERN = re.compile(r"A-[A-Z0-9]+", re.IGNORECASE)
 
 
@@ -44,71 +65,371 @@ def fetch_recent_usage_samples(account_data, period_from=None, now=None):
     return _fetch_usage_samples(account_data, period_from, now)
 
 
-def fetch_daily_usage_archive(account_data, period_from=None, now=None):
+def fetch_daily_usage_archive(account_data, period_from=None, now=None, mpan=None):
+    """Fetch local-day totals for ``mpan``, or for the first active meter point with data."""
     now = now or datetime.now(timezone.utc)
     if period_from is None:
         period_from = now - timedelta(days=USAGE_ARCHIVE_DAYS)
-    samples = _fetch_usage_samples(account_data, period_from, now, group_by="day")
+    if mpan is None:
+        samples = _fetch_usage_samples(account_data, period_from, now, group_by="day")
+    else:
+        meter_point = next(
+            (meter_point for meter_point in list_active_meter_points(account_data, now) if meter_point["mpan"] == mpan),
+            None,
+        )
+        samples = _fetch_meter_point_samples(meter_point, period_from, now, group_by="day") if meter_point else []
     return build_daily_usage_archive(samples)
 
 
-def _fetch_usage_samples(account_data, period_from, now, group_by=None):
-    period_from_text = _format_octopus_datetime(period_from)
-    period_to_text = _format_octopus_datetime(now)
+def refresh_usage_history(account_data, cached_data, rate_cache=None, now=None):
+    """Fetch every active meter point and merge the result into a usage cache payload.
+
+    The meter point expected to be primary is costed while its pages
+    download.  The primary is then chosen from the meter points that
+    returned samples, so an empty meter does not discard the others; its
+    daily archive is fetched for that meter point alone.  ``rate_cache`` is
+    used and updated as in :func:`build_historical_usage_costs`.  Returns
+    ``None`` when no meter point returned samples.
+    """
+    now = now or datetime.now(timezone.utc)
+    meter_points = {meter_point["mpan"]: meter_point for meter_point in list_active_meter_points(account_data, now)}
+    active_mpans = list(meter_points)
+    export_mpans = get_export_mpans(account_data)
+    expected_primary_mpan = choose_primary_mpan(cached_data, active_mpans, export_mpans)
+    if expected_primary_mpan is None:
+        return None
+
+    refresh_starts = get_meter_point_refresh_starts(cached_data, active_mpans, now)
+    compatible_cache = _compatible_usage_cache(cached_data) or {}
+    archive_cache = cached_data
+    if compatible_cache.get("primary_mpan") not in (None, expected_primary_mpan):
+        # Costs and the archive are rebuilt for the new primary meter point,
+        # so fetch its whole history rather than the overlap window.
+        refresh_starts[expected_primary_mpan] = now - timedelta(days=USAGE_HISTORY_DAYS)
+        archive_cache = None
+
+    samples_by_mpan, fresh_daily_costs = fetch_recent_usage_with_costs(
+        account_data,
+        refresh_starts,
+        expected_primary_mpan,
+        now=now,
+        rate_cache=rate_cache,
+    )
+    primary_mpan = choose_primary_mpan(cached_data, samples_by_mpan, export_mpans)
+    if primary_mpan is None:
+        return None
+    fresh_samples = samples_by_mpan[primary_mpan]
+    if primary_mpan != expected_primary_mpan:
+        # The expected primary returned nothing, so the meter point that did
+        # takes over.  Its cached series only covered the overlap window, so
+        # cost and archive its whole retained history.
+        fresh_samples = _merge_sample_series(
+            [*_cached_meter_point_series(compatible_cache).get(primary_mpan, []), *fresh_samples],
+            now - timedelta(days=USAGE_HISTORY_DAYS),
+        )
+        fresh_daily_costs = None
+        archive_cache = None
+    if fresh_daily_costs is None:
+        fresh_daily_costs = _build_usage_costs_for_cache(
+            _meter_point_account_data(meter_points[primary_mpan]),
+            fresh_samples,
+            rate_cache,
+            now,
+        )
+
+    return merge_usage_history(
+        cached_data,
+        fresh_samples,
+        fresh_daily_costs,
+        now=now,
+        fresh_daily_archive=_fetch_daily_usage_archive_for_cache(
+            account_data,
+            get_usage_archive_refresh_start(archive_cache, now),
+            now,
+            primary_mpan,
+        ),
+        fresh_meter_point_samples=samples_by_mpan,
+        primary_mpan=primary_mpan,
+        export_mpans=export_mpans,
+    )
 
+
+def _build_usage_costs_for_cache(account_data, usage_samples, rate_cache, now):
+    try:
+        return build_historical_usage_costs(account_data, usage_samples, rate_cache=rate_cache, now=now)
+    except OctopusApiError as exc:
+        logger.debug("Historical usage cost refresh failed: %s", type(exc).__name__)
+    except requests.exceptions.RequestException as exc:
+        logger.debug("Historical usage cost network error: %s", type(exc).__name__)
+    except Exception as exc:  # ruff: ignore[BLE001] Optional cost enrichment must not fail the refresh.
+        logger.debug("Unexpected historical usage cost error: %s", type(exc).__name__)
+    return None
+
+
+def _fetch_daily_usage_archive_for_cache(account_data, period_from, now, mpan):
+    try:
+        return fetch_daily_usage_archive(account_data, period_from=period_from, now=now, mpan=mpan)
+    except OctopusApiError as exc:
+        logger.debug("Seasonal usage refresh failed: %s", type(exc).__name__)
+    except requests.exceptions.RequestException as exc:
+        logger.debug("Seasonal usage network error: %s", type(exc).__name__)
+    except Exception as exc:  # ruff: ignore[BLE001] Optional seasonal enrichment must not fail usage.
+        logger.debug("Unexpected seasonal usage error: %s", type(exc).__name__)
+    return None
+
+
+def fetch_recent_usage_with_costs(account_data, period_from_by_mpan, costed_mpan, now=None, rate_cache=None):
+    """Fetch every active meter point and cost ``costed_mpan`` while its pages download.
+
+    Returns ``(samples_by_mpan, daily_costs)``.  ``daily_costs`` is ``None``
+    when the costed meter point returned no samples or its historical rates
+    could not be fetched; ``rate_cache`` is used and updated as in
+    :func:`build_historical_usage_costs`.
+    """
+    now = now or datetime.now(timezone.utc)
+    period_from_by_mpan = period_from_by_mpan or {}
+    history_start = now - timedelta(days=USAGE_HISTORY_DAYS)
+    meter_points = list_active_meter_points(account_data, now)
+    if not meter_points:
+        return {}, None
+
+    daily_costs = None
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_METER_POINTS, len(meter_points))) as executor:
+        futures = {}
+        for meter_point in meter_points:
+            mpan = meter_point["mpan"]
+            period_from = period_from_by_mpan.get(mpan, history_start)
+            if mpan == costed_mpan:
+                futures[mpan] = executor.submit(
+                    _fetch_meter_point_samples_with_costs,
+                    meter_point,
+                    period_from,
+                    now,
+                    rate_cache,
+                )
+            else:
+                futures[mpan] = executor.submit(_fetch_meter_point_samples, meter_point, period_from, now)
+
+        samples_by_mpan = {}
+        for mpan, future in futures.items():
+            if mpan == costed_mpan:
+                samples, daily_costs = future.result()
+            else:
+                samples = future.result()
+            if samples:
+                samples_by_mpan[mpan] = samples
+
+    if costed_mpan not in samples_by_mpan:
+        daily_costs = None
+    return samples_by_mpan, daily_costs
+
+
+def list_active_meter_points(account_data, now):
+    """Return active electricity meter points with an MPAN, in account order."""
+    meter_points = []
+    seen = set()
     for property_data in account_data.get("properties", []):
         for meter_point in property_data.get("electricity_meter_points", []):
-            if not _has_active_agreement(meter_point, now):
+            mpan = meter_point.get("mpan")
+            if not mpan or mpan in seen or not _has_active_agreement(meter_point, now):
                 continue
+            seen.add(mpan)
+            meter_points.append(meter_point)
+    return meter_points
 
-            mpan = meter_point.get("mpan")
-            best_samples = []
-            for meter in meter_point.get("meters", []):
-                serial_number = meter.get("serial_number")
-                if not mpan or not serial_number:
-                    continue
-
-                query = {
-                    "period_from": period_from_text,
-                    "period_to": period_to_text,
-                    "order_by": "period",
-                    "page_size": 500 if group_by else 250,
-                }
-                if group_by:
-                    query["group_by"] = group_by
-
-                url = (
-                    f"https://api.octopus.energy/v1/electricity-meter-points/{quote(str(mpan), safe='')}"
-                    f"/meters/{quote(str(serial_number), safe='')}/consumption/?"
-                    + urlencode(query)
-                )
 
-                try:
-                    samples = fetch_all_consumption_pages(url)
-                except OctopusApiError as e:
-                    logger.debug("Usage fetch failed for a meter: %s", type(e).__name__)
-                    continue
+def get_export_mpans(account_data):
+    return frozenset(
+        meter_point.get("mpan")
+        for property_data in account_data.get("properties", [])
+        for meter_point in property_data.get("electricity_meter_points", [])
+        if meter_point.get("mpan") and meter_point.get("is_export")
+    )
+
 
-                if samples and len(samples) > len(best_samples):
-                    best_samples = samples
+def _fetch_usage_samples(account_data, period_from, now, group_by=None):
+    for property_data in account_data.get("properties", []):
+        for meter_point in property_data.get("electricity_meter_points", []):
+            if not _has_active_agreement(meter_point, now):
+                continue
 
+            best_samples = _fetch_meter_point_samples(meter_point, period_from, now, group_by)
             if best_samples:
                 return best_samples
 
     return []
 
 
+def _fetch_meter_point_samples(meter_point, period_from, now, group_by=None):
+    best_samples = []
+    for url in _build_meter_consumption_urls(meter_point, period_from, now, group_by):
+        try:
+            samples = fetch_all_consumption_pages(url)
+        except OctopusApiError as e:
+            logger.debug("Usage fetch failed for a meter: %s", type(e).__name__)
+            continue
+
+        if samples and len(samples) > len(best_samples):
+            best_samples = samples
+
+    return best_samples
+
+
+def _build_meter_consumption_urls(meter_point, period_from, now, group_by=None):
+    period_from_text = _format_octopus_datetime(period_from)
+    period_to_text = _format_octopus_datetime(now)
+    mpan = meter_point.get("mpan")
+    urls = []
+    for meter in meter_point.get("meters", []):
+        serial_number = meter.get("serial_number")
+        if not mpan or not serial_number:
+            continue
+
+        query = {
+            "period_from": period_from_text,
+            "period_to": period_to_text,
+            "order_by": "period",
+            "page_size": 500 if group_by else 250,
+        }
+        if group_by:
+            query["group_by"] = group_by
+
+        urls.append(
+            f"https://api.octopus.energy/v1/electricity-meter-points/{quote(str(mpan), safe='')}"
+            f"/meters/{quote(str(serial_number), safe='')}/consumption/?"
+            + urlencode(query)
+        )
+    return urls
+
+
+def _fetch_meter_point_samples_with_costs(meter_point, period_from, now, rate_cache=None):
+    """Stream one meter point's consumption pages into daily costs while its rates download.
+
+    Returns ``(samples, daily_costs)``, with ``daily_costs`` set to ``None``
+    when the rates could not be fetched.
+    """
+    tariff_periods = build_tariff_periods(_meter_point_account_data(meter_point), period_from, now)
+    rate_entries = {}
+    for tariff_code in sorted({period["tariff_code"] for period in tariff_periods}):
+        if rate_cache is None:
+            rate_entries[tariff_code] = new_rate_cache_entry()
+        else:
+            rate_entries[tariff_code] = rate_cache[tariff_code] = compatible_rate_cache_entry(
+                rate_cache.get(tariff_code)
+            )
+    accumulator = DailyCostAccumulator(tariff_periods, rate_entries)
+    for tariff_code in rate_entries:
+        accumulator.mark_cached_rates_ready(tariff_code)
+
+    rates_failed = False
+
+    def collect_rates(future):
+        nonlocal rates_failed
+        tariff_code, span_start, span_end = rate_futures.pop(future)
+        if rates_failed:
+            return
+        try:
+            unit_rates, standing_charges = future.result()
+        except OctopusApiError as exc:
+            logger.debug("Historical usage cost refresh failed: %s", type(exc).__name__)
+            rates_failed = True
+            return
+        except requests.exceptions.RequestException as exc:
+            logger.debug("Historical usage cost network error: %s", type(exc).__name__)
+            rates_failed = True
+            return
+        except Exception as exc:  # ruff: ignore[BLE001] Optional cost enrichment must not fail the refresh.
+            logger.debug("Unexpected historical usage cost error: %s", type(exc).__name__)
+            rates_failed = True
+            return
+        store_rate_records(rate_entries[tariff_code], unit_rates, standing_charges, span_start, span_end, now)
+        accumulator.mark_rates_ready(tariff_code, span_start, span_end)
+
+    samples = []
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_RATE_SPANS) as executor:
+        rate_futures = {}
+        for tariff_code, entry in rate_entries.items():
+            product_code = extract_product_code(tariff_code)
+            for span_start, span_end in get_uncached_day_spans(entry, period_from, now):
+                future = executor.submit(_fetch_historical_rate_records, product_code, tariff_code, span_start, span_end)
+                rate_futures[future] = (tariff_code, span_start, span_end)
+
+        urls = _build_meter_consumption_urls(meter_point, period_from, now)
+        if len(urls) == 1:
+            try:
+                for page in iter_consumption_pages(urls[0]):
+                    samples.extend(page)
+                    accumulator.add_samples(page)
+                    for future in [future for future in rate_futures if future.done()]:
+                        collect_rates(future)
+            except OctopusApiError as e:
+                logger.debug("Usage fetch failed for a meter: %s", type(e).__name__)
+                samples = []
+        else:
+            # Several meters share the MPAN and only the fullest series is kept,
+            # so there is nothing safe to cost until every meter has been read.
+            samples = _fetch_meter_point_samples(meter_point, period_from, now)
+            accumulator.add_samples(samples)
+        accumulator.finish_samples()
+
+        for future in as_completed(list(rate_futures)):
+            collect_rates(future)
+
+    for entry in rate_entries.values():
+        prune_rate_cache_entry(entry, now)
+    if rates_failed or not samples:
+        return samples, None
+    return samples, accumulator.daily_costs
+
+
+def _meter_point_account_data(meter_point):
+    # Only this meter point's agreements apply, so an export tariff is never
+    # matched against import consumption.
+    return {"properties": [{"electricity_meter_points": [meter_point]}]}
+
+
 def get_usage_refresh_start(cached_data, now=None):
     """Return the bounded start time for a full or incremental usage refresh."""
     now = now or datetime.now(timezone.utc)
-    history_start = now - timedelta(days=USAGE_HISTORY_DAYS)
     cached_data = _compatible_usage_cache(cached_data)
     if not cached_data:
-        return history_start
+        return now - timedelta(days=USAGE_HISTORY_DAYS)
+    return _get_sample_series_refresh_start(cached_data.get("samples", []), now)
+
+
+def get_meter_point_refresh_starts(cached_data, mpans, now=None):
+    """Return an incremental refresh start for each MPAN from its own cached series."""
+    now = now or datetime.now(timezone.utc)
+    cached_data = _compatible_usage_cache(cached_data)
+    series_by_mpan = _cached_meter_point_series(cached_data) if cached_data else {}
+    if cached_data and not cached_data.get("primary_mpan") and mpans:
+        # Older caches hold one unlabelled series from the first active meter point.
+        series_by_mpan.setdefault(mpans[0], cached_data.get("samples", []))
+    return {
+        mpan: _get_sample_series_refresh_start(series_by_mpan.get(mpan, []), now)
+        for mpan in mpans
+    }
+
 
+def choose_primary_mpan(cached_data, mpans, export_mpans=frozenset()):
+    """Keep the cached primary meter while it is among ``mpans``, else take the first import meter.
+
+    ``mpans`` are in account order: the active meter points when choosing
+    which one to cost during a fetch, or those that returned samples when
+    choosing the primary afterwards.
+    """
+    mpans = list(mpans)
+    cached_primary = (cached_data or {}).get("primary_mpan")
+    if cached_primary in mpans:
+        return cached_primary
+    return next((mpan for mpan in mpans if mpan not in export_mpans), None)
+
+
+def _get_sample_series_refresh_start(samples, now):
+    history_start = now - timedelta(days=USAGE_HISTORY_DAYS)
     cached_sample_starts = [
         sample_start
-        for sample in cached_data.get("samples", [])
+        for sample in samples
         if (sample_start := _parse_sample_start(sample)) is not None
     ]
     latest_sample_start = max(cached_sample_starts, default=None)
@@ -127,6 +448,19 @@ def get_usage_refresh_start(cached_data, now=None):
     return max(history_start, overlap_start)
 
 
+def _cached_meter_point_series(cached_data):
+    series_by_mpan = {}
+    meter_points = cached_data.get("meter_points")
+    if isinstance(meter_points, dict):
+        for mpan, meter_point in meter_points.items():
+            if isinstance(meter_point, dict) and isinstance(meter_point.get("samples"), list):
+                series_by_mpan[mpan] = meter_point["samples"]
+    primary_mpan = cached_data.get("primary_mpan")
+    if primary_mpan:
+        series_by_mpan[primary_mpan] = cached_data.get("samples", [])
+    return series_by_mpan
+
+
 def get_usage_archive_refresh_start(cached_data, now=None):
     """Return a bounded start for a compact, local-day seasonal refresh."""
     now = now or datetime.now(timezone.utc)
@@ -155,21 +489,49 @@ def merge_usage_history(
     fresh_daily_costs,
     now=None,
     fresh_daily_archive=None,
+    fresh_meter_point_samples=None,
+    primary_mpan=None,
+    export_mpans=frozenset(),
 ):
-    """Merge refreshed overlap data into a bounded, current usage cache payload."""
+    """Merge refreshed overlap data into a bounded, current usage cache payload.
+
+    When ``primary_mpan`` is given, ``fresh_samples`` belong to that meter point
+    and any other series in ``fresh_meter_point_samples`` are kept separately
+    under ``meter_points``, keyed by MPAN.  If the primary meter point changes,
+    the cached costs, rollups and archive of the old one are dropped rather
+    than merged with the new meter point's data.
+    """
     now = now or datetime.now(timezone.utc)
     history_start = now - timedelta(days=USAGE_HISTORY_DAYS)
     cached_data = _compatible_usage_cache(cached_data) or {}
+    cached_series = _cached_meter_point_series(cached_data)
+    cached_samples = cached_data.get("samples", [])
+    cached_usage_cube = cached_data.get("usage_cube")
+    if primary_mpan and cached_data.get("primary_mpan") not in (None, primary_mpan):
+        cached_data = {**cached_data, "daily_costs": [], "daily_usage_archive": [], "hourly_usage": []}
+        cached_samples = cached_series.get(primary_mpan, [])
+        cached_usage_cube = None
 
     samples_by_start = {}
-    for sample in cached_data.get("samples", []):
+    for sample in [*cached_samples, *fresh_samples]:
         sample_start = _parse_sample_start(sample)
-        if sample_start is not None and sample_start >= history_start:
-            samples_by_start[sample_start] = sample
-    for sample in fresh_samples:
-        sample_start = _parse_sample_start(sample)
-        if sample_start is not None and sample_start >= history_start:
-            samples_by_start[sample_start] = sample
+        if sample_start is None:
+            continue
+        # A slot's unit rate does not depend on its reading, so keep the
+        # cached rate when the fresh sample was not costed this refresh.
+        previous = samples_by_start.get(sample_start)
+        if previous and SAMPLE_UNIT_RATE_KEY in previous and SAMPLE_UNIT_RATE_KEY not in sample:
+            sample = {**sample, SAMPLE_UNIT_RATE_KEY: previous[SAMPLE_UNIT_RATE_KEY]}
+        samples_by_start[sample_start] = sample
+
+    # Downsample everything still held at half-hour resolution before the
+    # oldest samples age out, so the hourly tier outlives the detailed one.
+    fresh_hourly_usage = build_hourly_usage_rollups(samples_by_start.values())
+    samples_by_start = {
+        sample_start: sample
+        for sample_start, sample in samples_by_start.items()
+        if sample_start >= history_start
+    }
 
     merged_samples = [samples_by_start[sample_start] for sample_start in sorted(samples_by_start)]
     retained_dates = {
@@ -188,7 +550,7 @@ def merge_usage_history(
             if day_key in retained_dates:
                 daily_costs_by_date[day_key] = day
 
-    return {
+    payload = {
         "samples": merged_samples,
         "daily_costs": [daily_costs_by_date[day] for day in sorted(daily_costs_by_date)],
         "daily_usage_archive": merge_daily_usage_archive(
@@ -196,25 +558,102 @@ def merge_usage_history(
             fresh_daily_archive if fresh_daily_archive is not None else build_daily_usage_archive(fresh_samples),
             now,
         ),
+        "hourly_usage": merge_hourly_usage_rollups(
+            cached_data.get("hourly_usage", []),
+            fresh_hourly_usage,
+            now,
+        ),
+        "usage_cube": merge_usage_cube(
+            cached_usage_cube,
+            merged_samples,
+            _get_changed_usage_days(fresh_samples, history_start),
+        ),
         "cache_version": USAGE_CACHE_VERSION,
         "price_band_version": PRICE_BAND_VERSION,
         "synced_at": now.isoformat(),
     }
+    primary_mpan = primary_mpan or cached_data.get("primary_mpan")
+    if primary_mpan:
+        payload["primary_mpan"] = primary_mpan
+        payload["meter_points"] = _merge_meter_point_series(
+            cached_series,
+            fresh_meter_point_samples or {},
+            primary_mpan,
+            export_mpans,
+            history_start,
+        )
+    return payload
+
+
+def _merge_meter_point_series(cached_series, fresh_series, primary_mpan, export_mpans, history_start):
+    meter_points = {}
+    for mpan in sorted({*cached_series, *fresh_series} - {primary_mpan}):
+        samples = _merge_sample_series([*cached_series.get(mpan, []), *fresh_series.get(mpan, [])], history_start)
+        if samples:
+            meter_points[mpan] = {
+                "is_export": mpan in export_mpans,
+                "samples": samples,
+            }
+    return meter_points
+
+
+def _merge_sample_series(samples, history_start):
+    """Return ``samples`` from ``history_start`` in time order, later readings replacing earlier ones."""
+    samples_by_start = {}
+    for sample in samples:
+        sample_start = _parse_sample_start(sample)
+        if sample_start is not None and sample_start >= history_start:
+            samples_by_start[sample_start] = sample
+    return [samples_by_start[sample_start] for sample_start in sorted(samples_by_start)]
+
+
+def reband_usage_cache(cached_data):
+    """Return the cache with price band columns rebuilt for the current band version.
+
+    The per-sample unit rates make this a local pass, so a band threshold change
+    does not need a full usage and rate download.  Returns ``None`` when the
+    cache cannot be rebanded.
+    """
+    if not _has_current_usage_cache_schema(cached_data):
+        return None
+    daily_costs = reband_daily_costs(cached_data["daily_costs"], cached_data["samples"])
+    if daily_costs is None:
+        return None
+    return {**cached_data, "daily_costs": daily_costs, "price_band_version": PRICE_BAND_VERSION}
 
 
 def _compatible_usage_cache(cached_data):
-    if (
-        not cached_data
-        or cached_data.get("cache_version") != USAGE_CACHE_VERSION
-        or cached_data.get("price_band_version") != PRICE_BAND_VERSION
-        or not isinstance(cached_data.get("samples"), list)
-        or not isinstance(cached_data.get("daily_costs"), list)
-        or not isinstance(cached_data.get("daily_usage_archive"), list)
-    ):
+    if not _has_current_usage_cache_schema(cached_data):
         return None
+    if cached_data.get("price_band_version") != PRICE_BAND_VERSION:
+        return reband_usage_cache(cached_data)
     return cached_data
 
 
+def _has_current_usage_cache_schema(cached_data):
+    return bool(
+        cached_data
+        and cached_data.get("cache_version") == USAGE_CACHE_VERSION
+        and isinstance(cached_data.get("samples"), list)
+        and isinstance(cached_data.get("daily_costs"), list)
+        and isinstance(cached_data.get("daily_usage_archive"), list)
+    )
+
+
+def _get_changed_usage_days(fresh_samples, history_start):
+    """Return the GB days whose cube cells a merge may have changed.
+
+    That is every refreshed day plus the day cut through by the retention
+    window, which loses its oldest samples.
+    """
+    changed_days = {history_start.astimezone(UK_TIMEZONE).date().isoformat()}
+    for sample in fresh_samples:
+        sample_start = _parse_sample_start(sample)
+        if sample_start is not None:
+            changed_days.add(sample_start.astimezone(UK_TIMEZONE).date().isoformat())
+    return changed_days
+
+
 def _parse_sample_start(sample):
     value = sample.get("interval_start")
     if not value:
@@ -229,7 +668,11 @@ def _parse_sample_start(sample):
 
 
 def fetch_all_consumption_pages(initial_url):
-    samples = []
+    return [sample for page in iter_consumption_pages(initial_url) for sample in page]
+
+
+def iter_consumption_pages(initial_url):
+    """Yield each page of consumption results as soon as it has been downloaded."""
     next_url = initial_url
     max_pages = 40
     pages_fetched = 0
@@ -244,42 +687,119 @@ def fetch_all_consumption_pages(initial_url):
             page_results = data.get("results", [])
             if not isinstance(page_results, list):
                 raise OctopusApiError("The API returned invalid consumption data.")
-            if page_results:
-                samples.extend(page_results)
 
             next_url = data.get("next")
             pages_fetched += 1
+            if page_results:
+                yield page_results
 
     if next_url:
         raise OctopusApiError("The API returned too many consumption pages.")
-    return samples
 
 
-def build_historical_usage_costs(account_data, usage_samples):
+def build_historical_usage_costs(account_data, usage_samples, rate_cache=None, now=None):
+    """Cost usage samples against the account's historical tariff records.
+
+    ``rate_cache`` optionally maps tariff codes to historical rate cache
+    entries; finished GB days are read from it and newly fetched days are
+    written back in place so the caller can persist them.
+    """
     period_start, period_end = get_usage_period(usage_samples)
     if not period_start or not period_end:
         return []
 
+    now = now or datetime.now(timezone.utc)
     tariff_periods = build_tariff_periods(account_data, period_start, period_end)
     rates_by_tariff = {}
     standing_charges_by_tariff = {}
     for tariff_code in {period["tariff_code"] for period in tariff_periods}:
-        product_code = extract_product_code(tariff_code)
-        rates_by_tariff[tariff_code] = fetch_historical_unit_rates(
-            product_code,
+        rates_by_tariff[tariff_code], standing_charges_by_tariff[tariff_code] = _load_historical_rate_records(
             tariff_code,
             period_start,
             period_end,
+            rate_cache,
+            now,
         )
-        standing_charges_by_tariff[tariff_code] = fetch_historical_tariff_records(
-            product_code,
+
+    return build_daily_costs(
+        usage_samples,
+        tariff_periods,
+        rates_by_tariff,
+        standing_charges_by_tariff,
+        annotate_samples=True,
+    )
+
+
+def compare_historical_tariff_costs(usage_samples, tariff_codes, rate_cache=None, now=None):
+    """Cost usage samples against each of ``tariff_codes`` as if it had applied throughout.
+
+    Any mix of Agile, Go, Intelligent Go, Flexible or fixed tariff codes can
+    be compared.  ``rate_cache`` is used and updated as in
+    ``build_historical_usage_costs``.
+    """
+    period_start, period_end = get_usage_period(usage_samples)
+    if not period_start or not period_end:
+        return {}
+
+    now = now or datetime.now(timezone.utc)
+    rates_by_tariff = {}
+    standing_charges_by_tariff = {}
+    for tariff_code in dict.fromkeys(tariff_codes):
+        rates_by_tariff[tariff_code], standing_charges_by_tariff[tariff_code] = _load_historical_rate_records(
             tariff_code,
-            "standing-charges",
             period_start,
             period_end,
+            rate_cache,
+            now,
         )
 
-    return build_daily_costs(usage_samples, tariff_periods, rates_by_tariff, standing_charges_by_tariff)
+    return compare_tariff_costs(usage_samples, rates_by_tariff, standing_charges_by_tariff)
+
+
+def get_account_tariff_codes(account_data):
+    return sorted({
+        agreement.get("tariff_code")
+        for property_data in account_data.get("properties", [])
+        for meter_point in property_data.get("electricity_meter_points", [])
+        for agreement in meter_point.get("agreements", [])
+        if agreement.get("tariff_code")
+    })
+
+
+def _load_historical_rate_records(tariff_code, period_start, period_end, rate_cache, now):
+    product_code = extract_product_code(tariff_code)
+    if rate_cache is None:
+        return _fetch_historical_rate_records(product_code, tariff_code, period_start, period_end)
+
+    rate_cache[tariff_code] = compatible_rate_cache_entry(rate_cache.get(tariff_code))
+    return _get_cached_historical_rate_records(
+        product_code,
+        tariff_code,
+        rate_cache[tariff_code],
+        period_start,
+        period_end,
+        now,
+    )
+
+
+def _get_cached_historical_rate_records(product_code, tariff_code, cache_entry, period_start, period_end, now):
+    for span_start, span_end in get_uncached_day_spans(cache_entry, period_start, period_end):
+        unit_rates, standing_charges = _fetch_historical_rate_records(product_code, tariff_code, span_start, span_end)
+        store_rate_records(cache_entry, unit_rates, standing_charges, span_start, span_end, now)
+    prune_rate_cache_entry(cache_entry, now)
+    return get_cached_rate_records(cache_entry, period_start, period_end)
+
+
+def _fetch_historical_rate_records(product_code, tariff_code, period_start, period_end):
+    unit_rates = fetch_historical_unit_rates(product_code, tariff_code, period_start, period_end)
+    standing_charges = fetch_historical_tariff_records(
+        product_code,
+        tariff_code,
+        "standing-charges",
+        period_start,
+        period_end,
+    )
+    return unit_rates, standing_charges
 
 
 def fetch_historical_unit_rates(product_code, tariff_code, period_start, period_end):
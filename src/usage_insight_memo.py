@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Sequence
+
+USAGE_INSIGHT_MEMO_VERSION = 1
+MAX_USAGE_INSIGHT_MEMO_ENTRIES = 4
+
+
+def build_usage_insight_memo_cache_key(account_number: str) -> str:
+    return f"octopus_usage_insights_{account_number}"
+
+
+class ContentHashCache:
+    """Content digests of named series, recomputed only when a series is replaced.
+
+    Cached payloads are replaced rather than edited in place, so a series that
+    is still the same list object with the same length keeps its digest.  A
+    replaced series is hashed in full, so an edit anywhere in it is seen.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def digest(self, name, series):
+        entry = self._entries.get(name)
+        if entry and entry[0] is series and entry[1] == _series_length(series):
+            return entry[2]
+        digest = hash_content(series)
+        self._entries[name] = (series, _series_length(series), digest)
+        return digest
+
+
+def hash_content(value) -> str:
+    """Return a stable digest of JSON-compatible data, hashing one record at a time."""
+    hasher = hashlib.blake2b(digest_size=16)
+    if _is_record_series(value):
+        for record in value:
+            hasher.update(_encode(record))
+            hasher.update(b"\n")
+    else:
+        hasher.update(_encode(value))
+    return hasher.hexdigest()
+
+
+def combine_content_hashes(*digests) -> str:
+    return hash_content([*digests])
+
+
+def compatible_usage_insight_memo(memo) -> dict:
+    if (
+        not isinstance(memo, dict)
+        or memo.get("memo_version") != USAGE_INSIGHT_MEMO_VERSION
+        or not isinstance(memo.get("entries"), dict)
+    ):
+        return {"memo_version": USAGE_INSIGHT_MEMO_VERSION, "entries": {}}
+    return memo
+
+
+def get_memoized_usage_insight(memo, content_hash):
+    insight = compatible_usage_insight_memo(memo)["entries"].get(content_hash)
+    return insight if isinstance(insight, dict) else None
+
+
+def store_memoized_usage_insight(memo, content_hash, insight) -> dict:
+    """Return a memo holding ``insight``, keeping only the most recently stored entries."""
+    entries = dict(compatible_usage_insight_memo(memo)["entries"])
+    entries.pop(content_hash, None)
+    entries[content_hash] = insight
+    return {
+        "memo_version": USAGE_INSIGHT_MEMO_VERSION,
+        "entries": dict(list(entries.items())[-MAX_USAGE_INSIGHT_MEMO_ENTRIES:]),
+    }
+
+
+def _encode(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _is_record_series(value):
+    return isinstance(value, Sequence) and not isinstance(value, (str, bytes))
+
+
+def _series_length(series):
+    return len(series) if _is_record_series(series) or isinstance(series, dict) else None
@@ -5,18 +5,21 @@ from datetime import datetime, timedelta, timezone
 from .price_bands import (
     HIGH_PRICE_THRESHOLD_GBP,
     LOW_PRICE_THRESHOLD_GBP,
+    PRICE_BAND_HIGH,
+    PRICE_BAND_LOW,
+    PRICE_BAND_NEGATIVE,
     PRICE_BAND_VERSION,
     format_price_threshold,
 )
-from .uk_time import (
-    UK_TIMEZONE,
-    expected_half_hours_for_local_day,
-    is_complete_usage_day,
-    latest_complete_local_day,
-)
+from .rolling_stats import RollingMedian, rolling_mean
+from .uk_time import is_complete_usage_day, latest_complete_local_day
+from .usage_cube import UNPRICED_BAND, UsageCube, build_usage_cube
+from .usage_retention import build_hourly_usage_profile
 from .usage_seasonality import build_seasonal_usage_insight
 
 RECENT_SUMMARY_DAYS = 30
+PEAK_HISTORY_DAYS = 365
+BASELINE_DAYS = 30
 
 USAGE_BANDS = (
     ("Overnight", 0, 6),
@@ -28,24 +31,19 @@ USAGE_BANDS = (
 
 
 def build_usage_insight_data(samples: list[dict], synced_at: str | None):
-    return _build_usage_insight_data(_parse_samples(samples), synced_at)
+    return _build_usage_insight_data(build_usage_cube(samples), synced_at)
 
 
-def _build_usage_insight_data(parsed_samples, synced_at):
-    if not parsed_samples:
+def _build_usage_insight_data(cube, synced_at):
+    if not cube.days:
         return _empty("No usage samples available yet.")
 
-    daily_totals = {}
-    daily_sample_counts = {}
-    for sample in parsed_samples:
-        day_key = sample["day_key"]
-        daily_totals[day_key] = daily_totals.get(day_key, 0.0) + sample["consumption"]
-        daily_sample_counts[day_key] = daily_sample_counts.get(day_key, 0) + 1
-
+    daily_totals = cube.daily_totals()
     if len(daily_totals) < 7:
         return _empty("Not enough usage data yet (need at least seven days).")
 
-    sorted_days = sorted(daily_totals.items(), key=lambda x: x[0])
+    sorted_days = [(day_key, kwh) for day_key, kwh, _count in daily_totals]
+    daily_sample_counts = {day_key: count for day_key, _kwh, count in daily_totals}
     day_keys = [day for day, _ in sorted_days]
     values = [value for _day, value in sorted_days]
     complete_days = _get_complete_days(sorted_days, daily_sample_counts, synced_at)
@@ -106,34 +104,46 @@ def _empty(summary: str):
 
 
 def build_rolling_average(values: list[float], window_size: int = 7) -> list[float]:
-    if window_size <= 0:
-        raise ValueError("window_size must be positive")
-
-    rolling = []
-    for index, _value in enumerate(values):
-        window = values[max(0, index - window_size + 1):index + 1]
-        rolling.append(sum(window) / len(window))
-    return rolling
-
-
-def build_usage_pattern_insights(samples: list[dict], daily_costs: list[dict] | None = None):
-    parsed_samples = _parse_samples(samples)
-    return _build_usage_pattern_insights(parsed_samples, daily_costs)
-
-
-def build_usage_dashboard_data(samples, synced_at, daily_costs=None, daily_archive=None):
-    """Build all Usage workspace presentation data from one normalized sample pass."""
-    parsed_samples = _parse_samples(samples)
-    insight = _build_usage_insight_data(parsed_samples, synced_at)
-    insight.update(_build_usage_pattern_insights(parsed_samples, daily_costs))
+    return rolling_mean(values, window_size)
+
+
+def build_usage_pattern_insights(
+    samples: list[dict],
+    daily_costs: list[dict] | None = None,
+    hourly_usage: list[dict] | None = None,
+    usage_cube: dict | None = None,
+):
+    return _build_usage_pattern_insights(_get_usage_cube(samples, usage_cube), daily_costs, hourly_usage)
+
+
+def build_usage_dashboard_data(
+    samples,
+    synced_at,
+    daily_costs=None,
+    daily_archive=None,
+    hourly_usage=None,
+    usage_cube=None,
+):
+    """Build all Usage workspace presentation data as queries over one usage cube.
+
+    The cached cube is used when it matches the current price bands; otherwise
+    it is rebuilt from the samples in a single pass.
+    """
+    cube = _get_usage_cube(samples, usage_cube)
+    insight = _build_usage_insight_data(cube, synced_at)
+    insight.update(_build_usage_pattern_insights(cube, daily_costs, hourly_usage))
     insight["seasonal"] = build_seasonal_usage_insight(daily_archive or [], synced_at)
     return insight
 
 
-def _build_usage_pattern_insights(parsed_samples, daily_costs=None):
-    baseline = _build_always_on_baseline(parsed_samples)
-    peak = _build_peak_usage_pattern(parsed_samples)
-    rate_capture = _build_rate_capture(daily_costs or [])
+def _get_usage_cube(samples, usage_cube=None):
+    return UsageCube.from_payload(usage_cube) or build_usage_cube(samples)
+
+
+def _build_usage_pattern_insights(cube, daily_costs=None, hourly_usage=None):
+    baseline = _build_always_on_baseline(cube)
+    peak = _build_peak_usage_pattern(cube, hourly_usage)
+    rate_capture = _build_rate_capture(daily_costs or [], cube)
     return {
         "baseline_text": baseline["text"],
         "baseline_detail": baseline["detail"],
@@ -146,19 +156,19 @@ def _build_usage_pattern_insights(parsed_samples, daily_costs=None):
     }
 
 
-def _build_always_on_baseline(parsed_samples):
-    daily_slots = _daily_complete_slots(parsed_samples)
-    if len(daily_slots) < 7:
+def _build_always_on_baseline(cube):
+    complete_days = _get_complete_cube_days(cube)
+    if len(complete_days) < 7:
         return _insight_empty("Needs seven complete days of usage data.")
 
-    daily_minimums = [
-        min(slot["consumption"] for slot in slots)
-        for _day, slots in daily_slots[-30:]
-    ]
+    daily_minimums = [cube.day_minimum(day_key) for day_key in complete_days[-BASELINE_DAYS:]]
     if not daily_minimums:
         return _insight_empty("Needs complete half-hour usage data.")
 
-    typical_half_hour_kwh = _median(daily_minimums)
+    baseline_window = RollingMedian(BASELINE_DAYS)
+    for minimum_kwh in daily_minimums:
+        baseline_window.push(minimum_kwh)
+    typical_half_hour_kwh = baseline_window.median()
     watts = round(typical_half_hour_kwh * 2 * 1000)
     daily_kwh = typical_half_hour_kwh * 48
     return {
@@ -167,20 +177,20 @@ def _build_always_on_baseline(parsed_samples):
     }
 
 
-def _build_peak_usage_pattern(parsed_samples):
-    if not parsed_samples:
+def _build_peak_usage_pattern(cube, hourly_usage=None):
+    if not cube.days:
         return _insight_empty("Needs usage samples.")
 
     band_totals = {name: 0.0 for name, _start, _end in USAGE_BANDS}
-    slot_totals = {}
-    total_kwh = 0.0
-    for sample in parsed_samples:
-        local_start = sample["local_start"]
-        consumption = sample["consumption"]
-        total_kwh += consumption
-        band_totals[_band_for_hour(local_start.hour)] += consumption
-        slot_key = sample["slot_key"]
-        slot_totals[slot_key] = slot_totals.get(slot_key, 0.0) + consumption
+    slot_totals = cube.slot_totals()
+    for slot_key, kwh in slot_totals.items():
+        band_totals[_band_for_hour(int(slot_key[:2]))] += kwh
+    total_kwh = sum(slot_totals.values())
+
+    history_band_totals = _build_hourly_band_totals(hourly_usage, len(cube.days))
+    if history_band_totals is not None:
+        band_totals = history_band_totals
+        total_kwh = sum(band_totals.values())
 
     if total_kwh <= 0:
         return _insight_empty("Needs non-zero usage samples.")
@@ -195,13 +205,35 @@ def _build_peak_usage_pattern(parsed_samples):
     }
 
 
-def _build_rate_capture(daily_costs: list[dict]):
-    complete_days = [
-        day for day in daily_costs
-        if is_complete_usage_day(day.get("date"), day.get("sample_count", 0))
-        and day.get("missing_rate_count", 0) == 0
-    ]
-    matched_kwh = sum(float(day.get("matched_kwh", day.get("kwh", 0.0)) or 0.0) for day in complete_days)
+def _build_hourly_band_totals(hourly_usage, sample_day_count):
+    """Return usage-band totals from the hourly tier when it reaches further back."""
+    if not hourly_usage:
+        return None
+
+    latest_day = max((record.get("date") or "" for record in hourly_usage), default="")
+    try:
+        end = datetime.fromisoformat(latest_day).date()
+    except ValueError:
+        return None
+    hour_totals, day_count = build_hourly_usage_profile(
+        hourly_usage,
+        start=end - timedelta(days=PEAK_HISTORY_DAYS - 1),
+        end=end,
+    )
+    if day_count <= sample_day_count:
+        return None
+
+    band_totals = {name: 0.0 for name, _start, _end in USAGE_BANDS}
+    for hour, kwh in enumerate(hour_totals):
+        band_totals[_band_for_hour(hour)] += kwh
+    return band_totals
+
+
+def _build_rate_capture(daily_costs: list[dict], cube=None):
+    totals = _get_cube_rate_totals(cube) if cube is not None else None
+    if totals is None:
+        totals = _get_daily_cost_rate_totals(daily_costs)
+    matched_kwh = totals["matched_kwh"]
     if matched_kwh <= 0:
         empty = _insight_empty("Needs matched historical rates.")
         return {
@@ -211,21 +243,11 @@ def _build_rate_capture(daily_costs: list[dict]):
             "average_unit_detail": empty["detail"],
         }
 
-    has_price_band_data = all(
-        day.get("price_band_version") == PRICE_BAND_VERSION
-        and "matched_kwh" in day
-        and "cheap_kwh" in day
-        and "high_kwh" in day
-        and "negative_kwh" in day
-        for day in complete_days
-    )
-    cheap_kwh = sum(float(day.get("cheap_kwh", 0.0) or 0.0) for day in complete_days)
-    negative_kwh = sum(float(day.get("negative_kwh", 0.0) or 0.0) for day in complete_days)
-    high_kwh = sum(float(day.get("high_kwh", 0.0) or 0.0) for day in complete_days)
-    energy_cost = sum(float(day.get("energy_cost_gbp", 0.0) or 0.0) for day in complete_days)
-
-    average_unit_pence = (energy_cost / matched_kwh) * 100
-    if not has_price_band_data:
+    cheap_kwh = totals["cheap_kwh"]
+    negative_kwh = totals["negative_kwh"]
+    high_kwh = totals["high_kwh"]
+    average_unit_pence = (totals["energy_cost_gbp"] / matched_kwh) * 100
+    if not totals["has_price_band_data"]:
         return {
             "cheap_rate_text": "—",
             "cheap_rate_detail": "Refresh usage history to classify cheap-rate usage.",
@@ -255,49 +277,56 @@ def _build_rate_capture(daily_costs: list[dict]):
     }
 
 
-def _daily_complete_slots(parsed_samples):
-    slots_by_day = {}
-    for sample in parsed_samples:
-        slots_by_day.setdefault(sample["day_key"], []).append(sample)
+def _get_cube_rate_totals(cube):
+    """Return rate-capture totals from the cube's costed samples, or ``None`` without any."""
+    priced_days = [
+        day_key
+        for day_key in _get_complete_cube_days(cube)
+        if not any(UNPRICED_BAND in bands for bands in cube.days[day_key].values())
+    ]
+    band_totals = cube.band_totals(priced_days)
+    matched_kwh = sum(total[0] for total in band_totals.values())
+    if matched_kwh <= 0:
+        return None
+
+    def band_kwh(*price_bands):
+        return sum(band_totals.get(price_band, (0.0,))[0] for price_band in price_bands)
+
+    return {
+        "matched_kwh": matched_kwh,
+        "cheap_kwh": band_kwh(PRICE_BAND_NEGATIVE, PRICE_BAND_LOW),
+        "negative_kwh": band_kwh(PRICE_BAND_NEGATIVE),
+        "high_kwh": band_kwh(PRICE_BAND_HIGH),
+        "energy_cost_gbp": sum(total[1] for total in band_totals.values()),
+        "has_price_band_data": True,
+    }
+
 
-    complete = [
-        (day_key, slots)
-        for day_key, slots in sorted(slots_by_day.items())
-        if is_complete_usage_day(day_key, len(slots))
+def _get_daily_cost_rate_totals(daily_costs):
+    complete_days = [
+        day for day in daily_costs
+        if is_complete_usage_day(day.get("date"), day.get("sample_count", 0))
+        and day.get("missing_rate_count", 0) == 0
     ]
-    return complete
-
-
-def _parse_samples(samples: list[dict]):
-    parsed_by_start = {}
-    for sample in samples:
-        interval_start = sample.get("interval_start")
-        consumption = sample.get("consumption")
-        if interval_start is None or consumption is None:
-            continue
-        try:
-            start = datetime.fromisoformat(interval_start.replace("Z", "+00:00"))
-            if start.tzinfo is None:
-                start = start.replace(tzinfo=timezone.utc)
-            local_start = start.astimezone(UK_TIMEZONE)
-            parsed_by_start[start.astimezone(timezone.utc)] = {
-                "start": start,
-                "local_start": local_start,
-                "day_key": local_start.date().isoformat(),
-                "slot_key": f"{local_start.hour:02d}:{local_start.minute:02d}",
-                "consumption": float(consumption),
-            }
-        except (TypeError, ValueError):
-            continue
-    return [parsed_by_start[start] for start in sorted(parsed_by_start)]
-
-
-def _expected_samples_for_day_text(day_text):
-    try:
-        day = datetime.fromisoformat(day_text).date()
-    except (TypeError, ValueError):
-        return 48
-    return expected_half_hours_for_local_day(day)
+    return {
+        "matched_kwh": sum(float(day.get("matched_kwh", day.get("kwh", 0.0)) or 0.0) for day in complete_days),
+        "cheap_kwh": sum(float(day.get("cheap_kwh", 0.0) or 0.0) for day in complete_days),
+        "negative_kwh": sum(float(day.get("negative_kwh", 0.0) or 0.0) for day in complete_days),
+        "high_kwh": sum(float(day.get("high_kwh", 0.0) or 0.0) for day in complete_days),
+        "energy_cost_gbp": sum(float(day.get("energy_cost_gbp", 0.0) or 0.0) for day in complete_days),
+        "has_price_band_data": all(
+            day.get("price_band_version") == PRICE_BAND_VERSION
+            and "matched_kwh" in day
+            and "cheap_kwh" in day
+            and "high_kwh" in day
+            and "negative_kwh" in day
+            for day in complete_days
+        ),
+    }
+
+
+def _get_complete_cube_days(cube):
+    return [day_key for day_key, _kwh, count in cube.daily_totals() if is_complete_usage_day(day_key, count)]
 
 
 def _band_for_hour(hour: int):
@@ -312,14 +341,6 @@ def _format_half_hour_end(start_text: str):
     return (start + timedelta(minutes=30)).strftime("%H:%M")
 
 
-def _median(values):
-    sorted_values = sorted(values)
-    midpoint = len(sorted_values) // 2
-    if len(sorted_values) % 2:
-        return sorted_values[midpoint]
-    return (sorted_values[midpoint - 1] + sorted_values[midpoint]) / 2
-
-
 def _insight_empty(detail: str):
     return {"text": "—", "detail": detail}
 
@@ -344,10 +365,8 @@ def _get_seven_day_trend_pct(complete_values):
     if len(complete_values) < 14:
         return None
 
-    recent_7 = complete_values[-7:]
-    previous_7 = complete_values[-14:-7]
-    recent_avg = sum(recent_7) / len(recent_7)
-    previous_avg = sum(previous_7) / len(previous_7)
+    # The trailing seven-day means ending a week ago and today.
+    previous_avg, recent_avg = rolling_mean(complete_values[-14:], 7)[6::7]
     if previous_avg == 0:
         return 0.0
 
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+from .uk_time import UK_TIMEZONE
+
+# Hourly rollups are kept for two years; insights read back only their own
+# lookback, such as ``usage_insights.PEAK_HISTORY_DAYS``.
+HOURLY_USAGE_DAYS = 2 * 366
+HOURS_PER_DAY = 24
+
+
+def build_hourly_usage_rollups(samples: list[dict]) -> list[dict]:
+    """Downsample half-hourly consumption into one hour-of-day vector per GB day."""
+    rollups = {}
+    for sample in samples:
+        interval_start = sample.get("interval_start")
+        consumption = sample.get("consumption")
+        if interval_start is None or consumption is None:
+            continue
+        try:
+            start = datetime.fromisoformat(interval_start.replace("Z", "+00:00"))
+            if start.tzinfo is None:
+                start = start.replace(tzinfo=timezone.utc)
+            kwh = float(consumption)
+        except (TypeError, ValueError):
+            continue
+
+        local_start = start.astimezone(UK_TIMEZONE)
+        day_key = local_start.date().isoformat()
+        rollup = rollups.setdefault(
+            day_key,
+            {"date": day_key, "hourly_kwh": [0.0] * HOURS_PER_DAY, "sample_count": 0},
+        )
+        # The repeated autumn hour shares a slot, so the vector stays 24 wide.
+        rollup["hourly_kwh"][local_start.hour] += kwh
+        rollup["sample_count"] += 1
+
+    return [rollups[day_key] for day_key in sorted(rollups)]
+
+
+def merge_hourly_usage_rollups(cached_rollups, fresh_rollups, now=None):
+    """Merge hourly rollups, keeping the best-covered version of each retained day."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = now.astimezone(UK_TIMEZONE).date() - timedelta(days=HOURLY_USAGE_DAYS)
+    by_date = {}
+    for record in [*(cached_rollups or []), *(fresh_rollups or [])]:
+        parsed = _parse_rollup(record)
+        if parsed is None or parsed[0] < cutoff:
+            continue
+
+        day, rollup = parsed
+        existing = by_date.get(day)
+        # Half-hourly samples age out part-way through a GB day, so a rollup
+        # rebuilt from what remains must not replace a fuller earlier one.
+        if existing is None or rollup["sample_count"] >= existing["sample_count"]:
+            by_date[day] = rollup
+    return [by_date[day] for day in sorted(by_date)]
+
+
+def build_hourly_usage_profile(hourly_rollups, start=None, end=None):
+    """Return total kWh per hour of day and the day count for an inclusive date range."""
+    totals = [0.0] * HOURS_PER_DAY
+    day_count = 0
+    for record in hourly_rollups or []:
+        parsed = _parse_rollup(record)
+        if parsed is None:
+            continue
+
+        day, rollup = parsed
+        if (start is not None and day < start) or (end is not None and day > end):
+            continue
+        for hour, kwh in enumerate(rollup["hourly_kwh"]):
+            totals[hour] += kwh
+        day_count += 1
+    return totals, day_count
+
+
+def _parse_rollup(record):
+    try:
+        day = date.fromisoformat(record.get("date", ""))
+        hourly_kwh = [float(value) for value in record.get("hourly_kwh")]
+        sample_count = int(record.get("sample_count", 0))
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if len(hourly_kwh) != HOURS_PER_DAY:
+        return None
+    return day, {"date": day.isoformat(), "hourly_kwh": hourly_kwh, "sample_count": sample_count}
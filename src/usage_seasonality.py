@@ -54,28 +54,25 @@ def build_seasonal_usage_insight(daily_archive, synced_at):
     if not by_date:
         return _empty("Seasonal history will appear after usage has been refreshed.")
 
-    monthly = _build_monthly_series(by_date)
-    latest_day = latest_complete or max(by_date)
+    index = DailyUsageIndex(by_date)
+    monthly = _build_monthly_series(index)
+    latest_day = latest_complete or index.last_day
     recent_start = latest_day - timedelta(days=SEASONAL_COMPARISON_DAYS - 1)
     previous_start = _shift_year(recent_start, -1)
     previous_end = _shift_year(latest_day, -1)
-    recent_values = _window_values(by_date, recent_start, latest_day)
-    previous_values = _window_values(by_date, previous_start, previous_end)
+    recent_average, recent_count = index.average(recent_start, latest_day)
+    previous_average, previous_count = index.average(previous_start, previous_end)
 
-    recent_average = _average(recent_values)
-    previous_average = _average(previous_values)
     comparison_pct = None
     if (
-        len(recent_values) >= MIN_COMPARISON_COVERAGE_DAYS
-        and len(previous_values) >= MIN_COMPARISON_COVERAGE_DAYS
+        recent_count >= MIN_COMPARISON_COVERAGE_DAYS
+        and previous_count >= MIN_COMPARISON_COVERAGE_DAYS
         and previous_average
     ):
         comparison_pct = ((recent_average - previous_average) / previous_average) * 100
 
     annual_start = latest_day - timedelta(days=364)
-    annual_values = _window_values(by_date, annual_start, latest_day)
-    annual_average = _average(annual_values)
-    coverage_days = len(annual_values)
+    annual_average, coverage_days = index.average(annual_start, latest_day)
     coverage_text = f"{coverage_days} complete days in the last year"
     if comparison_pct is None:
         comparison_text = "Available after a matching period last year"
@@ -110,29 +107,60 @@ def _parse_archive(daily_archive, latest_complete):
     return by_date
 
 
-def _build_monthly_series(by_date):
-    grouped = {}
-    for day, value in sorted(by_date.items()):
-        grouped.setdefault((day.year, day.month), []).append(value)
+class DailyUsageIndex:
+    """Prefix sums and prefix counts of archived kWh, indexed by day ordinal.
 
-    monthly = []
-    for (year, month), values in grouped.items():
-        expected_days = calendar.monthrange(year, month)[1]
-        monthly.append({
-            "month_start": date(year, month, 1).isoformat(),
-            "average_kwh": sum(values) / len(values),
-            "day_count": len(values),
-            "expected_days": expected_days,
-        })
-    return monthly
+    Any inclusive date range total, average or coverage count is then two
+    subtractions instead of a scan over the whole archive.
+    """
+
+    __slots__ = ("_counts", "_totals", "first_day", "last_day")
+
+    def __init__(self, by_date):
+        self.first_day = min(by_date)
+        self.last_day = max(by_date)
+        size = (self.last_day - self.first_day).days + 1
+        self._totals = [0.0] * (size + 1)
+        self._counts = [0] * (size + 1)
 
+        values = [None] * size
+        for day, value in by_date.items():
+            values[(day - self.first_day).days] = value
+        for offset, value in enumerate(values):
+            self._totals[offset + 1] = self._totals[offset] + (value or 0.0)
+            self._counts[offset + 1] = self._counts[offset] + (value is not None)
 
-def _window_values(by_date, start, end):
-    return [value for day, value in by_date.items() if start <= day <= end]
+    def window(self, start, end):
+        """Return the total kWh and number of archived days in an inclusive date range."""
+        start = max(start, self.first_day)
+        end = min(end, self.last_day)
+        if start > end:
+            return 0.0, 0
+        lower = (start - self.first_day).days
+        upper = (end - self.first_day).days + 1
+        return self._totals[upper] - self._totals[lower], self._counts[upper] - self._counts[lower]
 
+    def average(self, start, end):
+        total, count = self.window(start, end)
+        return (total / count if count else None), count
 
-def _average(values):
-    return sum(values) / len(values) if values else None
+
+def _build_monthly_series(index):
+    monthly = []
+    year, month = index.first_day.year, index.first_day.month
+    while (year, month) <= (index.last_day.year, index.last_day.month):
+        expected_days = calendar.monthrange(year, month)[1]
+        month_start = date(year, month, 1)
+        total, day_count = index.window(month_start, month_start.replace(day=expected_days))
+        if day_count:
+            monthly.append({
+                "month_start": month_start.isoformat(),
+                "average_kwh": total / day_count,
+                "day_count": day_count,
+                "expected_days": expected_days,
+            })
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return monthly
 
 
 def _shift_year(day, offset):
@@ -0,0 +1,148 @@
+import itertools
+import sys
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.appliance_schedule import schedule_appliances
+
+from price_fixtures import AGILE_REGION_A_2025_05_25_PENCE, historical_agile_prices
+
+
+class ApplianceScheduleTests(unittest.TestCase):
+    def setUp(self):
+        self.day_start = datetime(2025, 5, 25, 0, 0, tzinfo=timezone.utc)
+        self.prices = historical_agile_prices(self.day_start, AGILE_REGION_A_2025_05_25_PENCE)
+
+    def _job(self, name, duration_hours, power_kw, earliest_hours=0, deadline_hours=24):
+        return {
+            'name': name,
+            'duration_hours': duration_hours,
+            'power_kw': power_kw,
+            'earliest_start': self.day_start + timedelta(hours=earliest_hours),
+            'deadline': self.day_start + timedelta(hours=deadline_hours),
+        }
+
+    def _brute_force_cost(self, prices, jobs, power_cap_kw):
+        placements = []
+        for job in jobs:
+            slot_count = round(job['duration_hours'] * 2)
+            job_placements = []
+            for first in range(len(prices) - slot_count + 1):
+                window = prices[first:first + slot_count]
+                if window[0]['valid_from'] < job['earliest_start'] or window[-1]['valid_to'] > job['deadline']:
+                    continue
+                if any(left['valid_to'] != right['valid_from'] for left, right in itertools.pairwise(window)):
+                    continue
+                cost = sum(price['price_gbp'] for price in window) * job['power_kw'] * 0.5
+                job_placements.append((cost, range(first, first + slot_count)))
+            placements.append(job_placements)
+
+        best = None
+        for combination in itertools.product(*placements):
+            loads = [0.0] * len(prices)
+            for job, (_cost, slots) in zip(jobs, combination, strict=True):
+                for slot in slots:
+                    loads[slot] += job['power_kw']
+            if max(loads) > power_cap_kw + 1e-9:
+                continue
+            cost = sum(cost for cost, _slots in combination)
+            if best is None or cost < best:
+                best = cost
+        return best
+
+    def test_power_cap_keeps_jobs_from_overlapping(self):
+        jobs = [
+            self._job('dishwasher', 2, 2.0),
+            self._job('washing machine', 1.5, 2.0),
+        ]
+
+        uncapped = schedule_appliances(self.prices, jobs, power_cap_kw=10)
+        capped = schedule_appliances(self.prices, jobs, power_cap_kw=3)
+
+        self.assertLess(uncapped['jobs'][0]['start'], uncapped['jobs'][1]['end'])
+        self.assertLess(uncapped['jobs'][1]['start'], uncapped['jobs'][0]['end'])
+        dishwasher, washer = capped['jobs']
+        self.assertTrue(dishwasher['end'] <= washer['start'] or washer['end'] <= dishwasher['start'])
+        self.assertGreater(capped['total_cost_gbp'], uncapped['total_cost_gbp'])
+        self.assertAlmostEqual(
+            capped['total_cost_gbp'],
+            self._brute_force_cost(self.prices, jobs, 3),
+        )
+        self.assertEqual(dishwasher['name'], 'dishwasher')
+        self.assertAlmostEqual(dishwasher['cost_gbp'], dishwasher['average_price_gbp'] * 2.0 * 2)
+
+    def test_matches_brute_force_with_windows_and_gaps(self):
+        gap_start = self.day_start + timedelta(hours=3)
+        prices = [price for price in self.prices if price['valid_from'] != gap_start]
+        jobs = [
+            self._job('dishwasher', 1.5, 1.5, earliest_hours=0, deadline_hours=8),
+            self._job('washing machine', 1, 2.5, earliest_hours=1, deadline_hours=7),
+            self._job('car', 2.5, 3.0, earliest_hours=0, deadline_hours=9),
+        ]
+
+        for power_cap_kw in (3.0, 4.0, 5.5, 7.0):
+            with self.subTest(power_cap_kw=power_cap_kw):
+                schedule = schedule_appliances(prices, jobs, power_cap_kw)
+                for job in schedule['jobs']:
+                    self.assertNotEqual(job['start'] < gap_start + timedelta(minutes=30), job['end'] > gap_start)
+                self.assertAlmostEqual(schedule['total_cost_gbp'], self._brute_force_cost(prices, jobs, power_cap_kw))
+
+    def test_returns_none_when_no_schedule_fits(self):
+        self.assertIsNone(schedule_appliances(self.prices, [self._job('car', 2, 7.5)], power_cap_kw=7))
+        self.assertIsNone(schedule_appliances(self.prices, [self._job('car', 3, 2, 0, 2)], power_cap_kw=7))
+        self.assertIsNone(schedule_appliances(
+            self.prices,
+            [self._job('dishwasher', 2, 2.0, 0, 3), self._job('washing machine', 2, 2.0, 0, 3)],
+            power_cap_kw=3,
+        ))
+
+    def test_infeasible_identical_jobs_are_rejected_quickly(self):
+        started = time.perf_counter()
+        # Two 2 kW jobs cannot share a 3 kW cap, and seven 4-hour runs do not fit in a day.
+        self.assertIsNone(schedule_appliances(self.prices, [self._job('heater', 4, 2.0)] * 7, power_cap_kw=3))
+        # Five 5-hour runs fit by energy but not end to end, which the search must rule out.
+        self.assertIsNone(schedule_appliances(self.prices, [self._job('heater', 5, 2.0)] * 5, power_cap_kw=3))
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+    def test_node_budget_returns_the_best_schedule_found(self):
+        jobs = [
+            self._job('dishwasher', 2, 2.0),
+            self._job('washing machine', 1.5, 2.0),
+            self._job('car', 3, 2.5),
+            self._job('heat pump', 2.5, 1.5),
+        ]
+
+        complete = schedule_appliances(self.prices, jobs, power_cap_kw=3)
+        truncated = schedule_appliances(self.prices, jobs, power_cap_kw=3, max_nodes=100)
+
+        self.assertTrue(complete['optimal'])
+        self.assertFalse(truncated['optimal'])
+        self.assertGreater(truncated['total_cost_gbp'], complete['total_cost_gbp'])
+
+    def test_realistic_48_hour_horizon_is_fast(self):
+        prices = self.prices + historical_agile_prices(
+            self.day_start + timedelta(days=1),
+            AGILE_REGION_A_2025_05_25_PENCE[::-1],
+        )
+        jobs = [
+            self._job('dishwasher', 2.5, 2.0, 0, 48),
+            self._job('washing machine', 2, 2.2, 0, 48),
+            self._job('tumble dryer', 1.5, 2.5, 12, 48),
+            self._job('car', 6, 7.0, 0, 48),
+        ]
+
+        started = time.perf_counter()
+        schedule = schedule_appliances(prices, jobs, power_cap_kw=9.5)
+        elapsed = time.perf_counter() - started
+
+        self.assertIsNotNone(schedule)
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
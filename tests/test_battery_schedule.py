@@ -0,0 +1,142 @@
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.battery_schedule import build_baseline_profile, schedule_battery
+from src.usage_cube import UsageCube
+
+from price_fixtures import AGILE_REGION_A_2025_05_25_PENCE, historical_agile_prices
+
+
+class BatteryScheduleTests(unittest.TestCase):
+    def setUp(self):
+        self.day_start = datetime(2025, 5, 25, 0, 0, tzinfo=timezone.utc)
+        self.profile = {
+            f"{hour:02d}:{minute:02d}": 0.3 + (0.6 if 17 <= hour < 20 else 0.0)
+            for hour in range(24)
+            for minute in (0, 30)
+        }
+
+    def _prices(self, values_gbp):
+        return [
+            {
+                'valid_from': self.day_start + timedelta(minutes=30 * index),
+                'valid_to': self.day_start + timedelta(minutes=30 * (index + 1)),
+                'price_gbp': price_gbp,
+            }
+            for index, price_gbp in enumerate(values_gbp)
+        ]
+
+    def test_charges_cheap_slots_to_cover_expensive_load(self):
+        prices = self._prices([0.05, 0.05, 0.40, 0.40])
+        profile = dict.fromkeys(self.profile, 1.0)
+
+        plan = schedule_battery(
+            prices,
+            self.day_start,
+            profile,
+            capacity_kwh=2.0,
+            max_charge_kw=2.0,
+            max_discharge_kw=2.0,
+            round_trip_efficiency=1.0,
+            initial_soc_kwh=0.0,
+            soc_steps=4,
+        )
+
+        self.assertEqual([slot['grid_kwh'] for slot in plan['slots']], [2.0, 2.0, 0.0, 0.0])
+        self.assertEqual([slot['soc_kwh'] for slot in plan['slots']], [1.0, 2.0, 1.0, 0.0])
+        self.assertAlmostEqual(plan['total_cost_gbp'], 0.20)
+        self.assertAlmostEqual(plan['baseline_cost_gbp'], 0.90)
+        self.assertAlmostEqual(plan['savings_gbp'], 0.70)
+
+    def test_savings_charge_for_the_starting_charge_that_is_used_up(self):
+        prices = self._prices([0.10, 0.30])
+        profile = dict.fromkeys(self.profile, 1.0)
+
+        plan = schedule_battery(
+            prices,
+            self.day_start,
+            profile,
+            capacity_kwh=2.0,
+            max_charge_kw=2.0,
+            max_discharge_kw=2.0,
+            round_trip_efficiency=1.0,
+            initial_soc_kwh=1.0,
+            soc_steps=2,
+        )
+
+        self.assertEqual([slot['soc_kwh'] for slot in plan['slots']], [1.0, 0.0])
+        self.assertAlmostEqual(plan['total_cost_gbp'], 0.10)
+        self.assertAlmostEqual(plan['baseline_cost_gbp'], 0.40)
+        # The used 1 kWh is worth the 0.20 mean price, so only 0.10 is saved.
+        self.assertAlmostEqual(plan['savings_gbp'], 0.10)
+
+    def test_respects_rate_limits_losses_and_final_charge(self):
+        prices = historical_agile_prices(self.day_start, AGILE_REGION_A_2025_05_25_PENCE)
+
+        plan = schedule_battery(
+            prices,
+            self.day_start + timedelta(minutes=10),
+            self.profile,
+            capacity_kwh=10.0,
+            max_charge_kw=3.0,
+            max_discharge_kw=2.0,
+            round_trip_efficiency=0.81,
+            initial_soc_kwh=5.0,
+            min_final_soc_kwh=4.0,
+        )
+
+        self.assertEqual(len(plan['slots']), len(prices))
+        self.assertGreaterEqual(plan['slots'][-1]['soc_kwh'], 4.0)
+        previous_soc_kwh = 5.0
+        for slot in plan['slots']:
+            self.assertLessEqual(slot['charge_kwh'], 3.0 * 0.5 + 1e-9)
+            self.assertLessEqual(slot['discharge_kwh'], 2.0 * 0.5 + 1e-9)
+            stored_change = slot['charge_kwh'] * 0.9 - slot['discharge_kwh'] / 0.9
+            self.assertAlmostEqual(slot['soc_kwh'] - previous_soc_kwh, stored_change)
+            self.assertAlmostEqual(
+                slot['grid_kwh'],
+                max(0.0, slot['baseline_kwh'] + slot['charge_kwh'] - slot['discharge_kwh']),
+            )
+            previous_soc_kwh = slot['soc_kwh']
+        self.assertAlmostEqual(
+            plan['total_cost_gbp'],
+            sum(slot['grid_kwh'] * slot['price_gbp'] for slot in plan['slots']),
+        )
+        self.assertGreater(plan['savings_gbp'], 0)
+
+    def test_vectorized_engine_matches_pure_python_engine(self):
+        prices = (
+            historical_agile_prices(self.day_start, AGILE_REGION_A_2025_05_25_PENCE)
+            + historical_agile_prices(self.day_start + timedelta(days=1), AGILE_REGION_A_2025_05_25_PENCE[::-1])
+        )
+        arguments = (prices, self.day_start + timedelta(hours=6, minutes=5), self.profile, 9.5, 3.6, 2.8, 0.88, 1.2)
+
+        vectorized = schedule_battery(*arguments, min_final_soc_kwh=2.0, vectorized=True)
+        oracle = schedule_battery(*arguments, min_final_soc_kwh=2.0, vectorized=False)
+
+        self.assertEqual(vectorized, oracle)
+
+    def test_returns_none_without_prices_now_or_reachable_final_charge(self):
+        prices = self._prices([0.10, 0.20])
+
+        self.assertIsNone(schedule_battery(prices, self.day_start + timedelta(hours=2), {}, 5, 1, 1, 0.9, 0))
+        self.assertIsNone(schedule_battery(prices, self.day_start - timedelta(hours=1), {}, 5, 1, 1, 0.9, 0))
+        self.assertIsNone(schedule_battery(prices, self.day_start, {}, 5, 1, 1, 0.9, 0, min_final_soc_kwh=5))
+
+    def test_baseline_profile_averages_each_slot_over_days_with_usage(self):
+        cube = UsageCube()
+        cube.add_sample("2026-01-10", "00:00", "low", 0.5, 0.05)
+        cube.add_sample("2026-01-10", "00:30", "low", 0.2, 0.02)
+        cube.add_sample("2026-01-11", "00:00", "high", 1.5, 0.45)
+
+        self.assertEqual(build_baseline_profile(cube), {"00:00": 1.0, "00:30": 0.2})
+        self.assertEqual(build_baseline_profile(UsageCube()), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
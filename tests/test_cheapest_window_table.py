@@ -0,0 +1,91 @@
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.cheapest_window_table import PLAN_DURATIONS_HOURS, PLAN_START_WITHIN_HOURS, CheapestWindowTable
+from src.price_logic import find_cheapest_slot, find_cheapest_timer_slot
+
+from price_fixtures import AGILE_REGION_A_2025_05_25_PENCE, historical_agile_prices
+
+
+class CheapestWindowTableTests(unittest.TestCase):
+    def setUp(self):
+        day_start = datetime(2025, 5, 25, 0, 0, tzinfo=timezone.utc)
+        gap_start = datetime(2025, 5, 25, 14, 0, tzinfo=timezone.utc)
+        self.prices = [
+            price for price in historical_agile_prices(day_start, AGILE_REGION_A_2025_05_25_PENCE)
+            if price['valid_from'] != gap_start
+        ]
+        self.now = datetime(2025, 5, 25, 6, 17, 45, tzinfo=timezone.utc)
+
+    def test_lookups_match_direct_searches_for_every_plan_setting(self):
+        table = CheapestWindowTable(self.prices, self.now)
+
+        for duration_hours in PLAN_DURATIONS_HOURS:
+            for start_within_hours in PLAN_START_WITHIN_HOURS:
+                self.assertEqual(
+                    table.lookup(self.now, duration_hours, start_within_hours),
+                    (
+                        find_cheapest_slot(self.prices, self.now, duration_hours, start_within_hours),
+                        find_cheapest_timer_slot(self.prices, self.now, duration_hours, start_within_hours, "start"),
+                        find_cheapest_timer_slot(self.prices, self.now, duration_hours, start_within_hours, "finish"),
+                    ),
+                )
+        self.assertIsNone(table.lookup(self.now, 0.25, 8))
+
+    def test_one_table_answers_every_minute_of_its_half_hour(self):
+        table = CheapestWindowTable(self.prices, self.now, timer_step_minutes=15)
+        slot_start = self.now.replace(minute=0, second=0)
+
+        for minute in range(30):
+            now = slot_start + timedelta(minutes=minute, seconds=20)
+            self.assertTrue(table.is_current(self.prices, now, 15))
+            for duration_hours, start_within_hours in ((0.5, 1), (2.5, 6), (3, 8), (7.5, 24)):
+                self.assertEqual(
+                    table.lookup(now, duration_hours, start_within_hours),
+                    (
+                        find_cheapest_slot(self.prices, now, duration_hours, start_within_hours),
+                        *(
+                            find_cheapest_timer_slot(
+                                self.prices,
+                                now,
+                                duration_hours,
+                                start_within_hours,
+                                timer_mode,
+                                timer_step_minutes=15,
+                            )
+                            for timer_mode in ("start", "finish")
+                        ),
+                    ),
+                    msg=(minute, duration_hours, start_within_hours),
+                )
+
+    def test_only_answers_for_the_same_prices_and_half_hour(self):
+        table = CheapestWindowTable(self.prices, self.now)
+
+        self.assertTrue(table.is_current(self.prices, self.now + timedelta(minutes=12)))
+        self.assertFalse(table.is_current(self.prices, self.now + timedelta(minutes=13)))
+        self.assertFalse(table.is_current(self.prices, self.now - timedelta(minutes=18)))
+        self.assertFalse(table.is_current(list(self.prices), self.now))
+        self.assertFalse(table.is_current(self.prices, self.now, 30))
+
+    def test_prices_off_the_half_hour_grid_limit_the_table_to_one_minute(self):
+        prices = [
+            {
+                **price,
+                "valid_from": price["valid_from"] + timedelta(minutes=5),
+                "valid_to": price["valid_to"] + timedelta(minutes=5),
+            }
+            for price in self.prices
+        ]
+        table = CheapestWindowTable(prices, self.now)
+
+        self.assertTrue(table.is_current(prices, self.now + timedelta(seconds=10)))
+        self.assertFalse(table.is_current(prices, self.now + timedelta(minutes=1)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.daily_cost_stream import DailyCostAccumulator
+from src.historical_costs import build_daily_costs
+from src.historical_rate_cache import new_rate_cache_entry, store_rate_records
+
+TARIFF_CODE = "E-1R-AGILE-24-10-01-C"
+DAY_ONE_START = datetime(2026, 7, 20, 23, 0, tzinfo=timezone.utc)
+DAY_TWO_START = datetime(2026, 7, 21, 23, 0, tzinfo=timezone.utc)
+DAY_TWO_END = datetime(2026, 7, 22, 23, 0, tzinfo=timezone.utc)
+
+
+def half_hour_records(start, end, key, value):
+    count = int((end - start) / timedelta(minutes=30))
+    return [{
+        "interval_start" if key == "consumption" else "valid_from": (
+            start + timedelta(minutes=30 * index)
+        ).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "interval_end" if key == "consumption" else "valid_to": (
+            start + timedelta(minutes=30 * (index + 1))
+        ).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        key: value + (index % 5) / 10,
+    } for index in range(count)]
+
+
+class DailyCostAccumulatorTests(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2026, 7, 25, 12, 0, tzinfo=timezone.utc)
+        self.tariff_periods = [{"tariff_code": TARIFF_CODE, "valid_from": DAY_ONE_START, "valid_to": DAY_TWO_END}]
+        self.unit_rates = half_hour_records(DAY_ONE_START, DAY_TWO_END, "value_inc_vat", 18.0)
+        self.standing_charges = [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 50.0}]
+        self.samples = half_hour_records(DAY_ONE_START, DAY_TWO_END, "consumption", 0.2)
+
+    def test_days_are_costed_once_samples_and_rates_are_both_complete(self):
+        entry = new_rate_cache_entry()
+        accumulator = DailyCostAccumulator(self.tariff_periods, {TARIFF_CODE: entry})
+
+        accumulator.add_samples(self.samples[:60])
+        self.assertEqual(accumulator.daily_costs, [])
+
+        store_rate_records(entry, self.unit_rates, self.standing_charges, DAY_ONE_START, DAY_TWO_END, self.now)
+        accumulator.mark_rates_ready(TARIFF_CODE, DAY_ONE_START, DAY_TWO_END)
+        self.assertEqual([day["date"] for day in accumulator.daily_costs], ["2026-07-21"])
+        self.assertEqual(accumulator.pending_days, ["2026-07-22"])
+
+        accumulator.add_samples(self.samples[60:])
+        accumulator.finish_samples()
+
+        expected = build_daily_costs(
+            self.samples,
+            self.tariff_periods,
+            {TARIFF_CODE: self.unit_rates},
+            {TARIFF_CODE: self.standing_charges},
+        )
+        self.assertEqual(len(accumulator.daily_costs), len(expected))
+        for streamed_day, expected_day in zip(accumulator.daily_costs, expected, strict=True):
+            self.assertEqual(streamed_day["sample_count"], expected_day["sample_count"])
+            self.assertAlmostEqual(streamed_day["total_cost_gbp"], expected_day["total_cost_gbp"])
+            self.assertAlmostEqual(streamed_day["cheap_kwh"], expected_day["cheap_kwh"])
+
+    def test_cached_immutable_days_are_ready_without_fetching(self):
+        entry = new_rate_cache_entry()
+        store_rate_records(entry, self.unit_rates, self.standing_charges, DAY_ONE_START, DAY_TWO_START, self.now)
+        accumulator = DailyCostAccumulator(self.tariff_periods, {TARIFF_CODE: entry})
+
+        accumulator.mark_cached_rates_ready(TARIFF_CODE)
+        accumulator.add_samples(self.samples)
+        accumulator.finish_samples()
+
+        self.assertEqual([day["date"] for day in accumulator.daily_costs], ["2026-07-21"])
+        self.assertEqual(accumulator.daily_costs[0]["missing_rate_count"], 0)
+        self.assertEqual(accumulator.pending_days, ["2026-07-22"])
+
+    def test_late_sample_reopens_a_costed_day(self):
+        entry = new_rate_cache_entry()
+        store_rate_records(entry, self.unit_rates, self.standing_charges, DAY_ONE_START, DAY_TWO_END, self.now)
+        accumulator = DailyCostAccumulator(self.tariff_periods, {TARIFF_CODE: entry})
+        accumulator.mark_rates_ready(TARIFF_CODE, DAY_ONE_START, DAY_TWO_END)
+
+        accumulator.add_samples([*self.samples[:10], self.samples[60]])
+        accumulator.add_samples(self.samples[10:48])
+
+        self.assertEqual(accumulator.daily_costs[0]["sample_count"], 48)
+
+
+if __name__ == "__main__":
+    unittest.main()
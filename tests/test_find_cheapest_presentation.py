@@ -12,6 +12,8 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 from find_cheapest_presentation import (
     build_find_cheapest_presentation,
     build_fixed_start_presentation,
+    build_ranked_window_ranges,
+    build_split_highlight,
 )
 from price_fixtures import AGILE_REGION_A_2025_05_25_PENCE, historical_agile_prices
 from price_logic import find_cheapest_slot, find_cheapest_timer_slot
@@ -94,6 +96,45 @@ class FindCheapestPresentationTests(unittest.TestCase):
             "11:47-15:17 · -£0.06/kWh · +0.2p/kWh",
         )
 
+    def test_ranked_window_ranges_label_runner_up_windows(self):
+        first = datetime(2025, 5, 25, 12, 0, tzinfo=timezone.utc)
+        second = datetime(2025, 5, 25, 2, 0, tzinfo=timezone.utc)
+        third = datetime(2025, 5, 25, 20, 0, tzinfo=timezone.utc)
+        ranked_slots = [
+            {'start': start, 'end': start.replace(hour=start.hour + 1), 'average_price_gbp': 0.1}
+            for start in (first, second, third)
+        ]
+
+        self.assertEqual(
+            build_ranked_window_ranges(ranked_slots),
+            [
+                (second, second.replace(hour=3), "#2"),
+                (third, third.replace(hour=21), "#3"),
+            ],
+        )
+        self.assertEqual(build_ranked_window_ranges([]), [])
+
+    def test_split_highlight_counts_blocks_in_its_label(self):
+        first = datetime(2025, 5, 25, 1, 0, tzinfo=timezone.utc)
+        second = datetime(2025, 5, 25, 4, 0, tzinfo=timezone.utc)
+        selection = {
+            'blocks': [
+                {'start': first, 'end': first.replace(hour=2), 'average_price_gbp': 0.1},
+                {'start': second, 'end': second.replace(hour=6), 'average_price_gbp': 0.05},
+            ],
+            'average_price_gbp': 0.0667,
+        }
+
+        self.assertEqual(
+            build_split_highlight(selection, 3),
+            ([(first, first.replace(hour=2)), (second, second.replace(hour=6))], "Best 3h in 2 blocks"),
+        )
+        self.assertEqual(
+            build_split_highlight({'blocks': selection['blocks'][:1], 'average_price_gbp': 0.1}, 1),
+            ([(first, first.replace(hour=2))], "Best 1h"),
+        )
+        self.assertIsNone(build_split_highlight(None, 3))
+
     def test_returns_none_without_a_cheapest_slot(self):
         now = datetime(2025, 5, 25, 10, 17, tzinfo=timezone.utc)
 
@@ -1,17 +1,26 @@
+import copy
 import sys
 import unittest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from src.historical_costs import build_daily_costs, build_tariff_periods, get_usage_period
+from src import historical_costs
+from src.historical_costs import (
+    build_daily_costs,
+    build_tariff_periods,
+    compare_tariff_costs,
+    get_usage_period,
+    reband_daily_costs,
+)
 from src.price_bands import PRICE_BAND_VERSION
 
 from price_fixtures import (
     AGILE_REGION_A_2025_04_07_PENCE,
     AGILE_REGION_A_2025_05_25_PENCE,
+    AGILE_REGION_A_2025_10_26_PENCE,
     historical_agile_rate_records,
 )
 
@@ -366,6 +375,260 @@ class HistoricalCostsTests(unittest.TestCase):
         self.assertAlmostEqual(daily[0]["standing_charge_gbp"], 0.5)
         self.assertAlmostEqual(daily[0]["total_cost_gbp"], 1.0)
 
+    def test_annotated_unit_rates_rebuild_price_bands_without_rates(self):
+        tariff_code = "E-1R-AGILE-FLEX-22-11-25-C"
+        samples = [
+            {"interval_start": "2026-03-20T00:00:00Z", "consumption": 1.0},
+            {"interval_start": "2026-03-20T00:30:00Z", "consumption": 2.0},
+            {"interval_start": "2026-03-21T00:00:00Z", "consumption": 4.0},
+        ]
+        tariff_periods = [{
+            "tariff_code": tariff_code,
+            "valid_from": datetime(2026, 3, 20, 0, 0, tzinfo=timezone.utc),
+            "valid_to": datetime(2026, 3, 22, 0, 0, tzinfo=timezone.utc),
+        }]
+        rates = {
+            tariff_code: [
+                {"valid_from": "2026-03-20T00:00:00Z", "valid_to": "2026-03-20T00:30:00Z", "value_inc_vat": 12.0},
+                {"valid_from": "2026-03-20T00:30:00Z", "valid_to": "2026-03-20T01:00:00Z", "value_inc_vat": 31.0},
+                {"valid_from": "2026-03-21T00:00:00Z", "valid_to": "2026-03-21T00:30:00Z", "value_inc_vat": 12.0},
+            ]
+        }
+
+        daily = build_daily_costs(samples, tariff_periods, rates, {}, annotate_samples=True)
+        stale_daily = [{**day, "cheap_kwh": 0.0, "high_kwh": 0.0, "price_band_version": 0} for day in daily]
+        # A later reading for the second day no longer matches its costed kWh.
+        samples[2]["consumption"] = 5.0
+
+        rebanded = reband_daily_costs(stale_daily, samples)
+
+        self.assertEqual([sample["unit_rate_gbp"] for sample in samples], [0.12, 0.31, 0.12])
+        self.assertEqual(len(rebanded), 1)
+        self.assertAlmostEqual(rebanded[0]["cheap_kwh"], daily[0]["cheap_kwh"])
+        self.assertAlmostEqual(rebanded[0]["high_kwh"], daily[0]["high_kwh"])
+        self.assertAlmostEqual(rebanded[0]["energy_cost_gbp"], daily[0]["energy_cost_gbp"])
+        self.assertEqual(rebanded[0]["price_band_version"], PRICE_BAND_VERSION)
+        self.assertIsNone(reband_daily_costs(stale_daily, [{"interval_start": "2026-03-20T00:00:00Z"}]))
+
+    @unittest.skipIf(historical_costs.np is None, "NumPy is not installed")
+    def test_vectorized_rebanding_matches_pure_python_rebanding(self):
+        # 2025-10-26 has 50 half-hours, so the GB day boundary crosses a clock change.
+        day_start = datetime(2025, 10, 25, 23, 0, tzinfo=timezone.utc)
+        samples = [
+            {
+                "interval_start": (day_start + timedelta(minutes=30 * index)).isoformat().replace("+00:00", "Z"),
+                "consumption": round(0.05 + (index % 7) * 0.11, 3),
+                "unit_rate_gbp": round(-0.05 + (index % 11) * 0.05, 2),
+            }
+            for index in range(100)
+        ]
+        samples.append({"interval_start": "2025-10-26T12:00:00Z", "consumption": 1.0})
+        samples.append({"interval_start": None, "consumption": 1.0, "unit_rate_gbp": 0.1})
+        samples.append({"interval_start": "2025-10-26T12:00:00Z", "consumption": "bad", "unit_rate_gbp": 0.1})
+        daily_costs = [
+            {"date": "2025-10-26", "matched_kwh": sum(sample["consumption"] for sample in samples[:50])},
+            {"date": "2025-10-27", "matched_kwh": sum(sample["consumption"] for sample in samples[50:98])},
+            {"date": "2025-10-28", "matched_kwh": 3.0},
+        ]
+
+        vectorized = reband_daily_costs(daily_costs, samples, vectorized=True)
+        oracle = reband_daily_costs(daily_costs, samples, vectorized=False)
+
+        self.assertEqual([day["date"] for day in vectorized], [day["date"] for day in oracle])
+        self.assertEqual(len(oracle), 2)
+        for vectorized_day, oracle_day in zip(vectorized, oracle, strict=True):
+            for key in ("cheap_kwh", "negative_kwh", "high_kwh"):
+                self.assertAlmostEqual(vectorized_day[key], oracle_day[key], places=9, msg=key)
+        self.assertIsNone(reband_daily_costs(daily_costs, samples[100:101], vectorized=True))
+
+    @unittest.skipIf(historical_costs.np is None, "NumPy is not installed")
+    def test_vectorized_band_days_match_pure_python_across_clock_changes(self):
+        # Four GB days either side of each 2025 clock change: 46 and 50 half-hour days included.
+        samples = []
+        for first_start in (
+            datetime(2025, 3, 28, 0, 0, tzinfo=timezone.utc),
+            datetime(2025, 10, 24, 23, 0, tzinfo=timezone.utc),
+        ):
+            samples.extend(
+                {
+                    "interval_start": (first_start + timedelta(minutes=30 * index)).isoformat().replace("+00:00", "Z"),
+                    "consumption": round(0.05 + (index % 5) * 0.13, 3),
+                    "unit_rate_gbp": round(-0.04 + (index % 13) * 0.03, 2),
+                }
+                for index in range(4 * 48)
+            )
+
+        vectorized = historical_costs._sum_band_days_vectorized(samples)
+        oracle = historical_costs._sum_band_days(samples)
+
+        self.assertEqual(list(vectorized), list(oracle))
+        self.assertIn("2025-03-30", oracle)
+        self.assertIn("2025-10-26", oracle)
+        for day_key, oracle_day in oracle.items():
+            for key in ("cheap_kwh", "negative_kwh", "high_kwh"):
+                self.assertAlmostEqual(vectorized[day_key][key], oracle_day[key], places=9, msg=(day_key, key))
+
+    @unittest.skipIf(historical_costs.np is None, "NumPy is not installed")
+    def test_vectorized_engine_matches_pure_python_engine(self):
+        old_tariff = "E-1R-AGILE-24-10-01-A"
+        new_tariff = "E-1R-AGILE-25-04-01-A"
+        april_start = datetime(2025, 4, 6, 23, 0, tzinfo=timezone.utc)
+        may_start = datetime(2025, 5, 24, 23, 0, tzinfo=timezone.utc)
+        october_start = datetime(2025, 10, 26, 0, 0, tzinfo=timezone.utc)
+        samples = []
+        for day_start, slot_count in ((april_start, 48), (may_start, 48), (october_start, 50)):
+            samples.extend(
+                {
+                    "interval_start": (day_start + timedelta(minutes=30 * index)).isoformat().replace("+00:00", "Z"),
+                    "consumption": round(0.05 + (index % 7) * 0.11, 3),
+                }
+                for index in range(slot_count)
+            )
+        samples.append({"interval_start": "2025-05-25T12:00:00Z", "consumption": "not a number"})
+        tariff_periods = [
+            {"tariff_code": old_tariff, "valid_from": april_start, "valid_to": datetime(2025, 5, 25, 11, 0, tzinfo=timezone.utc)},
+            {"tariff_code": new_tariff, "valid_from": datetime(2025, 5, 25, 11, 0, tzinfo=timezone.utc), "valid_to": None},
+        ]
+        may_rates = historical_agile_rate_records(may_start, AGILE_REGION_A_2025_05_25_PENCE)
+        rates = {
+            old_tariff: [
+                *historical_agile_rate_records(april_start, AGILE_REGION_A_2025_04_07_PENCE),
+                *may_rates,
+            ],
+            new_tariff: [
+                *may_rates[:30],
+                # October is missing its final two half-hours to exercise unmatched samples.
+                *historical_agile_rate_records(october_start, AGILE_REGION_A_2025_10_26_PENCE),
+            ],
+        }
+        standing = {
+            old_tariff: [{"valid_from": "2025-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 45.0}],
+            new_tariff: [{"valid_from": "2025-05-25T00:00:00Z", "valid_to": None, "value_inc_vat": 51.0}],
+        }
+        python_samples = copy.deepcopy(samples)
+
+        vectorized = build_daily_costs(samples, tariff_periods, rates, standing, annotate_samples=True, vectorized=True)
+        oracle = build_daily_costs(
+            python_samples,
+            tariff_periods,
+            rates,
+            standing,
+            annotate_samples=True,
+            vectorized=False,
+        )
+
+        self.assertEqual([day["date"] for day in vectorized], [day["date"] for day in oracle])
+        self.assertGreater(sum(day["missing_rate_count"] for day in oracle), 0)
+        for vectorized_day, oracle_day in zip(vectorized, oracle, strict=True):
+            self.assertEqual(vectorized_day.keys(), oracle_day.keys())
+            for key, value in oracle_day.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(vectorized_day[key], value, places=9, msg=key)
+                else:
+                    self.assertEqual(vectorized_day[key], value, msg=key)
+        self.assertEqual(
+            [sample.get("unit_rate_gbp") for sample in samples],
+            [sample.get("unit_rate_gbp") for sample in python_samples],
+        )
+
+    def test_compare_tariff_costs_replays_usage_against_each_tariff(self):
+        samples = [
+            {"interval_start": "2026-03-20T00:00:00Z", "consumption": 2.0},
+            {"interval_start": "2026-03-20T12:00:00Z", "consumption": 1.0},
+            {"interval_start": "2026-03-21T00:00:00Z", "consumption": 1.0},
+        ]
+        rates = {
+            "E-1R-FIXED-A": [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 25.0}],
+            "E-1R-GO-A": [
+                {
+                    "valid_from": f"2026-03-{day}T{start}:00Z",
+                    "valid_to": f"2026-03-{day}T{end}:00Z",
+                    "value_inc_vat": value,
+                }
+                for day in ("20", "21")
+                for start, end, value in (("00:00", "04:00", 8.0), ("04:00", "23:59", 30.0))
+            ],
+        }
+        standing = {
+            "E-1R-FIXED-A": [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 50.0}],
+        }
+
+        comparison = compare_tariff_costs(samples, rates, standing, vectorized=False)
+
+        self.assertEqual(list(comparison), ["E-1R-FIXED-A", "E-1R-GO-A"])
+        fixed = comparison["E-1R-FIXED-A"]
+        self.assertEqual([day["date"] for day in fixed["days"]], ["2026-03-20", "2026-03-21"])
+        self.assertAlmostEqual(fixed["days"][0]["total_cost_gbp"], 0.75 + 0.5)
+        self.assertAlmostEqual(fixed["total_cost_gbp"], 1.0 + 1.0)
+        go = comparison["E-1R-GO-A"]
+        self.assertAlmostEqual(go["energy_cost_gbp"], 0.16 + 0.30 + 0.08)
+        self.assertAlmostEqual(go["standing_charge_gbp"], 0.0)
+        self.assertEqual(go["missing_rate_count"], 0)
+
+    @unittest.skipIf(historical_costs.np is None, "NumPy is not installed")
+    def test_vectorized_tariff_comparison_matches_pure_python_engine(self):
+        day_starts = (
+            (datetime(2025, 4, 6, 23, 0, tzinfo=timezone.utc), AGILE_REGION_A_2025_04_07_PENCE),
+            (datetime(2025, 5, 24, 23, 0, tzinfo=timezone.utc), AGILE_REGION_A_2025_05_25_PENCE),
+            (datetime(2025, 10, 26, 0, 0, tzinfo=timezone.utc), AGILE_REGION_A_2025_10_26_PENCE),
+        )
+        samples = [
+            {
+                "interval_start": (day_start + timedelta(minutes=30 * index)).isoformat().replace("+00:00", "Z"),
+                "consumption": round(0.05 + (index % 7) * 0.11, 3),
+            }
+            for day_start, values in day_starts
+            for index in range(len(values))
+        ]
+        samples.append({"interval_start": "2025-05-25T12:00:00Z", "consumption": "not a number"})
+        agile_rates = [
+            record
+            for day_start, values in day_starts
+            for record in historical_agile_rate_records(day_start, values)
+        ]
+        rates = {
+            "E-1R-AGILE-A": agile_rates,
+            # Missing the October day exercises unmatched samples.
+            "E-1R-AGILE-PARTIAL-A": agile_rates[:96],
+            "E-1R-FIXED-A": [{"valid_from": "2025-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 24.5}],
+            "E-1R-EMPTY-A": [],
+        }
+        standing = {
+            tariff_code: [{"valid_from": "2025-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 40.0 + index}]
+            for index, tariff_code in enumerate(rates)
+        }
+
+        vectorized = compare_tariff_costs(samples, rates, standing, vectorized=True)
+        oracle = compare_tariff_costs(samples, rates, standing, vectorized=False)
+
+        self.assertEqual(list(vectorized), list(oracle))
+        self.assertGreater(oracle["E-1R-AGILE-PARTIAL-A"]["missing_rate_count"], 0)
+        self.assertEqual(oracle["E-1R-EMPTY-A"]["missing_rate_count"], len(samples) - 1)
+        for tariff_code, oracle_tariff in oracle.items():
+            vectorized_tariff = vectorized[tariff_code]
+            self.assertEqual(vectorized_tariff.keys(), oracle_tariff.keys())
+            self.assertAlmostEqual(vectorized_tariff["total_cost_gbp"], oracle_tariff["total_cost_gbp"], places=9)
+            self.assertEqual(vectorized_tariff["missing_rate_count"], oracle_tariff["missing_rate_count"])
+            for vectorized_day, oracle_day in zip(vectorized_tariff["days"], oracle_tariff["days"], strict=True):
+                self.assertEqual(vectorized_day.keys(), oracle_day.keys())
+                for key, value in oracle_day.items():
+                    if isinstance(value, float):
+                        self.assertAlmostEqual(vectorized_day[key], value, places=9, msg=key)
+                    else:
+                        self.assertEqual(vectorized_day[key], value, msg=key)
+
+        daily = build_daily_costs(
+            samples,
+            [{"tariff_code": "E-1R-AGILE-A", "valid_from": day_starts[0][0], "valid_to": None}],
+            {"E-1R-AGILE-A": agile_rates},
+            {"E-1R-AGILE-A": standing["E-1R-AGILE-A"]},
+        )
+        self.assertAlmostEqual(
+            oracle["E-1R-AGILE-A"]["total_cost_gbp"],
+            sum(day["total_cost_gbp"] for day in daily),
+            places=9,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,96 @@
+import sys
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.historical_rate_cache import (
+    build_historical_rates_cache_key,
+    compatible_rate_cache_entry,
+    get_cached_rate_records,
+    get_uncached_day_spans,
+    load_rate_cache,
+    new_rate_cache_entry,
+    prune_rate_cache_entry,
+    store_rate_cache,
+    store_rate_records,
+)
+
+
+class HistoricalRateCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2026, 7, 25, 12, 0, tzinfo=timezone.utc)
+
+    def test_records_are_split_into_local_days_and_past_days_become_immutable(self):
+        entry = new_rate_cache_entry()
+        unit_rates = [
+            {"valid_from": "2026-07-23T22:30:00Z", "valid_to": "2026-07-23T23:00:00Z", "value_inc_vat": 10.0},
+            {"valid_from": "2026-07-24T23:00:00Z", "valid_to": "2026-07-24T23:30:00Z", "value_inc_vat": 30.0},
+        ]
+        standing_charges = [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 50.0}]
+
+        store_rate_records(
+            entry,
+            unit_rates,
+            standing_charges,
+            datetime(2026, 7, 22, 23, 0, tzinfo=timezone.utc),
+            datetime(2026, 7, 25, 23, 0, tzinfo=timezone.utc),
+            self.now,
+        )
+
+        self.assertEqual(entry["days"]["2026-07-23"]["unit_rates"], [unit_rates[0]])
+        self.assertEqual(entry["days"]["2026-07-25"]["unit_rates"], [unit_rates[1]])
+        self.assertTrue(entry["days"]["2026-07-24"]["immutable"])
+        self.assertFalse(entry["days"]["2026-07-25"]["immutable"])
+
+        rates, charges = get_cached_rate_records(
+            entry,
+            datetime(2026, 7, 22, 23, 0, tzinfo=timezone.utc),
+            datetime(2026, 7, 25, 23, 0, tzinfo=timezone.utc),
+        )
+        self.assertEqual(rates, unit_rates)
+        self.assertEqual(charges, standing_charges)
+
+    def test_uncached_days_are_grouped_into_contiguous_spans(self):
+        entry = new_rate_cache_entry()
+        entry["days"]["2026-07-21"] = {"immutable": True, "unit_rates": [], "standing_charges": []}
+        entry["days"]["2026-07-23"] = {"immutable": False, "unit_rates": [], "standing_charges": []}
+
+        spans = get_uncached_day_spans(
+            entry,
+            datetime(2026, 7, 19, 23, 0, tzinfo=timezone.utc),
+            datetime(2026, 7, 23, 23, 0, tzinfo=timezone.utc),
+        )
+
+        self.assertEqual(spans, [
+            (datetime(2026, 7, 19, 23, 0, tzinfo=timezone.utc), datetime(2026, 7, 20, 23, 0, tzinfo=timezone.utc)),
+            (datetime(2026, 7, 21, 23, 0, tzinfo=timezone.utc), datetime(2026, 7, 23, 23, 0, tzinfo=timezone.utc)),
+        ])
+
+    def test_outdated_entries_are_replaced_and_old_days_pruned(self):
+        self.assertEqual(compatible_rate_cache_entry({"cache_version": 0, "days": {}}), new_rate_cache_entry())
+
+        entry = new_rate_cache_entry()
+        entry["days"] = {"2026-01-01": {"immutable": True}, "2026-07-01": {"immutable": True}}
+        prune_rate_cache_entry(entry, self.now)
+
+        self.assertEqual(list(entry["days"]), ["2026-07-01"])
+
+    def test_rate_cache_round_trips_through_a_cache_manager(self):
+        stored = {}
+        cache_manager = Mock()
+        cache_manager.get.side_effect = lambda key: (stored.get(key), None)
+        cache_manager.set.side_effect = stored.__setitem__
+        entry = new_rate_cache_entry()
+
+        store_rate_cache(cache_manager, {"E-1R-AGILE-24-10-01-C": entry})
+        rate_cache = load_rate_cache(cache_manager, ["E-1R-AGILE-24-10-01-C", "E-1R-VAR-22-11-01-C"])
+
+        self.assertEqual(list(stored), [build_historical_rates_cache_key("E-1R-AGILE-24-10-01-C")])
+        self.assertEqual(rate_cache, {"E-1R-AGILE-24-10-01-C": entry})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import sys
 import unittest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import Mock, patch
@@ -8,6 +8,7 @@ from unittest.mock import Mock, patch
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from src.price_bands import PRICE_BAND_VERSION
+from src.price_series import PriceSeries
 from src.ui.main_window import MainWindow
 from src.usage_history import USAGE_CACHE_VERSION
 
@@ -77,6 +78,26 @@ class PriceProcessingTests(unittest.TestCase):
         self.assertEqual([price["price_gbp"] for price in processed], [0.1, 0.2])
         self.assertEqual(processed[0]["valid_from"], datetime(2026, 7, 1, tzinfo=timezone.utc))
 
+    def test_dual_register_records_expand_to_typed_prices_without_strings(self):
+        register_rates = {
+            "day": [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 30.0}],
+            "night": [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 10.0}],
+        }
+        window = SimpleNamespace(_apply_processed_prices=Mock(), _show_error_if_current=Mock())
+        now = datetime(2026, 7, 1, 12, 10, tzinfo=timezone.utc)
+
+        with patch("src.ui.main_window.GLib.idle_add") as idle_add:
+            MainWindow._set_register_prices(window, register_rates, now, 7)
+            MainWindow._set_register_prices(window, {"day": [], "night": []}, now, 8)
+
+        prices = idle_add.call_args_list[0].args[1]
+        self.assertIsInstance(prices, PriceSeries)
+        self.assertEqual(len(prices), 5 * 48 + 1)
+        self.assertEqual(prices[0]["valid_from"], datetime(2026, 6, 30, 12, 0, tzinfo=timezone.utc))
+        self.assertEqual(prices.index_at(datetime(2026, 7, 2, 1, 0, tzinfo=timezone.utc)), 74)
+        self.assertEqual(prices[74]["price_gbp"], 0.1)
+        self.assertEqual(idle_add.call_args_list[1].args[0], window._show_error_if_current)
+
     def test_error_detail_ignores_non_object_json(self):
         response = Mock()
         response.json.return_value = []
@@ -93,6 +114,29 @@ class PriceProcessingTests(unittest.TestCase):
 
         self.assertEqual(MainWindow._filter_half_hour_rates(rates), [valid])
 
+    def test_clock_tick_within_the_displayed_half_hour_does_nothing(self):
+        now = datetime.now(timezone.utc)
+        prices = PriceSeries([
+            {"valid_from": now - timedelta(minutes=10), "valid_to": now + timedelta(minutes=20), "price_gbp": 0.1},
+            {"valid_from": now + timedelta(minutes=20), "valid_to": now + timedelta(minutes=50), "price_gbp": 0.2},
+        ])
+        window = SimpleNamespace(
+            all_prices=prices,
+            get_width=Mock(return_value=800),
+            _displayed_price_window=None,
+            _rebuild_cheapest_window_table=Mock(),
+            _replan_battery=Mock(),
+            update_display=Mock(),
+        )
+
+        MainWindow.update_current_price(window)
+        MainWindow.update_current_price(window)
+
+        window.update_display.assert_called_once()
+        self.assertFalse(window.update_display.call_args.args[3])
+        window._rebuild_cheapest_window_table.assert_called_once()
+        window._replan_battery.assert_called_once()
+
 
 class PlanWorkspaceTests(unittest.TestCase):
     def test_ctrl_f_action_opens_plan_workspace(self):
@@ -128,6 +172,106 @@ class PlanWorkspaceTests(unittest.TestCase):
 
         window.find_cheapest_slot.assert_called_once_with(1.5, 8)
 
+    def test_split_search_runs_off_the_main_thread_and_redraws_when_it_answers(self):
+        now = datetime(2026, 5, 13, 9, 14, tzinfo=timezone.utc)
+        prices = PriceSeries()
+        settings = {"find-cheapest-max-blocks": 3, "find-cheapest-min-run-slots": 2}
+        window = SimpleNamespace(
+            all_prices=prices,
+            _split_selection=None,
+            _split_selection_pending=None,
+            _clamp_int_setting=lambda key, _low, _high, _default: settings[key],
+            _start_split_selection=Mock(),
+            main_view_stack=Mock(),
+            duration_spin_button=Mock(),
+            start_within_spin_button=Mock(),
+            find_cheapest_slot=Mock(),
+        )
+        window.main_view_stack.get_visible_child_name.return_value = "plan"
+        window.duration_spin_button.get_value.return_value = 3.0
+        window.start_within_spin_button.get_value_as_int.return_value = 8
+        search = (6, now + timedelta(hours=8), 2, 3)
+        selection = {
+            "blocks": [
+                {"start": now, "end": now + timedelta(hours=1), "average_price_gbp": 0.1},
+                {"start": now + timedelta(hours=3), "end": now + timedelta(hours=5), "average_price_gbp": 0.2},
+            ],
+            "average_price_gbp": 0.15,
+        }
+
+        self.assertIsNone(MainWindow._get_split_highlight(window, now, 3.0, 8))
+        window._start_split_selection.assert_called_once_with(now, search)
+
+        window._split_selection_pending = (prices, now, search)
+        MainWindow._apply_split_selection(window, prices, now, (6, now + timedelta(hours=8), 2, 2), None)
+        window.find_cheapest_slot.assert_not_called()
+        MainWindow._apply_split_selection(window, prices, now, search, selection)
+        window.find_cheapest_slot.assert_called_once_with(3.0, 8)
+
+        highlight_ranges, _label = MainWindow._get_split_highlight(window, now, 3.0, 8)
+        self.assertEqual(len(highlight_ranges), 2)
+        window._start_split_selection.assert_called_once()
+
+    def test_battery_plan_resolves_each_half_hour_from_the_planned_charge(self):
+        start = datetime(2026, 5, 13, 9, 0, tzinfo=timezone.utc)
+        prices = PriceSeries([
+            {
+                "valid_from": start + timedelta(minutes=30 * index),
+                "valid_to": start + timedelta(minutes=30 * (index + 1)),
+                "price_gbp": 0.1,
+            }
+            for index in range(4)
+        ])
+        settings = {
+            "battery-capacity-kwh": 5.0,
+            "battery-power-kw": 3.0,
+            "battery-round-trip-efficiency": 0.9,
+            "battery-reserve-kwh": 1.0,
+        }
+        window = SimpleNamespace(
+            all_prices=prices,
+            _battery_plan=None,
+            _battery_plan_pending=None,
+            _battery_usage_cube=None,
+            _clamp_float_setting=lambda key, _low, _high, _default: settings[key],
+            _solve_battery_plan_background=Mock(),
+            _update_battery_plan_rows=Mock(),
+        )
+        window._get_battery_start_soc = lambda *args: MainWindow._get_battery_start_soc(window, *args)
+        battery = (5.0, 3.0, 0.9, 1.0)
+
+        with patch("src.ui.main_window.threading.Thread") as thread:
+            MainWindow._replan_battery(window, start + timedelta(minutes=5))
+            MainWindow._replan_battery(window, start + timedelta(minutes=10))
+        thread.assert_called_once()
+        request, initial_soc_kwh = thread.call_args.kwargs["args"]
+        self.assertEqual(request, (prices, start, battery, None))
+        self.assertEqual(initial_soc_kwh, 1.0)
+
+        plan = {
+            "slots": [
+                {"end": start + timedelta(minutes=30 * (index + 1)), "soc_kwh": 2.0 + index}
+                for index in range(4)
+            ],
+        }
+        MainWindow._apply_battery_plan(window, (prices, start, battery, {}), 1.0, plan)
+        self.assertIsNone(window._battery_plan)
+        MainWindow._apply_battery_plan(window, request, 1.0, plan)
+        self.assertEqual(window._battery_plan, (*request, 1.0, plan))
+
+        with patch("src.ui.main_window.threading.Thread") as thread:
+            MainWindow._replan_battery(window, start + timedelta(minutes=20))
+            MainWindow._replan_battery(window, start + timedelta(minutes=35))
+        thread.assert_called_once()
+        request, initial_soc_kwh = thread.call_args.kwargs["args"]
+        self.assertEqual(request[1], start + timedelta(minutes=30))
+        self.assertEqual(initial_soc_kwh, 2.0)
+
+        settings["battery-capacity-kwh"] = 0.0
+        MainWindow._replan_battery(window, start + timedelta(minutes=35))
+        self.assertIsNone(window._battery_plan)
+        self.assertIsNone(window._battery_plan_pending)
+
     @patch("src.ui.main_window.GLib.idle_add")
     def test_switching_workspace_remeasures_the_adaptive_layout(self, idle_add):
         stack = Mock()
@@ -224,6 +368,13 @@ class UsageRefreshTests(unittest.TestCase):
             self.assertEqual(len(rolling), expected_months)
             self.assertEqual(unit, "kWh")
 
+    def test_closing_the_window_stops_the_usage_analysis_worker(self):
+        window = SimpleNamespace(_usage_analysis_executor=Mock())
+
+        self.assertFalse(MainWindow.on_close_request(window, window))
+
+        window._usage_analysis_executor.shutdown.assert_called_once_with()
+
     def test_old_usage_cache_is_not_fresh_without_seasonal_archive(self):
         window = SimpleNamespace(
             _get_usage_cache=Mock(
@@ -1,6 +1,6 @@
 import sys
 import unittest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
@@ -13,6 +13,8 @@ from price_chart_presentation import (
     get_day_transition_markers,
     get_flyout_horizontal_position,
     get_price_axis_bounds,
+    get_range_index_spans,
+    get_window_shift,
 )
 
 
@@ -83,6 +85,22 @@ class PriceChartPresentationTests(unittest.TestCase):
 
         self.assertEqual(find_price_index_by_start([], selected), -1)
 
+    def test_range_spans_cover_visible_slots_in_range_order(self):
+        first = datetime(2026, 7, 25, 10, 0, tzinfo=timezone.utc)
+        values = [first + timedelta(minutes=30 * index) for index in range(6)]
+
+        self.assertEqual(
+            get_range_index_spans(
+                values,
+                [
+                    (values[3], values[5], "#2"),
+                    (first - timedelta(hours=1), values[1], "#3"),
+                    (values[5] + timedelta(hours=1), values[5] + timedelta(hours=2), "#4"),
+                ],
+            ),
+            [(3, 4, "#2"), (0, 0, "#3")],
+        )
+
     def test_day_markers_include_every_visible_midnight(self):
         london = ZoneInfo("Europe/London")
         values = [
@@ -109,6 +127,43 @@ class PriceChartPresentationTests(unittest.TestCase):
             [(1, "Tomorrow")],
         )
 
+    def test_day_markers_can_start_at_newly_visible_slots(self):
+        london = ZoneInfo("Europe/London")
+        values = [
+            datetime(2026, 7, 25, 23, 30, tzinfo=london),
+            datetime(2026, 7, 26, 0, 0, tzinfo=london),
+            datetime(2026, 7, 26, 23, 30, tzinfo=london),
+            datetime(2026, 7, 27, 0, 0, tzinfo=london),
+        ]
+
+        self.assertEqual(
+            get_day_transition_markers(values, london, start_index=2),
+            [(3, "Monday")],
+        )
+        self.assertEqual(get_day_transition_markers(values, london, start_index=4), [])
+
+    def test_window_shift_counts_slots_dropped_from_the_same_prices(self):
+        start = datetime(2026, 7, 25, 12, 0, tzinfo=timezone.utc)
+        prices = [
+            {'valid_from': start + timedelta(minutes=30 * index), 'price_gbp': 0.1}
+            for index in range(6)
+        ]
+
+        self.assertEqual(get_window_shift(prices[0:4], prices[1:5]), 1)
+        self.assertEqual(get_window_shift(prices[0:4], prices[0:4]), 0)
+
+    def test_window_shift_rejects_new_or_disjoint_prices(self):
+        start = datetime(2026, 7, 25, 12, 0, tzinfo=timezone.utc)
+        prices = [
+            {'valid_from': start + timedelta(minutes=30 * index), 'price_gbp': 0.1}
+            for index in range(6)
+        ]
+        refetched = [dict(price) for price in prices]
+
+        self.assertIsNone(get_window_shift(prices[0:4], refetched[1:5]))
+        self.assertIsNone(get_window_shift(prices[0:2], prices[3:5]))
+        self.assertIsNone(get_window_shift([], prices[0:2]))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,4 @@
+import itertools
 import sys
 import unittest
 from datetime import datetime, timedelta, timezone
@@ -13,12 +14,16 @@ from price_fixtures import (
     historical_agile_prices,
 )
 from price_logic import (
+    PriceIntegralIndex,
     build_dual_register_price_windows,
     build_fixed_start_price_window,
     build_region_to_tariffs_map,
     extract_product_code,
     find_cheapest_slot,
+    find_cheapest_slots,
+    find_cheapest_split_slots,
     find_cheapest_timer_slot,
+    find_ranked_cheapest_slots,
 )
 
 
@@ -286,6 +291,102 @@ class PriceLogicTests(unittest.TestCase):
             -0.0704025,
         )
 
+    def test_find_cheapest_slots_batch_matches_single_searches(self):
+        day_start = datetime(2025, 5, 25, 0, 0, tzinfo=timezone.utc)
+        gap_start = datetime(2025, 5, 25, 14, 0, tzinfo=timezone.utc)
+        prices = [
+            price for price in historical_agile_prices(day_start, AGILE_REGION_A_2025_05_25_PENCE)
+            if price['valid_from'] != gap_start
+        ]
+        now = datetime(2025, 5, 25, 6, 10, tzinfo=timezone.utc)
+        durations = [0.5, 1, 2.5, 4, 12]
+        start_within_values = [1, 3, 8, 17]
+
+        for whole_hour_starts_only in (False, True):
+            slots = find_cheapest_slots(prices, now, durations, start_within_values, whole_hour_starts_only)
+
+            self.assertEqual(len(slots), len(durations) * len(start_within_values))
+            for duration_hours in durations:
+                for start_within_hours in start_within_values:
+                    expected = find_cheapest_slot(
+                        prices,
+                        now,
+                        duration_hours,
+                        start_within_hours,
+                        whole_hour_starts_only,
+                    )
+                    self.assertEqual(slots[(duration_hours, start_within_hours)], expected)
+        self.assertIsNone(slots[(12, 8)])
+        self.assertSlot(
+            find_cheapest_slots(prices, now, [1], [17])[(1, 17)],
+            datetime(2025, 5, 25, 12, 0, tzinfo=timezone.utc),
+            datetime(2025, 5, 25, 13, 0, tzinfo=timezone.utc),
+            -0.0720825,
+        )
+
+    def test_price_integral_index_weights_partial_slots_and_rejects_gaps(self):
+        start = datetime(2026, 3, 21, 12, 0, tzinfo=timezone.utc)
+        prices = [
+            {
+                'valid_from': start + timedelta(minutes=30 * i),
+                'valid_to': start + timedelta(minutes=30 * (i + 1)),
+                'price_gbp': value,
+            }
+            for i, value in enumerate([0.30, 0.20, 0.10])
+        ]
+        prices.append({
+            'valid_from': start + timedelta(hours=2),
+            'valid_to': start + timedelta(hours=2, minutes=30),
+            'price_gbp': 0.40,
+        })
+        index = PriceIntegralIndex(list(reversed(prices)))
+
+        self.assertAlmostEqual(
+            index.weighted_average(start + timedelta(minutes=15), start + timedelta(minutes=75)),
+            (0.30 * 15 + 0.20 * 30 + 0.10 * 15) / 60,
+        )
+        self.assertAlmostEqual(index.weighted_average(start, start + timedelta(minutes=90)), 0.20)
+        self.assertIsNone(index.weighted_average(start + timedelta(hours=1), start + timedelta(hours=2, minutes=10)))
+        self.assertIsNone(index.weighted_average(start - timedelta(minutes=1), start + timedelta(minutes=30)))
+        self.assertIsNone(index.weighted_average(start, start))
+
+    def test_minute_timer_search_matches_pricing_every_step(self):
+        period_start = datetime(2026, 3, 28, 0, 0, tzinfo=timezone.utc)
+        prices = [
+            {
+                'valid_from': period_start + timedelta(minutes=30 * i),
+                'valid_to': period_start + timedelta(minutes=30 * (i + 1)),
+                'price_gbp': ((i * 37) % 23 - 3) / 100,
+            }
+            for i in range(100)
+            if i not in (40, 41)
+        ]
+        now = period_start + timedelta(minutes=7)
+        index = PriceIntegralIndex(prices)
+
+        for timer_mode in ("start", "finish"):
+            for timer_step_minutes in (1, 15):
+                slot = find_cheapest_timer_slot(
+                    prices,
+                    now,
+                    2.5,
+                    48,
+                    timer_mode,
+                    timer_step_minutes=timer_step_minutes,
+                )
+                expected = None
+                for step in range(48 * 60 // timer_step_minutes + 1):
+                    timer_time = now + timedelta(minutes=step * timer_step_minutes)
+                    start = timer_time if timer_mode == "start" else timer_time - timedelta(hours=2.5)
+                    end = start + timedelta(hours=2.5)
+                    average_price = index.weighted_average(start, end)
+                    if start < now or end > now + timedelta(hours=48) or average_price is None:
+                        continue
+                    if expected is None or average_price < expected[2] - 1e-9:
+                        expected = (start, end, average_price)
+
+                self.assertSlot(slot, *expected)
+
     def test_find_cheapest_timer_slot_uses_whole_hour_start_delays_from_now(self):
         period_start = datetime(2026, 3, 21, 12, 0, tzinfo=timezone.utc)
         now = datetime(2026, 3, 21, 12, 17, tzinfo=timezone.utc)
@@ -480,6 +581,118 @@ class PriceLogicTests(unittest.TestCase):
             -0.013888,
         )
 
+    def test_find_ranked_cheapest_slots_matches_greedy_masked_searches(self):
+        day_start = datetime(2025, 5, 25, 0, 0, tzinfo=timezone.utc)
+        gap_start = datetime(2025, 5, 25, 9, 0, tzinfo=timezone.utc)
+        prices = [
+            price for price in historical_agile_prices(day_start, AGILE_REGION_A_2025_05_25_PENCE)
+            if price['valid_from'] != gap_start
+        ]
+        now = datetime(2025, 5, 25, 1, 10, tzinfo=timezone.utc)
+
+        for duration_hours in (0.5, 2, 3.5):
+            with self.subTest(duration_hours=duration_hours):
+                ranked = find_ranked_cheapest_slots(prices, now, duration_hours, 20, count=4)
+
+                remaining = list(prices)
+                expected = []
+                for _rank in range(4):
+                    slot = find_cheapest_slot(remaining, now, duration_hours, 20)
+                    if slot is None:
+                        break
+                    expected.append(slot)
+                    remaining = [
+                        price for price in remaining
+                        if not slot['start'] <= price['valid_from'] < slot['end']
+                    ]
+
+                self.assertEqual([slot['start'] for slot in ranked], [slot['start'] for slot in expected])
+                for ranked_slot, expected_slot in zip(ranked, expected, strict=True):
+                    self.assertAlmostEqual(ranked_slot['average_price_gbp'], expected_slot['average_price_gbp'])
+
+    def test_find_ranked_cheapest_slots_stops_when_windows_run_out(self):
+        now = datetime(2026, 3, 21, 12, 0, tzinfo=timezone.utc)
+        prices = [
+            {
+                'valid_from': now + timedelta(minutes=30 * index),
+                'valid_to': now + timedelta(minutes=30 * (index + 1)),
+                'price_gbp': price,
+            }
+            for index, price in enumerate((0.20, 0.10, 0.30, 0.15, 0.25))
+        ]
+
+        ranked = find_ranked_cheapest_slots(prices, now, 1, 3, count=5)
+
+        self.assertEqual([slot['start'] for slot in ranked], [now, now + timedelta(hours=1, minutes=30)])
+        self.assertEqual(find_ranked_cheapest_slots(prices, now, 1, 3, count=0), [])
+
+    def _brute_force_split_total(self, prices, slot_count, min_run_slots, max_blocks):
+        best_total = None
+        for chosen in itertools.combinations(range(len(prices)), slot_count):
+            blocks = []
+            for index in chosen:
+                if blocks and blocks[-1][-1] == index - 1 and prices[index - 1]['valid_to'] == prices[index]['valid_from']:
+                    blocks[-1].append(index)
+                else:
+                    blocks.append([index])
+            if any(len(block) < min_run_slots for block in blocks):
+                continue
+            if max_blocks is not None and len(blocks) > max_blocks:
+                continue
+            total = sum(prices[index]['price_gbp'] for index in chosen)
+            if best_total is None or total < best_total:
+                best_total = total
+        return best_total
+
+    def test_find_cheapest_split_slots_matches_brute_force_with_run_limits(self):
+        day_start = datetime(2025, 5, 25, 0, 0, tzinfo=timezone.utc)
+        gap_start = datetime(2025, 5, 25, 13, 0, tzinfo=timezone.utc)
+        prices = [
+            price for price in historical_agile_prices(day_start, AGILE_REGION_A_2025_05_25_PENCE)[20:34]
+            if price['valid_from'] != gap_start
+        ]
+        now = prices[0]['valid_from']
+        deadline = prices[-1]['valid_to']
+
+        for slot_count, min_run_slots, max_blocks in itertools.product((1, 4, 6), (1, 2, 3), (None, 1, 2)):
+            with self.subTest(slot_count=slot_count, min_run_slots=min_run_slots, max_blocks=max_blocks):
+                selection = find_cheapest_split_slots(prices, now, slot_count, deadline, min_run_slots, max_blocks)
+                expected_total = self._brute_force_split_total(prices, slot_count, min_run_slots, max_blocks)
+
+                if expected_total is None:
+                    self.assertIsNone(selection)
+                    continue
+                self.assertAlmostEqual(selection['average_price_gbp'] * slot_count, expected_total)
+                blocks = selection['blocks']
+                self.assertEqual(sum((block['end'] - block['start']) / timedelta(minutes=30) for block in blocks), slot_count)
+                self.assertTrue(all((block['end'] - block['start']) / timedelta(minutes=30) >= min_run_slots for block in blocks))
+                if max_blocks is not None:
+                    self.assertLessEqual(len(blocks), max_blocks)
+                self.assertFalse(any(block['start'] <= gap_start < block['end'] for block in blocks))
+
+    def test_find_cheapest_split_slots_picks_cheapest_half_hours_before_deadline(self):
+        now = datetime(2026, 3, 21, 12, 0, tzinfo=timezone.utc)
+        prices = [
+            {
+                'valid_from': now + timedelta(minutes=30 * index),
+                'valid_to': now + timedelta(minutes=30 * (index + 1)),
+                'price_gbp': price,
+            }
+            for index, price in enumerate((0.20, 0.05, 0.30, 0.04, 0.06, 0.01))
+        ]
+
+        selection = find_cheapest_split_slots(prices, now, 3, now + timedelta(hours=2, minutes=30))
+
+        self.assertEqual(
+            [(block['start'], block['end']) for block in selection['blocks']],
+            [
+                (now + timedelta(minutes=30), now + timedelta(hours=1)),
+                (now + timedelta(hours=1, minutes=30), now + timedelta(hours=2, minutes=30)),
+            ],
+        )
+        self.assertAlmostEqual(selection['average_price_gbp'], 0.05)
+        self.assertIsNone(find_cheapest_split_slots(prices, now, 6, now + timedelta(hours=2)))
+
     def test_find_cheapest_timer_slot_rejects_unknown_timer_mode(self):
         now = datetime(2026, 3, 21, 12, 0, tzinfo=timezone.utc)
         prices = [{
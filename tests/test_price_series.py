@@ -0,0 +1,89 @@
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.price_bands import get_price_band
+from src.price_logic import find_cheapest_slot, find_cheapest_timer_slot
+from src.price_series import PriceSeries, as_price_series
+from src.usage_insight_memo import hash_content
+
+from price_fixtures import AGILE_REGION_A_2025_05_25_PENCE, historical_agile_prices
+
+
+class PriceSeriesTests(unittest.TestCase):
+    def setUp(self):
+        self.day_start = datetime(2025, 5, 25, 0, 0, tzinfo=timezone.utc)
+        self.prices = historical_agile_prices(self.day_start, AGILE_REGION_A_2025_05_25_PENCE)
+
+    def test_sorts_records_into_epoch_price_and_band_arrays(self):
+        series = PriceSeries(reversed(self.prices))
+
+        self.assertEqual(series, self.prices)
+        self.assertEqual(series.starts[0], int(self.day_start.timestamp()))
+        self.assertEqual(series.ends[0] - series.starts[0], 1800)
+        self.assertEqual(series.prices_gbp.tolist(), [price['price_gbp'] for price in self.prices])
+        self.assertEqual(
+            [series.band_at(index) for index in range(len(series))],
+            [get_price_band(price['price_gbp']) for price in self.prices],
+        )
+        self.assertIs(as_price_series(series), series)
+
+    def test_slices_are_views_over_the_same_arrays(self):
+        series = PriceSeries(self.prices)
+
+        view = series[4:10][2:4]
+
+        self.assertEqual(view, self.prices[6:8])
+        self.assertIs(view.prices_gbp.obj, series.prices_gbp.obj)
+        self.assertEqual(view[-1], self.prices[7])
+        with self.assertRaises(IndexError):
+            view[2]
+        with self.assertRaises(ValueError):
+            series[::2]
+
+    def test_time_lookups_bisect_the_starts(self):
+        gap_start = self.day_start + timedelta(hours=3)
+        series = PriceSeries(price for price in self.prices if price['valid_from'] != gap_start)
+
+        self.assertEqual(series.index_at(self.day_start + timedelta(hours=1, minutes=10)), 2)
+        self.assertEqual(series.index_at(gap_start + timedelta(minutes=5)), -1)
+        self.assertEqual(series.index_at(self.day_start - timedelta(minutes=1)), -1)
+        self.assertEqual(
+            series.window(self.day_start + timedelta(hours=2), self.day_start + timedelta(hours=4)),
+            [price for price in self.prices[4:8] if price['valid_from'] != gap_start],
+        )
+        self.assertEqual(
+            series.active_window(self.day_start + timedelta(minutes=40), self.day_start + timedelta(hours=2)),
+            self.prices[1:4],
+        )
+        self.assertEqual(len(series.window(self.day_start + timedelta(days=2), self.day_start + timedelta(days=3))), 0)
+
+    def test_mean_price_and_content_hash_match_the_record_list(self):
+        series = PriceSeries(self.prices)
+
+        self.assertAlmostEqual(series.mean_price_gbp(), sum(price['price_gbp'] for price in self.prices) / len(self.prices))
+        self.assertIsNone(PriceSeries().mean_price_gbp())
+        self.assertEqual(hash_content(series), hash_content(self.prices))
+
+    def test_price_searches_give_the_same_results_for_lists_and_series(self):
+        series = PriceSeries(self.prices)
+        now = self.day_start + timedelta(hours=5, minutes=17)
+
+        for duration_hours, start_within_hours in ((0.5, 3), (2.5, 12), (6, 24)):
+            with self.subTest(duration_hours=duration_hours, start_within_hours=start_within_hours):
+                self.assertEqual(
+                    find_cheapest_slot(series, now, duration_hours, start_within_hours),
+                    find_cheapest_slot(self.prices, now, duration_hours, start_within_hours),
+                )
+                self.assertEqual(
+                    find_cheapest_timer_slot(series, now, duration_hours, start_within_hours, "finish"),
+                    find_cheapest_timer_slot(self.prices, now, duration_hours, start_within_hours, "finish"),
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
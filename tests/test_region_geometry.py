@@ -0,0 +1,90 @@
+import random
+from pathlib import Path
+
+import pytest
+from src import region_location
+from src.region_geometry import RegionGeometry, load_region_geometry, write_region_geometry
+from src.region_location import (
+    RegionIndex,
+    find_region_for_coordinates,
+    get_region_index,
+    load_region_features,
+)
+
+DATA_PATH = Path(__file__).parents[1] / "data" / "gb-electricity-regions.geojson"
+
+
+def test_binary_geometry_round_trips_through_a_mapped_file(tmp_path):
+    features = [
+        {"properties": {"longname": "Square"}, "geometry": {
+            "type": "Polygon",
+            "coordinates": [
+                [[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]],
+                [[1, 1], [3, 1], [3, 3], [1, 3], [1, 1]],
+            ],
+        }},
+        {"properties": {}, "geometry": {"type": "Point", "coordinates": [5, 5]}},
+    ]
+    path = tmp_path / "regions.bin"
+
+    write_region_geometry(features, path)
+    expected = RegionGeometry.from_features(features, coordinate_typecode="f")
+    geometry = load_region_geometry(path)
+
+    assert geometry.names == ["Square", ""]
+    for name in (
+        "feature_polygon_offsets",
+        "polygon_ring_offsets",
+        "ring_point_offsets",
+        "ring_boxes",
+        "coordinates",
+        "segment_rings",
+        "cell_offsets",
+        "cell_segments",
+    ):
+        assert list(getattr(geometry, name)) == list(getattr(expected, name)), name
+    assert geometry.grid_bounds == (0.0, 0.0, 4.0, 4.0)
+    assert geometry.segment(5) == (1.0, 1.0, 1.0, 1.0)
+    assert geometry.segment(6) == (1.0, 1.0, 3.0, 1.0)
+
+
+def test_bundled_binary_geometry_agrees_with_the_geojson_lookup(tmp_path):
+    features = load_region_features(DATA_PATH)
+    path = tmp_path / "regions.bin"
+    write_region_geometry(features, path)
+    index = RegionIndex(load_region_geometry(path))
+    oracle = RegionIndex.from_features(features)
+    rng = random.Random(50)
+
+    assert path.stat().st_size < DATA_PATH.stat().st_size / 2
+    assert index.find_region(51.5072, -0.1276) == "_C"  # London
+    assert index.find_region(55.9533, -3.1883) == "_N"  # Edinburgh
+    assert index.find_region(54.5973, -5.9301) is None  # Belfast
+    for _ in range(300):
+        latitude, longitude = rng.uniform(49.8, 59.0), rng.uniform(-6.0, 2.0)
+        assert index.find_region(latitude, longitude) == find_region_for_coordinates(latitude, longitude, features)
+        assert index.is_near_boundary(latitude, longitude, 2000) == oracle.is_near_boundary(
+            latitude, longitude, 2000
+        )
+
+
+def test_damaged_binary_geometry_is_rejected(tmp_path):
+    path = tmp_path / "regions.bin"
+    write_region_geometry(load_region_features(DATA_PATH), path)
+    data = path.read_bytes()
+
+    for damaged in (b"XXXX" + data[4:], data[:len(data) // 2], b""):
+        path.write_bytes(damaged)
+        with pytest.raises(ValueError):
+            load_region_geometry(path)
+
+
+def test_bundled_index_falls_back_to_geojson_without_the_binary(tmp_path, monkeypatch):
+    monkeypatch.setattr(region_location, "REGION_GEOMETRY_PATH", str(tmp_path / "missing.bin"))
+    monkeypatch.setattr(region_location, "REGION_DATA_PATH", str(DATA_PATH))
+    monkeypatch.setattr(region_location, "_bundled_region_index", None)
+
+    index = get_region_index()
+
+    assert get_region_index() is index
+    assert index.find_region(54.9783, -1.6178) == "_F"  # Newcastle
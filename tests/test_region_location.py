@@ -5,9 +5,12 @@ from src.region_location import (
     OUTSIDE_UK_MESSAGE,
     REGION_CODE_TO_NAME,
     LocationPortal,
+    RegionIndex,
     bundled_region_codes,
+    clear_region_cache,
     feature_region_code,
     find_region_for_coordinates,
+    get_region_index,
     is_clearly_outside_uk,
     is_near_region_boundary,
     load_region_features,
@@ -84,6 +87,67 @@ def test_invalid_coordinates_and_ambiguous_accuracy_do_not_claim_a_region():
     assert not is_near_region_boundary(1, 1, 10, features)
 
 
+def test_region_index_matches_full_geometry_tests_on_edges_holes_and_islands():
+    features = [
+        feature("UKPN (East)", polygon(
+            [[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]],
+            [[1, 1], [3, 1], [3, 3], [1, 3], [1, 1]],
+        )),
+        feature("UKPN (London)", {
+            "type": "MultiPolygon",
+            "coordinates": [
+                [[[1.5, 1.5], [2.5, 1.5], [2.5, 2.5], [1.5, 2.5], [1.5, 1.5]]],
+                [[[4, 0], [7, 1], [6, 4], [4, 4], [4, 0]]],
+            ],
+        }),
+        feature("Unknown DNO", polygon([[0, 0], [9, 0], [9, 9], [0, 0]])),
+    ]
+    index = RegionIndex.from_features(features)
+    points = [(latitude / 4, longitude / 4) for latitude in range(-2, 20) for longitude in range(-2, 32)]
+    points += [(0.5, 4), (2, 1), (1.5, 1.5), (0.6, 5.8)]
+
+    for latitude, longitude in points:
+        matches = [
+            feature_region_code(item)
+            for item in features[:2]
+            if point_in_geometry(longitude, latitude, item["geometry"])
+        ]
+        expected = matches[0] if len(matches) == 1 else None
+        assert index.find_region(latitude, longitude) == expected, (latitude, longitude)
+
+
+def test_region_index_caches_quantized_points_and_is_reused_for_the_same_features():
+    features = [feature("UKPN (East)", polygon([[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]))]
+    index = get_region_index(features)
+
+    assert index.find_region(1, 1) == "_A"
+    assert index.find_region(1.0000000001, 1) == "_A"
+    assert len(index._cache) == 1
+    assert get_region_index(features) is index
+    assert get_region_index(list(features)) is not index
+
+
+def test_plain_indexes_do_not_keep_looked_up_points():
+    features = [feature("UKPN (East)", polygon([[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]))]
+    index = RegionIndex.from_features(features)
+
+    assert index.find_region(1, 1) == "_A"
+    assert index._cache is None
+
+    supplied_index = get_region_index(features)
+    supplied_index.find_region(1, 1)
+    clear_region_cache()
+    assert supplied_index._cache == {}
+
+
+def test_bundled_boundary_proximity_only_reads_nearby_edges():
+    index = RegionIndex.from_features(load_region_features(DATA_PATH))
+
+    assert not index.is_near_boundary(51.5072, -0.1276, 50)  # Central London
+    assert index.is_near_boundary(51.5072, -0.1276, 40_000)
+    assert not index.is_near_boundary(40.7128, -74.0060, 1_000)  # New York
+
+
 def test_clearly_overseas_locations_get_a_distinct_uk_message():
     assert is_clearly_outside_uk(40.7128, -74.0060)  # New York
     assert is_clearly_outside_uk(48.8566, 2.3522)  # Paris
@@ -111,6 +175,10 @@ def test_location_portal_reports_the_distinct_message_for_an_overseas_fix():
 def test_cancelling_a_portal_request_prevents_late_callbacks():
     portal = LocationPortal(lambda _region: None, lambda _message: None)
 
+    index = get_region_index([feature("UKPN (East)", polygon([[0, 0], [2, 0], [2, 2], [0, 2], [0, 0]]))])
+    index.find_region(1, 1)
+
     portal.cancel()
 
     assert portal._finished
+    assert index._cache == {}
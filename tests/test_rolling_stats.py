@@ -0,0 +1,38 @@
+import random
+import statistics
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.rolling_stats import rolling_max, rolling_mean, rolling_median, rolling_min, rolling_sum
+
+
+class RollingStatsTests(unittest.TestCase):
+    def test_rolling_statistics_match_a_window_scan(self):
+        generator = random.Random(20260718)
+        for window_size in (1, 2, 3, 7, 30):
+            # Rounded values repeat often, which exercises the median's lazy removal.
+            values = [round(generator.uniform(-2.0, 5.0), 1) for _ in range(200)]
+            windows = [values[max(0, index - window_size + 1):index + 1] for index in range(len(values))]
+
+            for actual, expected in zip(rolling_sum(values, window_size), map(sum, windows), strict=True):
+                self.assertAlmostEqual(actual, expected)
+            for actual, window in zip(rolling_mean(values, window_size), windows, strict=True):
+                self.assertAlmostEqual(actual, sum(window) / len(window))
+            self.assertEqual(rolling_min(values, window_size), [min(window) for window in windows])
+            self.assertEqual(rolling_max(values, window_size), [max(window) for window in windows])
+            self.assertEqual(
+                rolling_median(values, window_size),
+                [statistics.median(window) for window in windows],
+            )
+
+    def test_rolling_statistics_reject_invalid_window_size(self):
+        for function in (rolling_sum, rolling_mean, rolling_min, rolling_max, rolling_median):
+            with self.assertRaises(ValueError):
+                function([1.0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
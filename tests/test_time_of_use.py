@@ -0,0 +1,120 @@
+import sys
+import unittest
+from datetime import datetime, time, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.price_logic import build_dual_register_price_windows
+from src.time_of_use import (
+    ECONOMY_7_SCHEDULE,
+    GO_SCHEDULE,
+    INTELLIGENT_GO_SCHEDULE,
+    TimeOfUseSchedule,
+    build_time_of_use_prices,
+    expand_time_of_use,
+)
+from src.uk_time import UK_TIMEZONE
+
+
+class TimeOfUseTests(unittest.TestCase):
+    def test_economy_7_slots_are_typed_and_match_the_string_windows(self):
+        period_start = datetime(2026, 5, 13, 0, 10, tzinfo=timezone.utc)
+        period_end = datetime(2026, 5, 13, 8, 0, tzinfo=timezone.utc)
+        register_rates = {
+            "day": [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 30.0}],
+            "night": [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 10.0}],
+        }
+
+        prices = build_time_of_use_prices(ECONOMY_7_SCHEDULE, register_rates, period_start, period_end)
+        windows = build_dual_register_price_windows(
+            register_rates["day"],
+            register_rates["night"],
+            period_start,
+            period_end,
+        )
+
+        self.assertEqual(len(prices), 16)
+        self.assertEqual(prices[0]["valid_from"], datetime(2026, 5, 13, 0, 0, tzinfo=timezone.utc))
+        self.assertEqual([price["register"] for price in prices[:2]], ["day", "night"])
+        self.assertEqual(prices[1]["price_gbp"], 0.1)
+        self.assertEqual(
+            [(window["valid_from"], window["value_inc_vat"] / 100.0) for window in windows],
+            [
+                (price["valid_from"].isoformat().replace("+00:00", "Z"), price["price_gbp"])
+                for price in prices
+            ],
+        )
+
+    def test_local_schedules_follow_clock_changes_and_wrap_midnight(self):
+        # 2026-03-29 is the spring clock change, so local 00:30 is still 00:30 UTC
+        # but local 05:30 is 04:30 UTC.
+        period_start = datetime(2026, 3, 28, 22, 0, tzinfo=timezone.utc)
+        period_end = datetime(2026, 3, 29, 6, 0, tzinfo=timezone.utc)
+
+        go = expand_time_of_use(GO_SCHEDULE, {"day": 0.3, "night": 0.08}, period_start, period_end)
+        intelligent = expand_time_of_use(INTELLIGENT_GO_SCHEDULE, {"night": 0.07}, period_start, period_end)
+
+        go_night = [price["valid_from"] for price in go if price["register"] == "night"]
+        self.assertEqual(go_night[0], datetime(2026, 3, 29, 0, 30, tzinfo=timezone.utc))
+        self.assertEqual(go_night[-1], datetime(2026, 3, 29, 4, 0, tzinfo=timezone.utc))
+        self.assertEqual(
+            intelligent[0]["valid_from"].astimezone(UK_TIMEZONE).time(),
+            time(23, 30),
+        )
+        self.assertEqual(intelligent[-1]["valid_to"].astimezone(UK_TIMEZONE).time(), time(5, 30))
+        self.assertEqual({price["register"] for price in intelligent}, {"night"})
+
+    def test_expansions_are_memoized_per_schedule_prices_and_range(self):
+        period_start = datetime(2026, 5, 13, 0, 5, tzinfo=timezone.utc)
+        period_end = datetime(2026, 5, 15, 0, 0, tzinfo=timezone.utc)
+        schedule = TimeOfUseSchedule((("night", time(0, 30), time(7, 30)),))
+
+        first = expand_time_of_use(schedule, {"day": 0.3, "night": 0.1}, period_start, period_end)
+        second = expand_time_of_use(
+            ECONOMY_7_SCHEDULE,
+            {"night": 0.1, "day": 0.3},
+            period_start.replace(minute=20),
+            period_end,
+        )
+        repriced = expand_time_of_use(ECONOMY_7_SCHEDULE, {"day": 0.3, "night": 0.12}, period_start, period_end)
+
+        self.assertEqual(schedule, ECONOMY_7_SCHEDULE)
+        self.assertIs(first, second)
+        self.assertIsNot(first, repriced)
+
+    def test_multi_band_schedules_let_later_bands_win(self):
+        schedule = TimeOfUseSchedule(
+            (
+                ("off_peak", time(0, 0), time(5, 0)),
+                ("peak", time(16, 0), time(19, 0)),
+                ("super_off_peak", time(2, 0), time(4, 0)),
+            ),
+            default_register="standard",
+        )
+
+        registers = [
+            schedule.register_at(datetime(2026, 5, 13, hour, 0, tzinfo=timezone.utc))
+            for hour in (1, 3, 12, 17)
+        ]
+
+        self.assertEqual(registers, ["off_peak", "super_off_peak", "standard", "peak"])
+        self.assertEqual(schedule.registers, ("off_peak", "super_off_peak", "standard", "peak"))
+        with self.assertRaises(ValueError):
+            TimeOfUseSchedule((("night", time(0, 15), time(7, 30)),))
+
+    def test_registers_without_usable_rates_are_left_out(self):
+        period_start = datetime(2026, 5, 13, 0, 0, tzinfo=timezone.utc)
+        period_end = datetime(2026, 5, 13, 2, 0, tzinfo=timezone.utc)
+        register_rates = {
+            "day": [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": "nan"}],
+            "night": [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 10.0}],
+        }
+
+        prices = build_time_of_use_prices(ECONOMY_7_SCHEDULE, register_rates, period_start, period_end)
+
+        self.assertEqual([price["register"] for price in prices], ["night", "night", "night"])
+
+
+if __name__ == "__main__":
+    unittest.main()
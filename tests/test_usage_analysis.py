@@ -0,0 +1,54 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.usage_analysis import UsageAnalysisExecutor
+from src.usage_cube import build_usage_cube
+from src.usage_insights import build_usage_dashboard_data
+
+
+class UsageAnalysisExecutorTests(unittest.TestCase):
+    def setUp(self):
+        self.samples = [
+            {
+                "interval_start": f"2026-03-{day + 1:02d}T{slot // 2:02d}:{'30' if slot % 2 else '00'}:00Z",
+                "consumption": 0.2,
+            }
+            for day in range(10)
+            for slot in range(48)
+        ]
+        self.args = (self.samples, "2026-03-11T00:00:00Z", [], [], [], build_usage_cube(self.samples).to_payload())
+        self.executor = UsageAnalysisExecutor()
+        self.addCleanup(self.executor.shutdown)
+
+    def test_thread_analysis_matches_a_direct_call(self):
+        result = self.executor.submit(self.args).result(timeout=10)
+
+        self.assertEqual(result, build_usage_dashboard_data(*self.args))
+
+    def test_process_analysis_matches_a_direct_call(self):
+        result = self.executor.submit(self.args, use_process_pool=True).result(timeout=60)
+
+        self.assertEqual(result, build_usage_dashboard_data(*self.args))
+
+    def test_falls_back_to_a_thread_when_no_process_pool_can_start(self):
+        with patch("src.usage_analysis.ProcessPoolExecutor", side_effect=OSError("no semaphores")) as pool:
+            first = self.executor.submit(self.args, use_process_pool=True).result(timeout=10)
+            second = self.executor.submit(self.args, use_process_pool=True).result(timeout=10)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first["avg_text"], "9.60 kWh/day")
+        pool.assert_called_once()
+
+    def test_reports_analysis_errors_through_the_future(self):
+        future = self.executor.submit((None, "2026-03-11T00:00:00Z", [], [], [], None))
+
+        with self.assertRaises(TypeError):
+            future.result(timeout=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
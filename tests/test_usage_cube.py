@@ -0,0 +1,71 @@
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.historical_costs import SAMPLE_UNIT_RATE_KEY
+from src.usage_cube import UNPRICED_BAND, UsageCube, build_usage_cube, merge_usage_cube
+
+
+class UsageCubeTests(unittest.TestCase):
+    def test_indexes_samples_by_day_slot_and_price_band(self):
+        start = datetime(2026, 1, 10, tzinfo=timezone.utc)
+        samples = [
+            self._sample(start, 0.5, 0.10),
+            self._sample(start + timedelta(minutes=30), 0.25, 0.30),
+            self._sample(start + timedelta(days=1), 0.75, None),
+            # Later duplicates replace earlier readings, as in the cache merge.
+            self._sample(start + timedelta(days=1), 1.0, None),
+        ]
+
+        cube = build_usage_cube(samples)
+
+        self.assertEqual(cube.daily_totals(), [("2026-01-10", 0.75, 2), ("2026-01-11", 1.0, 1)])
+        self.assertEqual(cube.day_minimum("2026-01-10"), 0.25)
+        self.assertEqual(cube.slot_totals(), {"00:00": 1.5, "00:30": 0.25})
+        self.assertEqual(cube.slot_day_counts(), {"00:00": 2, "00:30": 1})
+        band_totals = cube.band_totals(["2026-01-10", "2026-01-11"])
+        self.assertEqual(band_totals["low"], [0.5, 0.05, 1])
+        self.assertAlmostEqual(band_totals["high"][1], 0.075)
+        self.assertEqual(band_totals[UNPRICED_BAND], [1.0, 0.0, 1])
+
+    def test_uses_gb_local_days_and_slots(self):
+        cube = build_usage_cube([self._sample(datetime(2026, 7, 1, 23, 30, tzinfo=timezone.utc), 0.4, None)])
+
+        self.assertEqual(list(cube.days), ["2026-07-02"])
+        self.assertEqual(list(cube.days["2026-07-02"]), ["00:30"])
+
+    def test_merge_rebuilds_only_changed_days_and_drops_pruned_days(self):
+        start = datetime(2026, 1, 10, tzinfo=timezone.utc)
+        cached_samples = [self._sample(start + timedelta(days=day), 1.0, 0.10) for day in range(3)]
+        cached_payload = build_usage_cube(cached_samples).to_payload()
+        # A stale cell proves unchanged days are reused rather than recomputed.
+        cached_payload["days"]["2026-01-11"]["00:00"]["low"][0] = 9.0
+        merged_samples = [*cached_samples[1:], self._sample(start + timedelta(days=2), 2.0, 0.10)]
+
+        payload = merge_usage_cube(cached_payload, merged_samples, {"2026-01-12"})
+        cube = UsageCube.from_payload(payload)
+
+        self.assertEqual(cube.daily_totals(), [("2026-01-11", 9.0, 1), ("2026-01-12", 2.0, 1)])
+
+    def test_rejects_a_cube_built_for_other_price_bands(self):
+        payload = build_usage_cube([]).to_payload()
+        payload["price_band_version"] -= 1
+
+        self.assertIsNone(UsageCube.from_payload(payload))
+        self.assertEqual(merge_usage_cube(payload, [], set())["days"], {})
+
+    def _sample(self, start, consumption, unit_rate_gbp):
+        sample = {
+            "interval_start": start.isoformat().replace("+00:00", "Z"),
+            "consumption": consumption,
+        }
+        if unit_rate_gbp is not None:
+            sample[SAMPLE_UNIT_RATE_KEY] = unit_rate_gbp
+        return sample
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,16 +9,25 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from src.octopus_api import OctopusApiError
 from src.price_bands import PRICE_BAND_VERSION
+from src.usage_cube import UsageCube
 from src.usage_history import (
     USAGE_CACHE_VERSION,
+    build_historical_usage_costs,
+    choose_primary_mpan,
+    compare_historical_tariff_costs,
     fetch_all_tariff_pages,
     fetch_daily_usage_archive,
     fetch_historical_unit_rates,
     fetch_recent_usage_samples,
+    fetch_recent_usage_with_costs,
     get_account_data,
+    get_export_mpans,
+    get_meter_point_refresh_starts,
     get_usage_archive_refresh_start,
     get_usage_refresh_start,
     merge_usage_history,
+    reband_usage_cache,
+    refresh_usage_history,
 )
 from src.usage_seasonality import USAGE_ARCHIVE_DAYS
 
@@ -176,9 +185,39 @@ class UsageHistoryTests(unittest.TestCase):
             ],
         )
         self.assertEqual(merged["daily_costs"], fresh_daily_costs)
+        [(cube_day, cube_kwh, cube_count)] = UsageCube.from_payload(merged["usage_cube"]).daily_totals()
+        self.assertEqual((cube_day, cube_count), ("2026-07-24", 2))
+        self.assertAlmostEqual(cube_kwh, 0.7)
         self.assertEqual(merged["cache_version"], USAGE_CACHE_VERSION)
         self.assertEqual(merged["price_band_version"], PRICE_BAND_VERSION)
 
+    def test_merge_downsamples_expiring_samples_into_hourly_tier(self):
+        cached_data = {
+            "samples": [
+                {"interval_start": "2026-03-20T11:00:00Z", "consumption": 0.1},
+                {"interval_start": "2026-03-20T11:30:00Z", "consumption": 0.2},
+            ],
+            "daily_costs": [],
+            "daily_usage_archive": [],
+            "cache_version": USAGE_CACHE_VERSION,
+            "price_band_version": PRICE_BAND_VERSION,
+        }
+
+        merged = merge_usage_history(
+            cached_data,
+            [{"interval_start": "2026-07-24T10:30:00Z", "consumption": 0.4}],
+            [],
+            self.now,
+        )
+
+        self.assertEqual(
+            merged["samples"],
+            [{"interval_start": "2026-07-24T10:30:00Z", "consumption": 0.4}],
+        )
+        self.assertEqual([day["date"] for day in merged["hourly_usage"]], ["2026-03-20", "2026-07-24"])
+        self.assertAlmostEqual(merged["hourly_usage"][0]["hourly_kwh"][11], 0.3)
+        self.assertEqual(merged["hourly_usage"][1]["hourly_kwh"][11], 0.4)
+
     def test_merge_preserves_cached_costs_when_rate_refresh_fails(self):
         cached_daily_costs = [{"date": "2026-07-24", "kwh": 2.0}]
         cached_data = {
@@ -257,6 +296,485 @@ class UsageHistoryTests(unittest.TestCase):
         self.assertEqual(samples, [{"consumption": 1.0}])
         self.assertEqual(query["period_from"], ["2026-07-17T10:30:00Z"])
 
+    def test_meter_point_ingestion_fetches_every_property_with_its_own_start(self):
+        account_data = {
+            "properties": [
+                {
+                    "electricity_meter_points": [
+                        {
+                            "mpan": "import-mpan",
+                            "agreements": [{"valid_from": "2025-01-01T00:00:00Z"}],
+                            "meters": [{"serial_number": "import-serial"}],
+                        },
+                        {
+                            "mpan": "export-mpan",
+                            "is_export": True,
+                            "agreements": [{"valid_from": "2025-01-01T00:00:00Z"}],
+                            "meters": [{"serial_number": "export-serial"}],
+                        },
+                    ],
+                },
+                {
+                    "electricity_meter_points": [{
+                        "mpan": "second-property-mpan",
+                        "agreements": [{"valid_from": "2025-01-01T00:00:00Z"}],
+                        "meters": [{"serial_number": "second-serial"}],
+                    }],
+                },
+            ],
+        }
+        refresh_starts = {"import-mpan": datetime(2026, 7, 17, 23, 0, tzinfo=timezone.utc)}
+
+        def fetch_pages(url):
+            mpan = urlparse(url).path.split("/")[3]
+            return [] if mpan == "second-property-mpan" else [{"interval_start": mpan, "consumption": 1.0}]
+
+        with patch("src.usage_history.fetch_all_consumption_pages", side_effect=fetch_pages) as fetch:
+            samples_by_mpan, daily_costs = fetch_recent_usage_with_costs(account_data, refresh_starts, None, self.now)
+
+        period_from_by_mpan = {
+            urlparse(call.args[0]).path.split("/")[3]: parse_qs(urlparse(call.args[0]).query)["period_from"][0]
+            for call in fetch.call_args_list
+        }
+        self.assertEqual(list(samples_by_mpan), ["import-mpan", "export-mpan"])
+        self.assertIsNone(daily_costs)
+        self.assertEqual(period_from_by_mpan["import-mpan"], "2026-07-17T23:00:00Z")
+        self.assertEqual(
+            period_from_by_mpan["second-property-mpan"],
+            (self.now - timedelta(days=120)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        )
+        self.assertEqual(get_export_mpans(account_data), {"export-mpan"})
+
+    def test_meter_point_refresh_starts_follow_each_cached_series(self):
+        cached_data = {
+            "samples": [{"interval_start": "2026-07-24T10:30:00Z"}],
+            "daily_costs": [],
+            "daily_usage_archive": [],
+            "primary_mpan": "import-mpan",
+            "meter_points": {
+                "export-mpan": {"samples": [{"interval_start": "2026-07-10T10:30:00Z"}]},
+            },
+            "cache_version": USAGE_CACHE_VERSION,
+            "price_band_version": PRICE_BAND_VERSION,
+        }
+
+        starts = get_meter_point_refresh_starts(cached_data, ["import-mpan", "export-mpan", "new-mpan"], self.now)
+
+        self.assertEqual(starts["import-mpan"], datetime(2026, 7, 16, 23, 0, tzinfo=timezone.utc))
+        self.assertEqual(starts["export-mpan"], datetime(2026, 7, 2, 23, 0, tzinfo=timezone.utc))
+        self.assertEqual(starts["new-mpan"], self.now - timedelta(days=120))
+
+    def test_primary_meter_prefers_cached_then_import_meter_points(self):
+        fresh = {"export-mpan": [{}], "import-mpan": [{}]}
+
+        self.assertEqual(choose_primary_mpan(None, fresh, {"export-mpan"}), "import-mpan")
+        self.assertEqual(choose_primary_mpan({"primary_mpan": "export-mpan"}, fresh), "export-mpan")
+
+    def test_merge_keeps_secondary_meter_points_separately(self):
+        merged = merge_usage_history(
+            None,
+            [{"interval_start": "2026-07-24T10:30:00Z", "consumption": 0.3}],
+            [],
+            self.now,
+            fresh_meter_point_samples={
+                "import-mpan": [{"interval_start": "2026-07-24T10:30:00Z", "consumption": 0.3}],
+                "export-mpan": [{"interval_start": "2026-07-24T10:30:00Z", "consumption": 1.2}],
+            },
+            primary_mpan="import-mpan",
+            export_mpans=frozenset({"export-mpan"}),
+        )
+
+        self.assertEqual(merged["primary_mpan"], "import-mpan")
+        self.assertEqual(list(merged["meter_points"]), ["export-mpan"])
+        self.assertTrue(merged["meter_points"]["export-mpan"]["is_export"])
+        self.assertEqual(merged["meter_points"]["export-mpan"]["samples"][0]["consumption"], 1.2)
+
+    def test_merge_drops_the_old_primary_meters_derived_data_on_a_switch(self):
+        cached_data = {
+            "samples": [{"interval_start": "2026-07-24T10:30:00Z", "consumption": 1.2}],
+            "daily_costs": [{"date": "2026-07-24", "total_cost_gbp": 9.0}],
+            "daily_usage_archive": [{"date": "2026-07-20", "kwh": 30.0}],
+            "hourly_usage": [{"date": "2026-07-24", "hourly_kwh": [1.0] * 24, "sample_count": 48}],
+            "primary_mpan": "export-mpan",
+            "cache_version": USAGE_CACHE_VERSION,
+            "price_band_version": PRICE_BAND_VERSION,
+        }
+
+        merged = merge_usage_history(
+            cached_data,
+            [{"interval_start": "2026-07-24T11:00:00Z", "consumption": 0.3}],
+            None,
+            self.now,
+            fresh_daily_archive=[],
+            primary_mpan="import-mpan",
+        )
+
+        self.assertEqual([sample["consumption"] for sample in merged["samples"]], [0.3])
+        self.assertEqual(merged["daily_costs"], [])
+        self.assertEqual(merged["daily_usage_archive"], [])
+        self.assertEqual([sum(rollup["hourly_kwh"]) for rollup in merged["hourly_usage"]], [0.3])
+        self.assertEqual(merged["meter_points"]["export-mpan"]["samples"][0]["consumption"], 1.2)
+
+    def test_refresh_keeps_the_cached_primary_meter_and_fetches_its_archive(self):
+        account_data = {
+            "properties": [{
+                "electricity_meter_points": [
+                    {
+                        "mpan": "export-mpan",
+                        "is_export": True,
+                        "agreements": [{"valid_from": "2025-01-01T00:00:00Z"}],
+                        "meters": [{"serial_number": "export-serial"}],
+                    },
+                    {
+                        "mpan": "import-mpan",
+                        "agreements": [{"valid_from": "2025-01-01T00:00:00Z"}],
+                        "meters": [{"serial_number": "import-serial"}],
+                    },
+                ],
+            }],
+        }
+        cached_data = {
+            "samples": [{"interval_start": "2026-07-24T10:30:00Z", "consumption": 0.3}],
+            "daily_costs": [],
+            "daily_usage_archive": [],
+            "primary_mpan": "import-mpan",
+            "cache_version": USAGE_CACHE_VERSION,
+            "price_band_version": PRICE_BAND_VERSION,
+        }
+        import_samples = []
+
+        def fetch_pages(url):
+            mpan = urlparse(url).path.split("/")[3]
+            if "group_by" in parse_qs(urlparse(url).query):
+                return [{
+                    "interval_start": "2026-07-24T00:00:00+01:00",
+                    "interval_end": "2026-07-25T00:00:00+01:00",
+                    "consumption": 8.5 if mpan == "import-mpan" else 20.0,
+                }]
+            if mpan == "import-mpan":
+                return import_samples
+            return [{"interval_start": "2026-07-25T10:30:00Z", "consumption": 1.2}]
+
+        with (
+            patch("src.usage_history.fetch_all_consumption_pages", side_effect=fetch_pages),
+            patch("src.usage_history.iter_consumption_pages", side_effect=lambda url: iter([fetch_pages(url)])),
+        ):
+            # An empty fetch for the primary meter must not move the cache to the export meter.
+            self.assertIsNone(refresh_usage_history(account_data, cached_data, now=self.now))
+            import_samples.append({"interval_start": "2026-07-25T10:30:00Z", "consumption": 0.4})
+            refreshed = refresh_usage_history(account_data, cached_data, now=self.now)
+
+        self.assertEqual(refreshed["primary_mpan"], "import-mpan")
+        self.assertEqual([sample["consumption"] for sample in refreshed["samples"]], [0.3, 0.4])
+        self.assertEqual(refreshed["daily_usage_archive"], [{"date": "2026-07-24", "kwh": 8.5}])
+        self.assertEqual(list(refreshed["meter_points"]), ["export-mpan"])
+
+    def test_refresh_takes_the_next_import_meter_when_the_first_returns_nothing(self):
+        account_data = {"properties": [{"electricity_meter_points": [
+            {
+                "mpan": "dumb-mpan",
+                "agreements": [{"tariff_code": "E-1R-AGILE-24-10-01-C", "valid_from": "2025-01-01T00:00:00Z"}],
+                "meters": [{"serial_number": "dumb-serial"}],
+            },
+            {
+                "mpan": "smart-mpan",
+                "agreements": [{"tariff_code": "E-1R-AGILE-24-10-01-C", "valid_from": "2025-01-01T00:00:00Z"}],
+                "meters": [{"serial_number": "smart-serial"}],
+            },
+        ]}]}
+
+        def fetch_pages(url):
+            if urlparse(url).path.split("/")[3] == "dumb-mpan":
+                return []
+            if "group_by" in parse_qs(urlparse(url).query):
+                return [{
+                    "interval_start": "2026-07-24T00:00:00+01:00",
+                    "interval_end": "2026-07-25T00:00:00+01:00",
+                    "consumption": 8.5,
+                }]
+            return [{"interval_start": "2026-07-24T10:30:00Z", "consumption": 0.5}]
+
+        with (
+            patch("src.usage_history.fetch_all_consumption_pages", side_effect=fetch_pages),
+            patch("src.usage_history.iter_consumption_pages", side_effect=lambda url: iter([fetch_pages(url)])),
+            patch(
+                "src.usage_history.fetch_historical_tariff_records",
+                return_value=[{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 20.0}],
+            ),
+        ):
+            refreshed = refresh_usage_history(account_data, None, now=self.now)
+
+        self.assertEqual(refreshed["primary_mpan"], "smart-mpan")
+        self.assertEqual([sample["consumption"] for sample in refreshed["samples"]], [0.5])
+        self.assertAlmostEqual(refreshed["daily_costs"][0]["energy_cost_gbp"], 0.1)
+        self.assertEqual(refreshed["daily_usage_archive"], [{"date": "2026-07-24", "kwh": 8.5}])
+        self.assertEqual(refreshed["meter_points"], {})
+
+    def test_historical_costs_only_fetch_rates_for_uncached_days(self):
+        account_data = {"properties": [{"electricity_meter_points": [{
+            "mpan": "import-mpan",
+            "agreements": [{"tariff_code": "E-1R-AGILE-24-10-01-C", "valid_from": "2026-01-01T00:00:00Z"}],
+        }]}]}
+        requested = []
+
+        def fetch_records(product_code, tariff_code, endpoint, period_start, period_end):
+            requested.append((endpoint, period_start, period_end))
+            if endpoint == "standing-charges":
+                return [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 50.0}]
+            slot_count = int((period_end - period_start) / timedelta(minutes=30))
+            return [{
+                "valid_from": (period_start + timedelta(minutes=30 * index)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "valid_to": (period_start + timedelta(minutes=30 * (index + 1))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "value_inc_vat": 20.0,
+            } for index in range(slot_count)]
+
+        def samples_between(start, end):
+            count = int((end - start) / timedelta(minutes=30))
+            return [{
+                "interval_start": (start + timedelta(minutes=30 * index)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "interval_end": (start + timedelta(minutes=30 * (index + 1))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "consumption": 0.5,
+            } for index in range(count)]
+
+        rate_cache = {}
+        first_samples = samples_between(
+            datetime(2026, 7, 20, 23, 0, tzinfo=timezone.utc),
+            datetime(2026, 7, 23, 23, 0, tzinfo=timezone.utc),
+        )
+        with patch("src.usage_history.fetch_historical_tariff_records", side_effect=fetch_records):
+            first_costs = build_historical_usage_costs(account_data, first_samples, rate_cache, now=self.now)
+            first_requests = list(requested)
+            requested.clear()
+            second_samples = samples_between(
+                datetime(2026, 7, 21, 23, 0, tzinfo=timezone.utc),
+                datetime(2026, 7, 24, 23, 0, tzinfo=timezone.utc),
+            )
+            second_costs = build_historical_usage_costs(account_data, second_samples, rate_cache, now=self.now)
+
+        self.assertEqual(len(first_requests), 2)
+        self.assertEqual(
+            requested,
+            [
+                ("standard-unit-rates", datetime(2026, 7, 23, 23, 0, tzinfo=timezone.utc), ANY),
+                ("standing-charges", datetime(2026, 7, 23, 23, 0, tzinfo=timezone.utc), ANY),
+            ],
+        )
+        self.assertEqual(requested[0][2], datetime(2026, 7, 24, 23, 0, tzinfo=timezone.utc))
+        self.assertTrue(rate_cache["E-1R-AGILE-24-10-01-C"]["days"]["2026-07-22"]["immutable"])
+        self.assertEqual([day["missing_rate_count"] for day in first_costs + second_costs], [0] * 6)
+        self.assertEqual(second_costs[0], first_costs[1])
+
+    def test_tariff_comparison_fetches_each_tariff_once(self):
+        requested = []
+
+        def fetch_records(product_code, tariff_code, endpoint, period_start, period_end):
+            requested.append((tariff_code, endpoint))
+            if endpoint == "standing-charges":
+                return [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 50.0}]
+            value = 10.0 if "AGILE" in tariff_code else 25.0
+            return [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": value}]
+
+        samples = [
+            {"interval_start": "2026-07-24T10:30:00Z", "consumption": 2.0},
+            {"interval_start": "2026-07-24T11:00:00Z", "consumption": 1.0},
+        ]
+        with patch("src.usage_history.fetch_historical_tariff_records", side_effect=fetch_records):
+            comparison = compare_historical_tariff_costs(
+                samples,
+                ["E-1R-AGILE-24-10-01-C", "E-1R-VAR-22-11-01-C", "E-1R-AGILE-24-10-01-C"],
+                rate_cache={},
+                now=self.now,
+            )
+
+        self.assertEqual(list(comparison), ["E-1R-AGILE-24-10-01-C", "E-1R-VAR-22-11-01-C"])
+        self.assertEqual(len(requested), 4)
+        self.assertAlmostEqual(comparison["E-1R-AGILE-24-10-01-C"]["total_cost_gbp"], 0.3 + 0.5)
+        self.assertAlmostEqual(comparison["E-1R-VAR-22-11-01-C"]["total_cost_gbp"], 0.75 + 0.5)
+        self.assertEqual(compare_historical_tariff_costs([], ["E-1R-AGILE-24-10-01-C"]), {})
+
+    def test_band_version_change_rebands_cached_costs_instead_of_refetching(self):
+        cached_data = {
+            "samples": [
+                {"interval_start": "2026-07-24T10:30:00Z", "consumption": 2.0, "unit_rate_gbp": 0.12},
+                {"interval_start": "2026-07-24T11:00:00Z", "consumption": 1.0, "unit_rate_gbp": 0.31},
+            ],
+            "daily_costs": [{
+                "date": "2026-07-24",
+                "kwh": 3.0,
+                "energy_cost_gbp": 0.55,
+                "matched_kwh": 3.0,
+                "cheap_kwh": 0.0,
+                "negative_kwh": 0.0,
+                "high_kwh": 0.0,
+                "price_band_version": PRICE_BAND_VERSION - 1,
+            }],
+            "daily_usage_archive": [],
+            "cache_version": USAGE_CACHE_VERSION,
+            "price_band_version": PRICE_BAND_VERSION - 1,
+        }
+
+        rebanded = reband_usage_cache(cached_data)
+
+        self.assertEqual(rebanded["price_band_version"], PRICE_BAND_VERSION)
+        self.assertEqual(rebanded["daily_costs"][0]["cheap_kwh"], 2.0)
+        self.assertEqual(rebanded["daily_costs"][0]["high_kwh"], 1.0)
+        self.assertEqual(
+            get_usage_refresh_start(cached_data, self.now),
+            datetime(2026, 7, 16, 23, 0, tzinfo=timezone.utc),
+        )
+
+    def test_merge_keeps_cached_unit_rate_when_fresh_sample_was_not_costed(self):
+        cached_data = {
+            "samples": [{"interval_start": "2026-07-24T10:30:00Z", "consumption": 0.2, "unit_rate_gbp": 0.12}],
+            "daily_costs": [],
+            "daily_usage_archive": [],
+            "cache_version": USAGE_CACHE_VERSION,
+            "price_band_version": PRICE_BAND_VERSION,
+        }
+
+        merged = merge_usage_history(
+            cached_data,
+            [{"interval_start": "2026-07-24T10:30:00Z", "consumption": 0.3}],
+            None,
+            self.now,
+        )
+
+        self.assertEqual(merged["samples"], [
+            {"interval_start": "2026-07-24T10:30:00Z", "consumption": 0.3, "unit_rate_gbp": 0.12},
+        ])
+
+    def test_streamed_costs_match_costing_the_downloaded_samples(self):
+        account_data = {"properties": [{"electricity_meter_points": [
+            {
+                "mpan": "import-mpan",
+                "meters": [{"serial_number": "A"}],
+                "agreements": [{"tariff_code": "E-1R-AGILE-24-10-01-C", "valid_from": "2026-01-01T00:00:00Z"}],
+            },
+            {
+                "mpan": "export-mpan",
+                "is_export": True,
+                "meters": [{"serial_number": "B"}],
+                "agreements": [{"tariff_code": "E-1R-AGILE-OUTGOING-C", "valid_from": "2026-01-01T00:00:00Z"}],
+            },
+        ]}]}
+        period_from = datetime(2026, 7, 21, 23, 0, tzinfo=timezone.utc)
+
+        def half_hours(start, end, key, value):
+            return [{
+                "interval_start" if key == "consumption" else "valid_from": (
+                    start + timedelta(minutes=30 * index)
+                ).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "interval_end" if key == "consumption" else "valid_to": (
+                    start + timedelta(minutes=30 * (index + 1))
+                ).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                key: value + (index % 3) * 10,
+            } for index in range(int((end - start) / timedelta(minutes=30)))]
+
+        samples = half_hours(period_from, self.now, "consumption", 0.5)
+
+        def consumption_pages(url):
+            if "/import-mpan/" in url:
+                for index in range(0, len(samples), 50):
+                    yield samples[index:index + 50]
+            else:
+                yield [{"interval_start": "2026-07-24T10:30:00Z", "consumption": 1.5}]
+
+        def fetch_records(product_code, tariff_code, endpoint, period_start, period_end):
+            if endpoint == "standing-charges":
+                return [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 50.0}]
+            return half_hours(period_start, period_end, "value_inc_vat", 12.0)
+
+        rate_cache = {}
+        with (
+            patch("src.usage_history.iter_consumption_pages", side_effect=consumption_pages),
+            patch("src.usage_history.fetch_historical_tariff_records", side_effect=fetch_records) as fetch,
+        ):
+            samples_by_mpan, daily_costs = fetch_recent_usage_with_costs(
+                account_data,
+                {"import-mpan": period_from, "export-mpan": period_from},
+                "import-mpan",
+                now=self.now,
+                rate_cache=rate_cache,
+            )
+            import_account_data = {"properties": [{"electricity_meter_points": [
+                account_data["properties"][0]["electricity_meter_points"][0],
+            ]}]}
+            expected = build_historical_usage_costs(
+                import_account_data,
+                [dict(sample) for sample in samples],
+                now=self.now,
+            )
+
+        self.assertEqual(samples_by_mpan["import-mpan"], samples)
+        self.assertEqual(samples_by_mpan["export-mpan"][0]["consumption"], 1.5)
+        self.assertNotIn("E-1R-AGILE-OUTGOING-C", {call.args[1] for call in fetch.call_args_list})
+        self.assertEqual([day["date"] for day in daily_costs], [day["date"] for day in expected])
+        for streamed_day, expected_day in zip(daily_costs, expected, strict=True):
+            self.assertAlmostEqual(streamed_day["total_cost_gbp"], expected_day["total_cost_gbp"])
+            self.assertAlmostEqual(streamed_day["high_kwh"], expected_day["high_kwh"])
+        self.assertIn("unit_rate_gbp", samples[0])
+        self.assertTrue(rate_cache["E-1R-AGILE-24-10-01-C"]["days"]["2026-07-22"]["immutable"])
+
+    def test_streamed_costs_are_dropped_when_rates_fail(self):
+        account_data = {"properties": [{"electricity_meter_points": [{
+            "mpan": "import-mpan",
+            "meters": [{"serial_number": "A"}],
+            "agreements": [{"tariff_code": "E-1R-AGILE-24-10-01-C", "valid_from": "2026-01-01T00:00:00Z"}],
+        }]}]}
+
+        with (
+            patch(
+                "src.usage_history.iter_consumption_pages",
+                return_value=iter([[{"interval_start": "2026-07-24T10:30:00Z", "consumption": 0.3}]]),
+            ),
+            patch("src.usage_history.fetch_historical_tariff_records", side_effect=OctopusApiError("failed")),
+        ):
+            samples_by_mpan, daily_costs = fetch_recent_usage_with_costs(
+                account_data,
+                {},
+                "import-mpan",
+                now=self.now,
+            )
+
+        self.assertEqual(list(samples_by_mpan), ["import-mpan"])
+        self.assertIsNone(daily_costs)
+
+    def test_refresh_fallback_costs_only_use_the_primary_meters_agreements(self):
+        account_data = {"properties": [{"electricity_meter_points": [
+            {
+                "mpan": "import-mpan",
+                "meters": [{"serial_number": "A"}],
+                "agreements": [{"tariff_code": "E-1R-AGILE-24-10-01-C", "valid_from": "2026-01-01T00:00:00Z"}],
+            },
+            {
+                "mpan": "export-mpan",
+                "is_export": True,
+                "meters": [{"serial_number": "B"}],
+                "agreements": [{"tariff_code": "E-1R-AGILE-OUTGOING-C", "valid_from": "2026-01-01T00:00:00Z"}],
+            },
+        ]}]}
+        requested = []
+
+        def fetch_records(product_code, tariff_code, endpoint, period_start, period_end):
+            requested.append(tariff_code)
+            if len(requested) == 1:
+                raise OctopusApiError("failed")
+            return [{"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 20.0}]
+
+        with (
+            patch(
+                "src.usage_history.iter_consumption_pages",
+                side_effect=lambda url: iter([[{"interval_start": "2026-07-24T10:30:00Z", "consumption": 0.5}]]),
+            ),
+            patch("src.usage_history.fetch_all_consumption_pages", return_value=[]),
+            patch("src.usage_history.fetch_historical_tariff_records", side_effect=fetch_records),
+        ):
+            refreshed = refresh_usage_history(account_data, None, now=self.now)
+
+        self.assertEqual(set(requested), {"E-1R-AGILE-24-10-01-C"})
+        self.assertEqual([day["date"] for day in refreshed["daily_costs"]], ["2026-07-24"])
+        self.assertAlmostEqual(refreshed["daily_costs"][0]["energy_cost_gbp"], 0.1)
+
 
 if __name__ == "__main__":
     unittest.main()
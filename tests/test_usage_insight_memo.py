@@ -0,0 +1,49 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.usage_insight_memo import (
+    MAX_USAGE_INSIGHT_MEMO_ENTRIES,
+    ContentHashCache,
+    get_memoized_usage_insight,
+    hash_content,
+    store_memoized_usage_insight,
+)
+
+
+class UsageInsightMemoTests(unittest.TestCase):
+    def test_content_hash_sees_edits_inside_a_series(self):
+        samples = [
+            {"interval_start": f"2026-03-01T{hour:02d}:00:00Z", "consumption": 0.2}
+            for hour in range(24)
+        ]
+        edited = [dict(sample) for sample in samples]
+        edited[12]["consumption"] = 0.3
+
+        self.assertEqual(hash_content(samples), hash_content([dict(sample) for sample in samples]))
+        self.assertNotEqual(hash_content(samples), hash_content(edited))
+
+    def test_hash_cache_rehashes_only_replaced_series(self):
+        content_hashes = ContentHashCache()
+        prices = [{"valid_from": "2026-03-01T00:00:00Z", "price_gbp": 0.2}]
+        digest = content_hashes.digest("prices", prices)
+        # The same list object is trusted, which is how cached payloads are reused.
+        prices[0]["price_gbp"] = 0.3
+
+        self.assertEqual(content_hashes.digest("prices", prices), digest)
+        self.assertNotEqual(content_hashes.digest("prices", [dict(prices[0])]), digest)
+
+    def test_memo_keeps_the_most_recent_insights(self):
+        memo = None
+        for index in range(MAX_USAGE_INSIGHT_MEMO_ENTRIES + 1):
+            memo = store_memoized_usage_insight(memo, f"hash-{index}", {"summary": str(index)})
+
+        self.assertIsNone(get_memoized_usage_insight(memo, "hash-0"))
+        self.assertEqual(get_memoized_usage_insight(memo, "hash-1"), {"summary": "1"})
+        self.assertIsNone(get_memoized_usage_insight({"memo_version": 0, "entries": memo["entries"]}, "hash-1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,15 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from src.historical_costs import SAMPLE_UNIT_RATE_KEY
 from src.price_bands import PRICE_BAND_VERSION
-from src.usage_insights import build_rolling_average, build_usage_insight_data, build_usage_pattern_insights
+from src.usage_cube import build_usage_cube
+from src.usage_insights import (
+    build_rolling_average,
+    build_usage_dashboard_data,
+    build_usage_insight_data,
+    build_usage_pattern_insights,
+)
 
 
 class UsageInsightsTests(unittest.TestCase):
@@ -101,6 +108,22 @@ class UsageInsightsTests(unittest.TestCase):
         self.assertEqual(result["cheap_rate_text"], "—")
         self.assertIn("Refresh usage history", result["cheap_rate_detail"])
 
+    def test_rate_capture_reads_costed_samples_from_the_usage_cube(self):
+        samples = self._daily_samples(7, lambda _day: 4.8)
+        for index, sample in enumerate(samples):
+            sample[SAMPLE_UNIT_RATE_KEY] = 0.10 if index % 2 else 0.30
+
+        result = build_usage_dashboard_data(
+            [],
+            "2026-03-08T00:00:00Z",
+            usage_cube=build_usage_cube(samples).to_payload(),
+        )
+
+        self.assertEqual(result["baseline_text"], "~200 W")
+        self.assertEqual(result["cheap_rate_text"], "50%")
+        self.assertEqual(result["average_unit_text"], "20.0p/kWh")
+        self.assertIn("50% of usage was at", result["average_unit_detail"])
+
     def test_peak_pattern_identifies_largest_usage_band(self):
         samples = []
         for slot in range(48):
@@ -117,6 +140,22 @@ class UsageInsightsTests(unittest.TestCase):
         self.assertIn("Evening", result["peak_text"])
         self.assertIn("18:00-18:30", result["peak_detail"])
 
+    def test_peak_band_uses_longer_hourly_history_when_available(self):
+        samples = [{"interval_start": "2026-03-01T18:00:00Z", "consumption": 1.0}]
+        hourly_usage = [
+            {
+                "date": f"2026-02-{day:02d}",
+                "hourly_kwh": [1.0 if hour < 6 else 0.0 for hour in range(24)],
+                "sample_count": 48,
+            }
+            for day in range(1, 11)
+        ]
+
+        result = build_usage_pattern_insights(samples, [], hourly_usage)
+
+        self.assertEqual(result["peak_text"], "Overnight (100%)")
+        self.assertIn("18:00-18:30", result["peak_detail"])
+
     def test_peak_pattern_formats_half_hour_across_midnight(self):
         result = build_usage_pattern_insights([{
             "interval_start": "2026-03-01T23:30:00Z",
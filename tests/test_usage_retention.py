@@ -0,0 +1,66 @@
+import sys
+import unittest
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.usage_retention import (
+    build_hourly_usage_profile,
+    build_hourly_usage_rollups,
+    merge_hourly_usage_rollups,
+)
+
+
+class UsageRetentionTests(unittest.TestCase):
+    def test_hourly_rollups_group_half_hours_by_local_hour(self):
+        rollups = build_hourly_usage_rollups([
+            {"interval_start": "2026-07-01T23:00:00Z", "consumption": 1.0},
+            {"interval_start": "2026-07-01T23:30:00Z", "consumption": 0.5},
+            {"interval_start": "2026-07-02T12:00:00Z", "consumption": 0.25},
+            {"interval_start": None, "consumption": 9.0},
+        ])
+
+        self.assertEqual(len(rollups), 1)
+        self.assertEqual(rollups[0]["date"], "2026-07-02")
+        self.assertEqual(rollups[0]["sample_count"], 3)
+        self.assertEqual(rollups[0]["hourly_kwh"][0], 1.5)
+        self.assertEqual(rollups[0]["hourly_kwh"][13], 0.25)
+
+    def test_repeated_autumn_hour_shares_one_slot(self):
+        rollups = build_hourly_usage_rollups([
+            {"interval_start": "2026-10-25T00:00:00Z", "consumption": 1.0},
+            {"interval_start": "2026-10-25T01:00:00Z", "consumption": 2.0},
+        ])
+
+        self.assertEqual(rollups[0]["hourly_kwh"][1], 3.0)
+
+    def test_merge_keeps_fuller_rollup_and_prunes_beyond_two_years(self):
+        full_day = {"date": "2026-03-01", "hourly_kwh": [0.5] * 24, "sample_count": 48}
+        partial_day = {"date": "2026-03-01", "hourly_kwh": [0.0] * 23 + [0.5], "sample_count": 2}
+        two_year_old_day = {"date": "2024-07-23", "hourly_kwh": [0.5] * 24, "sample_count": 48}
+        expired_day = {"date": "2024-07-22", "hourly_kwh": [0.5] * 24, "sample_count": 48}
+
+        merged = merge_hourly_usage_rollups(
+            [expired_day, two_year_old_day, full_day],
+            [partial_day],
+            datetime(2026, 7, 25, tzinfo=timezone.utc),
+        )
+
+        self.assertEqual(merged, [two_year_old_day, full_day])
+
+    def test_profile_sums_hours_over_an_inclusive_date_range(self):
+        rollups = [
+            {"date": "2026-03-01", "hourly_kwh": [1.0] * 24, "sample_count": 48},
+            {"date": "2026-03-02", "hourly_kwh": [2.0] * 24, "sample_count": 48},
+            {"date": "2026-03-03", "hourly_kwh": [4.0] * 24, "sample_count": 48},
+        ]
+
+        totals, day_count = build_hourly_usage_profile(rollups, date(2026, 3, 2), date(2026, 3, 3))
+
+        self.assertEqual(day_count, 2)
+        self.assertEqual(totals, [6.0] * 24)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from src.uk_time import expected_half_hours_for_local_day, latest_complete_local_day
 from src.usage_seasonality import (
+    DailyUsageIndex,
     build_daily_usage_archive,
     build_seasonal_usage_insight,
     merge_daily_usage_archive,
@@ -78,6 +79,39 @@ class UsageSeasonalityTests(unittest.TestCase):
         self.assertEqual(result["year_comparison_text"], "—")
         self.assertIn("matching period", result["summary"])
 
+    def test_daily_index_windows_match_a_scan_of_the_archive(self):
+        by_date = {
+            date(2025, 12, 30) + timedelta(days=offset): 1.0 + offset * 0.25
+            for offset in range(70)
+            if offset % 9 not in (3, 4)
+        }
+        index = DailyUsageIndex(by_date)
+
+        for start, end in (
+            (date(2025, 12, 1), date(2026, 1, 31)),
+            (date(2026, 1, 5), date(2026, 1, 5)),
+            (date(2026, 2, 1), date(2026, 6, 1)),
+            (date(2026, 6, 1), date(2026, 7, 1)),
+        ):
+            values = [value for day, value in by_date.items() if start <= day <= end]
+            total, count = index.window(start, end)
+            self.assertEqual(count, len(values))
+            self.assertAlmostEqual(total, sum(values))
+
+        result = build_seasonal_usage_insight(
+            [{"date": day.isoformat(), "kwh": value} for day, value in by_date.items()],
+            "2026-03-20T12:00:00Z",
+        )
+        january = [value for day, value in by_date.items() if (day.year, day.month) == (2026, 1)]
+        self.assertEqual([month["month_start"] for month in result["chart_months"]], [
+            "2025-12-01",
+            "2026-01-01",
+            "2026-02-01",
+            "2026-03-01",
+        ])
+        self.assertEqual(result["chart_months"][1]["day_count"], len(january))
+        self.assertAlmostEqual(result["chart_months"][1]["average_kwh"], sum(january) / len(january))
+
 
 if __name__ == "__main__":
     unittest.main()